@@ -0,0 +1,268 @@
+# bench_flashcard.py
+"""Headless benchmarks for the UI hot paths.
+
+    python bench_flashcard.py --out results.json
+    python bench_flashcard.py --compare bench_baseline.json --threshold 0.2
+
+Runs under QT_QPA_PLATFORM=offscreen inside a scratch directory holding a
+copy of the image assets, a fresh card database and synthetic deck folders.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, QTimer, PYQT_VERSION_STR, QT_VERSION_STR
+from PyQt6.QtWidgets import QApplication
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS = ("Icon.png", "Remora-Main.png", "book.png", "math.png", "science.png", "history.png")
+SAVED_SIZES = (10, 1000, 10000, 100000)
+DECK_FOLDERS = ((10, 100), (100, 100), (500, 100))  # (decks, cards per deck)
+DEFAULT_THRESHOLD = 0.20
+MIN_DELTA_MS = 1.0  # smaller slowdowns are timer noise, whatever the ratio
+WINDOW_SIZE = (1280, 800)
+GRID_COLUMNS = 4  # FlipCards across a WINDOW_SIZE window
+
+
+def timed(fn, repeat=5, setup=None):
+    """Run `fn` `repeat` times and return timing stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn() if setup is None else fn(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "runs": repeat,
+    }
+
+
+def settle(app, ms=0):
+    """Process events, optionally keeping the loop alive for `ms` milliseconds."""
+    if ms:
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec()
+    app.processEvents()
+
+
+def make_decks(folder, decks, cards):
+    os.makedirs(folder, exist_ok=True)
+    for d in range(decks):
+        deck = [{"question": f"Deck {d} question {i}?", "answer": f"Answer {i} of deck {d}"}
+                for i in range(cards)]
+        with open(os.path.join(folder, f"deck_{d:04}.json"), "w", encoding="utf-8") as f:
+            json.dump(deck, f)
+
+
+def fresh_window(app):
+    from main_app_flashcard import MainWindow
+    from jobs_flashcard import stop_all
+    stop_all()  # the last window's startup jobs still use the database
+    for name in ("remora.db", "remora.db-wal", "remora.db-shm"):
+        if os.path.exists(name):
+            os.remove(name)
+    window = MainWindow(app)
+    window.resize(*WINDOW_SIZE)
+    window.show()
+    settle(app)
+    return window
+
+
+def bench_window(app, results):
+    from main_app_flashcard import MainWindow, FlipCard
+
+    def construct():
+        window = MainWindow(app)
+        window.deleteLater()
+    results["mainwindow_construct"] = timed(construct)
+    settle(app)
+
+    window = fresh_window(app)
+    start, name = window.page("start"), window.page("name")
+    results["fade_out_call"] = timed(lambda: start.fade_out(name), repeat=20)
+    settle(app, 1200)
+    results["switch_page"] = timed(lambda: start.switch_page(name), repeat=20)
+
+    def full_transition():
+        start.fade_out(name)
+        settle(app, 1100)
+    results["transition_wall"] = timed(full_transition, repeat=3)
+
+    card = FlipCard("Question?", "Answer")
+    card.show()
+    results["flipcard_flip_x100"] = timed(lambda: [card.flip(None) for _ in range(100)])
+    results["flipcard_flip_repaint"] = timed(lambda: (card.flip(None), card.repaint()), repeat=20)
+
+    # 200 cards scrolled in a window: repainting the visible screenful
+    # should fit in a 60 fps frame (16.7 ms)
+    from PyQt6.QtWidgets import QGridLayout, QScrollArea, QWidget
+    grid = QWidget()
+    layout = QGridLayout(grid)
+    for i in range(200):
+        layout.addWidget(FlipCard(f"Question {i}?", f"Answer {i}"), i // GRID_COLUMNS, i % GRID_COLUMNS)
+    screen = QScrollArea()
+    screen.setWidget(grid)
+    screen.resize(*WINDOW_SIZE)
+    screen.show()
+    settle(app)
+    results["flipcard_grid_repaint_screen"] = timed(grid.repaint, repeat=10)  # clipped to the viewport
+    screen.close()
+    screen.deleteLater()
+
+    for page in ("main", "topics", "create_flashcard", "saved_flashcards"):
+        window.page(page)
+    settle(app)
+
+    def toggle():
+        window.toggle_btn()
+        settle(app)
+    results["apply_theme_toggle"] = timed(toggle, repeat=10)
+
+    window.stacked.setCurrentWidget(window.page("topics"))
+
+    def open_topic(topic):
+        window.show_topic_page(topic)
+        settle(app)
+
+    def reset_topic():
+        window.pages.evict("topic:Math")
+        window.stacked.setCurrentWidget(window.page("topics"))
+        return "Math"
+    results["show_topic_page_cold"] = timed(open_topic, setup=reset_topic)
+    window.close()
+    window.deleteLater()
+    settle(app)
+
+
+def bench_saved(app, results):
+    for size in SAVED_SIZES:
+        window = fresh_window(app)
+        window.data.store.add_cards((f"Question {i}?", f"Answer {i}") for i in range(size))
+        window.stacked.setCurrentWidget(window.page("main"))
+
+        def show():
+            window.show_saved_flashcards()
+            window.repaint()
+            settle(app)
+        results[f"show_saved_flashcards_{size}"] = timed(show)
+        window.close()
+        window.deleteLater()
+        settle(app)
+
+
+def bench_decks(app, results):
+    from study_techniques_code import InterleavedPractice
+    from scheduler_flashcard import Scheduler
+
+    for decks, cards in DECK_FOLDERS:
+        shutil.rmtree("flashcards_data", ignore_errors=True)
+        make_decks("flashcards_data", decks, cards)
+        widget = InterleavedPractice(scheduler=Scheduler())
+
+        def drop_manifest():
+            for name in os.listdir("flashcards_data"):
+                if not name.endswith(".json"):
+                    os.remove(os.path.join("flashcards_data", name))
+
+        results[f"load_flashcards_cold_{decks}x{cards}"] = timed(
+            lambda _: widget.load_flashcards(), setup=drop_manifest, repeat=3
+        )
+        results[f"load_flashcards_warm_{decks}x{cards}"] = timed(widget.load_flashcards)
+        # Show Answer / Next with the look-ahead given idle time to prepare
+        results[f"practice_step_{decks}x{cards}"] = timed(
+            lambda _: widget.next_card(), setup=lambda: settle(app), repeat=20
+        )
+        widget.deleteLater()
+    settle(app)
+
+
+def run():
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {}
+    bench_window(app, results)
+    bench_saved(app, results)
+    bench_decks(app, results)
+    from jobs_flashcard import stop_all
+    stop_all()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Return (name, base ms, new ms, ratio) for benchmarks slower than allowed."""
+    regressions = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None or old["median_ms"] <= 0:
+            continue
+        ratio = new["median_ms"] / old["median_ms"]
+        if ratio > 1 + threshold and new["median_ms"] - old["median_ms"] > MIN_DELTA_MS:
+            regressions.append((name, old["median_ms"], new["median_ms"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against this results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a benchmark is flagged (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    out = os.path.abspath(args.out) if args.out else None
+
+    workdir = tempfile.mkdtemp(prefix="remora-bench-")
+    cwd = os.getcwd()
+    try:
+        for asset in ASSETS:
+            if os.path.exists(os.path.join(REPO_DIR, asset)):
+                shutil.copy(os.path.join(REPO_DIR, asset), workdir)
+        sys.path.insert(0, REPO_DIR)
+        os.chdir(workdir)
+        current = run()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(current, indent=2)
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: {old:.2f} ms -> {new:.2f} ms ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("no regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# binary_deck_flashcard.py
+"""Memory-mapped binary decks (.rdeck).
+
+Layout (little-endian; every section starts on an 8-byte boundary):
+
+    header    magic, version, offset width (4 or 8), card count and the
+              file offsets of the sections below
+    names     UTF-8 JSON: {"source": ..., "topics": [...], "tags": [...]}
+    offsets   2 * count + 1 unsigned ints: card i's question is
+              heap[offsets[2i]:offsets[2i+1]], its answer runs to offsets[2i+2]
+    topics    count uint16, index into names["topics"]
+    tags      count uint64, bitmask over names["tags"]
+    heap      the UTF-8 text of every card
+
+Opening a deck reads the header and the small names block and maps the
+rest, so it costs the same for ten cards or a million. Reading card i is
+two table lookups and one slice of the heap.
+
+`source` is the scheduler-key source: a deck converted from deck.json
+keeps the keys deck.json#i, so its review history carries over.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from cards_flashcard import Card, DeckView, MAX_TAGS
+from deck_loader_flashcard import DECK_FOLDER, list_decks, scan_deck
+from scheduler_flashcard import card_key
+
+EXTENSION = ".rdeck"
+MAGIC = b"REMDECK\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sHHI7Q")   # magic, version, width, reserved, count, then section offsets
+COPY_CHUNK = 1024 * 1024
+
+
+class BinaryDeckError(ValueError):
+    pass
+
+
+def list_binary_decks(folder=DECK_FOLDER):
+    """Sorted paths of the .rdeck files in `folder` (empty if it is missing)."""
+    if not os.path.isdir(folder):
+        return []
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(EXTENSION))
+
+
+def _pad(f):
+    f.write(b"\0" * (-f.tell() % 8))
+
+
+def _column(buf, offset, code, count):
+    """Zero-copy view of `count` little-endian values (a copy on big-endian machines)."""
+    size = array(code).itemsize
+    view = memoryview(buf)[offset:offset + count * size]
+    if sys.byteorder == "little":
+        return view.cast(code)
+    column = array(code, view)
+    column.byteswap()
+    return column
+
+
+class _Repeat:
+    """Read-only sequence of one value, standing in for a per-card column."""
+
+    __slots__ = ("value", "count")
+
+    def __init__(self, value, count):
+        self.value = value
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return self.value
+
+
+class BinaryDeck:
+    """Read-only deck backed by a memory-mapped .rdeck file.
+
+    Offers the reading side of cards_flashcard.Deck (len, indexing,
+    question/answer/topic/key, topic_rows, view()), so DeckView and
+    ViewStream work on it unchanged. Practice sessions draw from .rdeck
+    files through interleave_flashcard.BinaryTopic.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise BinaryDeckError(f"{path} is not a binary deck") from None
+        if len(self._map) < _HEADER.size:
+            raise BinaryDeckError(f"{path} is not a binary deck")
+        (magic, version, width, _reserved, count, names_at, names_len,
+         table_at, topics_at, tags_at, heap_at) = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise BinaryDeckError(f"{path} is not a binary deck")
+        if version != VERSION or width not in (4, 8):
+            raise BinaryDeckError(f"{path}: unsupported deck version {version}")
+        names = json.loads(self._map[names_at:names_at + names_len])
+        self.count = count
+        self.source = names["source"]
+        self.topics = [sys.intern(t) for t in names["topics"]]
+        self.tags = [sys.intern(t) for t in names["tags"]]
+        self._topic_no = {t: i for i, t in enumerate(self.topics)}
+        self._tag_no = {t: i for i, t in enumerate(self.tags)}
+        self.offsets = _column(self._map, table_at, "I" if width == 4 else "Q", 2 * count + 1)
+        self.topic_ids = _column(self._map, topics_at, "H", count)
+        self.tag_bits = _column(self._map, tags_at, "Q", count)
+        self._heap = heap_at
+        # Single-source key columns, for ViewStream lookups
+        self.sources = [self.source]
+        self._source_no = {self.source: 0}
+        self.source_ids = _Repeat(1, count)
+        self.idents = range(count)
+
+    def close(self):
+        for column in (self.offsets, self.topic_ids, self.tag_bits):
+            if isinstance(column, memoryview):
+                column.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("deck index out of range")
+        return Card(self.question(i), self.answer(i), self.topic(i), self.key(i), self.tags_of(i))
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def _text(self, start, end):
+        return self._map[self._heap + start:self._heap + end].decode("utf-8")
+
+    def question(self, i):
+        return self._text(self.offsets[2 * i], self.offsets[2 * i + 1])
+
+    def answer(self, i):
+        return self._text(self.offsets[2 * i + 1], self.offsets[2 * i + 2])
+
+    def topic(self, i):
+        return self.topics[self.topic_ids[i]]
+
+    def key(self, i):
+        return card_key(self.source, i)
+
+    def tags_of(self, i):
+        bits = self.tag_bits[i]
+        return tuple(tag for n, tag in enumerate(self.tags) if bits >> n & 1)
+
+    def topic_rows(self, topic):
+        number = self._topic_no.get(topic)
+        return array("I", () if number is None else (i for i, t in enumerate(self.topic_ids) if t == number))
+
+    def view(self):
+        return DeckView(self)
+
+
+def write_binary_deck(path, cards, source, topic=""):
+    """Write `cards` (Cards, deck dicts or (question, answer) pairs) to `path`.
+
+    Text is streamed to a scratch file while the offset table and columns
+    are built, so memory holds about 18 bytes per card, not the text.
+    Returns the number of cards written.
+    """
+    offsets = array("Q", [0])
+    topic_ids = array("H")
+    tag_bits = array("Q")
+    topics, topic_no, tags, tag_no = [], {}, [], {}
+
+    def number(name, names, numbers, limit=None):
+        n = numbers.get(name)
+        if n is None:
+            if limit is not None and len(names) >= limit:
+                raise BinaryDeckError(f"a deck holds at most {limit} distinct tags")
+            n = numbers[name] = len(names)
+            names.append(name)
+        return n
+
+    folder = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryFile(dir=folder) as heap:
+        size = 0
+        for card in cards:
+            if isinstance(card, dict):
+                card = Card.from_dict(card, topic)
+            elif not isinstance(card, Card):
+                card = Card(card[0], card[1], topic)
+            for text in (card.question, card.answer):
+                data = text.encode("utf-8")
+                heap.write(data)
+                size += len(data)
+                offsets.append(size)
+            topic_ids.append(number(card.topic, topics, topic_no))
+            bits = 0
+            for tag in card.tags:
+                bits |= 1 << number(tag, tags, tag_no, MAX_TAGS)
+            tag_bits.append(bits)
+
+        count = len(topic_ids)
+        width = 4 if size < 1 << 32 else 8
+        table = offsets if width == 8 else array("I", offsets)
+        if sys.byteorder != "little":
+            for column in (table, topic_ids, tag_bits):
+                column.byteswap()
+        names = json.dumps({"source": source, "topics": topics, "tags": tags},
+                           ensure_ascii=False).encode("utf-8")
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"\0" * _HEADER.size)
+            _pad(f)
+            names_at = f.tell()
+            f.write(names)
+            sections = []
+            for column in (table, topic_ids, tag_bits):
+                _pad(f)
+                sections.append(f.tell())
+                column.tofile(f)
+            _pad(f)
+            heap_at = f.tell()
+            heap.seek(0)
+            while chunk := heap.read(COPY_CHUNK):
+                f.write(chunk)
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, width, 0, count, names_at, len(names), *sections, heap_at))
+        os.replace(tmp, path)
+    return count
+
+
+def convert_json_deck(json_path, out_path=None):
+    """Convert a flashcards_data JSON deck; keys stay card_key(<json name>, i).
+
+    The JSON is read with scan_deck, one card at a time. Returns the
+    output path.
+    """
+    if out_path is None:
+        out_path = os.path.splitext(json_path)[0] + EXTENSION
+    source = os.path.basename(json_path)
+    cards = (card for _offset, _length, card in scan_deck(json_path))
+    write_binary_deck(out_path, cards, source, topic=os.path.splitext(source)[0])
+    return out_path
+
+
+if __name__ == "__main__":
+    # python binary_deck_flashcard.py [deck.json ...]   (default: every deck in flashcards_data)
+    for json_path in sys.argv[1:] or list_decks(DECK_FOLDER):
+        print(convert_json_deck(json_path))
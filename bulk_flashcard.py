@@ -0,0 +1,122 @@
+# bulk_flashcard.py
+"""Parse pasted text into cards for bulk authoring.
+
+Accepted layouts, detected from the text itself:
+
+    question<TAB>answer            (spreadsheet paste)
+    question :: answer
+    question | answer
+    question; answer   /   question, answer   (CSV quoting allowed)
+
+    Q: question                    (blocks; blank lines optional)
+    A: answer
+"""
+import csv
+import re
+
+DELIMITERS = ("\t", "::", "|", ";", ",")
+CSV_DELIMITERS = ("\t", ";", ",")
+MAX_LENGTH = 1000
+_BLOCK = re.compile(r"^\s*([QqAa])\s*[:.)]\s*(.*)$")
+_SPACES = re.compile(r"\s+")
+
+
+class BulkParse:
+    """Result of parse_bulk(): the valid cards plus per-line problems."""
+
+    __slots__ = ("cards", "lines", "errors", "layout")
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.cards = []     # (question, answer)
+        self.lines = []     # source line number of each card
+        self.errors = []    # (line number, message)
+
+    @property
+    def ok(self):
+        return bool(self.cards) and not self.errors
+
+
+def detect_layout(lines):
+    """'blocks' for Q:/A: text, otherwise the delimiter most lines contain."""
+    sample = [line for line in lines if line.strip()][:50]
+    if not sample:
+        return None
+    if sum(1 for line in sample if _BLOCK.match(line)) * 2 >= len(sample):
+        return "blocks"
+    for delimiter in DELIMITERS:
+        if sum(1 for line in sample if delimiter in line) * 2 >= len(sample):
+            return delimiter
+    return DELIMITERS[0]
+
+
+def parse_bulk(text):
+    """Parse and validate the whole paste in a single pass."""
+    lines = text.splitlines()
+    layout = detect_layout(lines)
+    result = BulkParse(layout)
+    if layout is None:
+        return result
+    pairs = _blocks(lines, result) if layout == "blocks" else _delimited(lines, layout, result)
+
+    seen = {}
+    for line_no, question, answer in pairs:
+        if not question:
+            result.errors.append((line_no, "missing question"))
+        elif not answer:
+            result.errors.append((line_no, "missing answer"))
+        elif len(question) > MAX_LENGTH or len(answer) > MAX_LENGTH:
+            result.errors.append((line_no, f"longer than {MAX_LENGTH} characters"))
+        else:
+            key = (question.casefold(), answer.casefold())
+            if key in seen:
+                result.errors.append((line_no, f"same card as line {seen[key]}"))
+                continue
+            seen[key] = line_no
+            result.cards.append((question, answer))
+            result.lines.append(line_no)
+    return result
+
+
+def _clean(text):
+    return _SPACES.sub(" ", text).strip()
+
+
+def _delimited(lines, delimiter, result):
+    if delimiter in CSV_DELIMITERS:
+        rows = csv.reader(lines, delimiter=delimiter)
+    else:
+        rows = (line.split(delimiter, 1) for line in lines)
+    for line_no, (line, row) in enumerate(zip(lines, rows), 1):
+        if not line.strip():
+            continue
+        if len(row) < 2:
+            result.errors.append((line_no, "no separator between question and answer"))
+            continue
+        # Extra columns (tags, notes...) belong to the answer only for split layouts
+        yield line_no, _clean(row[0]), _clean(row[1])
+
+
+def _blocks(lines, result):
+    question, q_line, answer = None, 0, None
+    for line_no, line in enumerate(lines, 1):
+        m = _BLOCK.match(line)
+        if m and m.group(1) in "Qq":
+            if question is not None:
+                yield q_line, _clean(question), _clean(answer or "")
+            question, q_line, answer = m.group(2), line_no, None
+        elif m:
+            if question is None:
+                result.errors.append((line_no, "answer without a question"))
+            else:
+                answer = m.group(2) if answer is None else answer + " " + m.group(2)
+        elif line.strip() and question is not None:
+            # Continuation line of whichever part is open
+            if answer is None:
+                question += " " + line
+            else:
+                answer += " " + line
+        elif line.strip():
+            result.errors.append((line_no, "text outside a Q:/A: block"))
+    if question is not None:
+        yield q_line, _clean(question), _clean(answer or "")
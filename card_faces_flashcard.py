@@ -0,0 +1,72 @@
+# card_faces_flashcard.py
+import hashlib
+
+from PyQt6.QtCore import Qt, QRectF, QSize
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QPixmapCache
+
+from image_cache_flashcard import CACHE_LIMIT_KB
+
+FACE_SIZE = QSize(300, 180)
+FACE_RADIUS = 20
+FACE_PADDING = 20
+BORDER_WIDTH = 3
+BORDER_COLOR = "#aaa"
+FACE_FONT = ("Arial Rounded MT Bold", 14)
+
+
+class FaceRenderer:
+    """Renders card faces once and serves them from QPixmapCache.
+
+    A face is keyed by its text, size, device pixel ratio, colors and
+    theme, so drawing a card is a single pixmap blit. Faces have a
+    rounded grey border, padding and centred word-wrapped text.
+    """
+
+    def __init__(self):
+        self.font = QFont(*FACE_FONT)
+        self.border = QPen(QColor(BORDER_COLOR), BORDER_WIDTH)
+        self.hits = 0
+        self.misses = 0
+        self._limit_set = False
+
+    def face(self, text, size=FACE_SIZE, bg_color="#FFFFFF", text_color="#333", theme="", dpr=1.0):
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+        key = (f"remora-face:{digest}|{size.width()}x{size.height()}@{dpr}"
+               f"|{QColor(bg_color).name()}|{QColor(text_color).name()}|{theme}")
+        cached = QPixmapCache.find(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        if not self._limit_set:
+            QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), CACHE_LIMIT_KB))
+            self._limit_set = True
+        pixmap = self.render(text, size, bg_color, text_color, dpr)
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def render(self, text, size, bg_color, text_color, dpr=1.0):
+        pixmap = QPixmap(round(size.width() * dpr), round(size.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        inset = BORDER_WIDTH / 2
+        rect = QRectF(0, 0, size.width(), size.height()).adjusted(inset, inset, -inset, -inset)
+        painter.setPen(self.border)
+        painter.setBrush(QColor(bg_color))
+        painter.drawRoundedRect(rect, FACE_RADIUS, FACE_RADIUS)
+        painter.setPen(QColor(text_color))
+        painter.setFont(self.font)
+        painter.drawText(
+            rect.adjusted(FACE_PADDING, FACE_PADDING, -FACE_PADDING, -FACE_PADDING),
+            Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap,
+            text,
+        )
+        painter.end()
+        return pixmap
+
+
+faces = FaceRenderer()
@@ -0,0 +1,295 @@
+# card_view_flashcard.py
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import QStyledItemDelegate, QAbstractItemView, QFrame, QStyleOptionViewItem
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QItemSelection, QRect, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QRegion
+
+from storage_flashcard import DEFAULT_TOPIC
+from scheduler_flashcard import card_key
+from card_faces_flashcard import faces, FACE_SIZE
+
+CARD_SIZE = FACE_SIZE
+CARD_SPACING = 15
+
+QUESTION_ROLE = Qt.ItemDataRole.UserRole + 1
+ANSWER_ROLE = Qt.ItemDataRole.UserRole + 2
+FLIPPED_ROLE = Qt.ItemDataRole.UserRole + 3
+CARD_ID_ROLE = Qt.ItemDataRole.UserRole + 4
+
+
+class CardListModel(QAbstractListModel):
+    """List model over one topic of the card store.
+
+    Rows are fetched from SQLite in fixed-size blocks and only a few blocks are
+    kept, so memory does not depend on how many cards the topic holds.
+    Blocks are read by key (id > the previous block's last id), and every
+    block boundary seen is remembered, so scrolling never re-counts rows
+    from the top.
+    """
+
+    BLOCK_SIZE = 128
+    MAX_BLOCKS = 8
+
+    # scheduler key of a card whose answer was just revealed
+    revealed = pyqtSignal(str)
+
+    def __init__(self, store, topic=DEFAULT_TOPIC, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.topic = topic
+        self._count = 0
+        self._blocks = OrderedDict()
+        self._starts = {0: 0}  # block number -> last id before it
+        self._flipped = set()  # card ids showing their answer
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self._blocks.clear()
+        self._starts = {0: 0}
+        self._count = self.store.count(self.topic)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def _row(self, row):
+        block_no, offset = divmod(row, self.BLOCK_SIZE)
+        block = self._blocks.get(block_no)
+        if block is None:
+            start = self._block_start(block_no)
+            block = [] if start is None else self.store.page(self.topic, start, self.BLOCK_SIZE)
+            if len(block) == self.BLOCK_SIZE:
+                self._starts[block_no + 1] = block[-1][0]
+            self._blocks[block_no] = block
+            if len(self._blocks) > self.MAX_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(block_no)
+        return block[offset] if offset < len(block) else None
+
+    def _block_start(self, block_no):
+        start = self._starts.get(block_no)
+        if start is None:
+            # A jump past the blocks seen so far: step over ids from the nearest known boundary
+            known = max(n for n in self._starts if n < block_no)
+            skip = (block_no - known) * self.BLOCK_SIZE - 1
+            start = self.store.id_after(self.topic, self._starts[known], skip)
+            if start is not None:
+                self._starts[block_no] = start
+        return start
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._row(index.row())
+        if row is None:
+            return None
+        card_id, question, answer = row
+        if role == Qt.ItemDataRole.DisplayRole:
+            return answer if card_id in self._flipped else question
+        if role == QUESTION_ROLE:
+            return question
+        if role == ANSWER_ROLE:
+            return answer
+        if role == FLIPPED_ROLE:
+            return card_id in self._flipped
+        if role == CARD_ID_ROLE:
+            return card_id
+        return None
+
+    def toggle_flip(self, index):
+        """Flip one card; only that row is repainted."""
+        card_id = self.data(index, CARD_ID_ROLE)
+        if card_id is None:
+            return
+        if card_id in self._flipped:
+            self._flipped.discard(card_id)
+        else:
+            self._flipped.add(card_id)
+            self.revealed.emit(card_key("db", card_id))
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, FLIPPED_ROLE])
+
+
+class CardDelegate(QStyledItemDelegate):
+    """Blits cached card faces; no per-card widgets are created."""
+
+    def __init__(self, bg_color="#FFFFFF", text_color="#333", parent=None):
+        super().__init__(parent)
+        self.bg_color = QColor(bg_color)
+        self.text_color = QColor(text_color)
+
+    def sizeHint(self, option, index):
+        return CARD_SIZE
+
+    def paint(self, painter, option, index):
+        view = option.widget
+        theme = (view.window().property("theme") or "") if view is not None else ""
+        face = faces.face(
+            index.data(Qt.ItemDataRole.DisplayRole) or "", option.rect.size(),
+            self.bg_color, self.text_color, theme, painter.device().devicePixelRatioF(),
+        )
+        painter.drawPixmap(option.rect.topLeft(), face)
+
+
+class CardGridView(QAbstractItemView):
+    """Wrapping grid of cards; clicking a card flips it.
+
+    Every card is a fixed-size cell, so the rectangle of a row follows
+    from its number and the viewport width. Nothing is laid out per row
+    (unlike a wrapping QListView, which measures every row on each
+    reset): opening or resizing the grid costs the same for 10 cards as
+    for 100k, and painting asks the model only for the visible rows.
+    """
+
+    def __init__(self, model, bg_color="#FFFFFF", text_color="#333", parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(CardDelegate(bg_color, text_color, self))
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.clicked.connect(model.toggle_flip)
+
+    # ---------- geometry ----------
+
+    def cell_size(self):
+        return CARD_SIZE.width() + CARD_SPACING, CARD_SIZE.height() + CARD_SPACING
+
+    def columns(self):
+        cell_width = self.cell_size()[0]
+        return max(1, (self.viewport().width() - CARD_SPACING) // cell_width)
+
+    def row_count(self):
+        model = self.model()
+        return 0 if model is None else model.rowCount(self.rootIndex())
+
+    def _cell_rect(self, row):
+        """Rectangle of `row` in content coordinates (before scrolling)."""
+        cell_width, cell_height = self.cell_size()
+        line, column = divmod(row, self.columns())
+        return QRect(CARD_SPACING + column * cell_width, CARD_SPACING + line * cell_height, CARD_SIZE.width(),
+                     CARD_SIZE.height())
+
+    def _rows_in(self, rect):
+        """Rows whose cells may meet `rect` (viewport coordinates)."""
+        cell_height = self.cell_size()[1]
+        columns = self.columns()
+        top = rect.top() + self.verticalOffset() - CARD_SPACING
+        bottom = rect.bottom() + self.verticalOffset() - CARD_SPACING
+        first = max(0, top // cell_height) * columns
+        last = min(self.row_count(), (bottom // cell_height + 1) * columns)
+        return range(first, max(first, last))
+
+    def updateGeometries(self):
+        cell_height = self.cell_size()[1]
+        lines = -(-self.row_count() // self.columns())
+        content = CARD_SPACING + lines * cell_height
+        bar = self.verticalScrollBar()
+        bar.setSingleStep(cell_height // 4)
+        bar.setPageStep(self.viewport().height())
+        bar.setRange(0, max(0, content - self.viewport().height()))
+        super().updateGeometries()
+
+    def reset(self):
+        super().reset()
+        self.updateGeometries()
+
+    def rowsInserted(self, parent, first, last):
+        super().rowsInserted(parent, first, last)
+        self.updateGeometries()
+
+    def rowsAboutToBeRemoved(self, parent, first, last):
+        super().rowsAboutToBeRemoved(parent, first, last)
+        self.updateGeometries()
+
+    # ---------- QAbstractItemView ----------
+
+    def visualRect(self, index):
+        if not index.isValid():
+            return QRect()
+        return self._cell_rect(index.row()).translated(0, -self.verticalOffset())
+
+    def indexAt(self, point):
+        y = point.y() + self.verticalOffset()
+        cell_width, cell_height = self.cell_size()
+        column, x_in = divmod(point.x() - CARD_SPACING, cell_width)
+        line, y_in = divmod(y - CARD_SPACING, cell_height)
+        if (min(column, line) < 0 or column >= self.columns()
+                or x_in >= CARD_SIZE.width() or y_in >= CARD_SIZE.height()):
+            return QModelIndex()
+        row = line * self.columns() + column
+        if row >= self.row_count():
+            return QModelIndex()
+        return self.model().index(row, 0, self.rootIndex())
+
+    def scrollTo(self, index, hint=QAbstractItemView.ScrollHint.EnsureVisible):
+        rect = self.visualRect(index)
+        if not rect.isValid():
+            return
+        bar = self.verticalScrollBar()
+        if hint == QAbstractItemView.ScrollHint.PositionAtTop or rect.top() < 0:
+            bar.setValue(bar.value() + rect.top() - CARD_SPACING)
+        elif rect.bottom() > self.viewport().height():
+            bar.setValue(bar.value() + rect.bottom() - self.viewport().height() + CARD_SPACING)
+
+    def moveCursor(self, action, modifiers):
+        count = self.row_count()
+        if not count:
+            return QModelIndex()
+        current = self.currentIndex()
+        row = current.row() if current.isValid() else 0
+        columns = self.columns()
+        page = max(1, self.viewport().height() // self.cell_size()[1]) * columns
+        move = QAbstractItemView.CursorAction
+        step = {
+            move.MoveLeft: -1, move.MovePrevious: -1, move.MoveRight: 1, move.MoveNext: 1,
+            move.MoveUp: -columns, move.MoveDown: columns, move.MovePageUp: -page, move.MovePageDown: page,
+        }
+        if action == move.MoveHome:
+            row = 0
+        elif action == move.MoveEnd:
+            row = count - 1
+        else:
+            row = min(count - 1, max(0, row + step.get(action, 0)))
+        return self.model().index(row, 0, self.rootIndex())
+
+    def horizontalOffset(self):
+        return 0
+
+    def verticalOffset(self):
+        return self.verticalScrollBar().value()
+
+    def isIndexHidden(self, index):
+        return False
+
+    def setSelection(self, rect, command):
+        selection = QItemSelection()
+        for row in self._rows_in(rect.normalized()):
+            if self.visualRect(self.model().index(row, 0, self.rootIndex())).intersects(rect):
+                index = self.model().index(row, 0, self.rootIndex())
+                selection.select(index, index)
+        self.selectionModel().select(selection, command)
+
+    def visualRegionForSelection(self, selection):
+        region = QRegion()
+        visible = self._rows_in(self.viewport().rect())
+        for selected in selection:
+            for row in range(max(selected.top(), visible.start), min(selected.bottom() + 1, visible.stop)):
+                region += self.visualRect(self.model().index(row, 0, self.rootIndex()))
+        return region
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        option = QStyleOptionViewItem()
+        self.initViewItemOption(option)
+        delegate = self.itemDelegate()
+        for row in self._rows_in(event.rect()):
+            index = self.model().index(row, 0, self.rootIndex())
+            option.rect = self.visualRect(index)
+            if option.rect.intersects(event.rect()):
+                delegate.paint(painter, option, index)
+        painter.end()
@@ -0,0 +1,433 @@
+# cards_flashcard.py
+"""Compact card objects and a columnar in-memory deck.
+
+A `Card` is a small __slots__ object that still behaves like the old
+representations: `card["question"]` works like the deck dicts did, and
+`q, a = card` works like the (question, answer) tuples.
+
+A `Deck` stores no per-card objects. All text lives in one UTF-8 buffer.
+An offset array marks where each question and answer begins. Topic,
+source, id-within-source and tags are small integer columns (array
+module, or NumPy views of the same memory). A Card is made only when one
+is read, so the deck costs a few dozen bytes per card plus its text.
+"""
+import bisect
+import random
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # the deck works without NumPy, just without vectorised columns
+    np = None
+
+from scheduler_flashcard import card_key
+
+MAX_TAGS = 64               # tags are a bitmask column
+
+
+class Card:
+    """One card: question, answer, topic, scheduler key and tags."""
+
+    __slots__ = ("question", "answer", "topic", "key", "tags")
+
+    def __init__(self, question, answer, topic="", key=None, tags=()):
+        self.question = question
+        self.answer = answer
+        self.topic = sys.intern(topic)
+        self.key = key
+        self.tags = tags
+
+    @classmethod
+    def from_dict(cls, card, topic="", key=None):
+        """Card from a deck-file dict ({"question": ..., "answer": ..., "tags": [...]})."""
+        tags = card.get("tags") or ()
+        return cls(str(card.get("question", "")), str(card.get("answer", "")),
+                   str(card.get("topic", topic)), key, tuple(sys.intern(str(t)) for t in tags))
+
+    def __getitem__(self, field):
+        # Old code reads cards as dicts
+        try:
+            return getattr(self, field)
+        except (AttributeError, TypeError):
+            raise KeyError(field) from None
+
+    def get(self, field, default=None):
+        return getattr(self, field, default) if isinstance(field, str) else default
+
+    def __iter__(self):
+        # ...or unpacks them as (question, answer)
+        yield self.question
+        yield self.answer
+
+    def __eq__(self, other):
+        if not isinstance(other, Card):
+            return NotImplemented
+        return (self.question, self.answer, self.topic, self.key) == (
+            other.question, other.answer, other.topic, other.key)
+
+    def __hash__(self):
+        return hash((self.question, self.answer, self.topic, self.key))
+
+    def __repr__(self):
+        return f"Card({self.question!r}, {self.answer!r}, topic={self.topic!r}, key={self.key!r})"
+
+
+class Deck:
+    """Array-backed, append-only deck.
+
+    Card i's question is text[offsets[2i]:offsets[2i+1]] and its answer
+    runs on to offsets[2i+2]; both are decoded only when read. Topics,
+    sources and tags are interned once per deck and stored as numbers.
+    """
+
+    def __init__(self):
+        self.text = bytearray()
+        self.offsets = array("Q", [0])
+        self.topic_ids = array("H")
+        self.source_ids = array("I")
+        self.idents = array("I")        # card number within its source (the key's suffix)
+        self.tag_bits = array("Q")
+        self.topics = []                # interned names, indexed by the columns above
+        self.sources = []
+        self.tags = []
+        self._topic_no = {}
+        self._source_no = {}
+        self._tag_no = {}
+
+    @classmethod
+    def from_cards(cls, cards, topic="", source=None):
+        """Deck from (question, answer) pairs, dicts or Cards.
+
+        Pairs and dicts take `topic`; they get keys card_key(source, i)
+        when a source is given.
+        """
+        deck = cls()
+        for i, card in enumerate(cards):
+            if isinstance(card, Card):
+                deck.add_card(card)
+            elif isinstance(card, dict):
+                deck.add_card(Card.from_dict(card, topic), source, i)
+            else:
+                question, answer = card
+                deck.append(question, answer, topic, source, i)
+        return deck
+
+    @classmethod
+    def from_topics(cls, topic_cards):
+        """Deck from {topic: [(question, answer), ...]}; each topic is its own key source."""
+        deck = cls()
+        for topic, cards in topic_cards.items():
+            for i, (question, answer) in enumerate(cards):
+                deck.append(question, answer, topic, topic, i)
+        return deck
+
+    # ---------- building ----------
+
+    def append(self, question, answer, topic="", source=None, ident=0, tags=()):
+        self.text += question.encode("utf-8")
+        self.offsets.append(len(self.text))
+        self.text += answer.encode("utf-8")
+        self.offsets.append(len(self.text))
+        self.topic_ids.append(self._intern(topic, self.topics, self._topic_no))
+        # Source 0 means "no key"
+        self.source_ids.append(0 if source is None else self._intern(source, self.sources, self._source_no) + 1)
+        self.idents.append(ident)
+        bits = 0
+        for tag in tags:
+            bits |= 1 << self.tag_bit(tag)
+        self.tag_bits.append(bits)
+
+    def add_card(self, card, source=None, ident=0):
+        """Append a Card; its own key wins over `source`/`ident` when it has one."""
+        if card.key is not None:
+            source, _, number = card.key.rpartition("#")
+            ident = int(number) if number.isdigit() else 0
+        self.append(card.question, card.answer, card.topic, source, ident, card.tags)
+
+    def tag_bit(self, tag):
+        if tag not in self._tag_no and len(self.tags) >= MAX_TAGS:
+            raise ValueError(f"a deck holds at most {MAX_TAGS} distinct tags")
+        return self._intern(tag, self.tags, self._tag_no)
+
+    @staticmethod
+    def _intern(name, names, numbers):
+        number = numbers.get(name)
+        if number is None:
+            number = numbers[name] = len(names)
+            names.append(sys.intern(name))
+        return number
+
+    # ---------- reading ----------
+
+    def __len__(self):
+        return len(self.topic_ids)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("deck index out of range")
+        return Card(self.question(i), self.answer(i), self.topics[self.topic_ids[i]],
+                    self.key(i), self.tags_of(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def question(self, i):
+        return self.text[self.offsets[2 * i]:self.offsets[2 * i + 1]].decode("utf-8")
+
+    def answer(self, i):
+        return self.text[self.offsets[2 * i + 1]:self.offsets[2 * i + 2]].decode("utf-8")
+
+    def topic(self, i):
+        return self.topics[self.topic_ids[i]]
+
+    def key(self, i):
+        source = self.source_ids[i]
+        return None if source == 0 else card_key(self.sources[source - 1], self.idents[i])
+
+    def tags_of(self, i):
+        bits = self.tag_bits[i]
+        return tuple(tag for n, tag in enumerate(self.tags) if bits >> n & 1)
+
+    def topic_rows(self, topic):
+        """Row numbers of one topic, as an array (one pass over a 2-byte column)."""
+        number = self._topic_no.get(topic)
+        if number is None:
+            return array("I")
+        if np is not None:
+            return array("I", np.flatnonzero(self.columns()["topic"] == number).astype(np.uint32).tobytes())
+        return array("I", (i for i, t in enumerate(self.topic_ids) if t == number))
+
+    def columns(self):
+        """The metadata columns as NumPy arrays sharing the deck's memory
+        (plain arrays when NumPy is missing). Do not append while holding them."""
+        columns = {"topic": self.topic_ids, "source": self.source_ids,
+                   "ident": self.idents, "tags": self.tag_bits}
+        if np is None:
+            return columns
+        return {name: np.frombuffer(column, dtype=column.typecode) if len(column) else
+                np.zeros(0, dtype=column.typecode) for name, column in columns.items()}
+
+    def nbytes(self):
+        """Approximate memory held by the deck's buffers."""
+        return len(self.text) + sum(
+            column.itemsize * len(column)
+            for column in (self.offsets, self.topic_ids, self.source_ids, self.idents, self.tag_bits))
+
+    def view(self):
+        """Every card, in order, as a DeckView."""
+        return DeckView(self)
+
+
+class Permutation:
+    """Seeded random permutation of range(n).
+
+    Up to STORED_MAX indices the permutation is an ordinary shuffle kept
+    in an array. Larger ones store nothing per index: a balanced Feistel
+    network, keyed through a SplitMix64 round function, permutes the
+    smallest even-bit domain that covers n, and indices that land outside
+    range(n) are walked through the network again until they land inside
+    (cycle walking).
+    """
+
+    ROUNDS = 6
+    STORED_MAX = 1 << 14
+
+    def __init__(self, n, seed=None):
+        self.n = n
+        rng = random.Random(seed)
+        if n <= self.STORED_MAX:
+            self.order = array("l", rng.sample(range(n), n))
+            return
+        self.order = None
+        half = ((n - 1).bit_length() + 1) // 2
+        self.half_bits = half
+        self.mask = (1 << half) - 1
+        self.keys = [rng.getrandbits(64) for _ in range(self.ROUNDS)]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.n:
+            raise IndexError("permutation index out of range")
+        if self.order is not None:
+            return self.order[i]
+        x = self._encrypt(i)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
+
+    def _encrypt(self, x):
+        left, right = x >> self.half_bits, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (_splitmix64(right ^ key) & self.mask)
+        return (left << self.half_bits) | right
+
+
+def _splitmix64(z):
+    """SplitMix64 finalizer: every input bit affects every output bit."""
+    z = (z + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return z ^ (z >> 31)
+
+
+class DeckView:
+    """Lazy window onto a Deck: reversed, filtered and/or shuffled.
+
+    A view holds the deck, a row mapping (range, array or Permutation)
+    and a flipped flag; no card is copied. reversed() and shuffled() are
+    O(1). A filter scans its parent's rows once, on first use, into an
+    array('I') of row numbers. Views compose in any order.
+    """
+
+    def __init__(self, deck, rows=None, flipped=False, keep=None):
+        self.deck = deck
+        self.flipped = flipped
+        self._parent = range(len(deck)) if rows is None else rows
+        self._keep = keep       # row predicate for a filtered view, applied lazily
+        self._rows = None if keep is not None else self._parent
+
+    @property
+    def rows(self):
+        if self._rows is None:
+            parent = self._parent.rows if isinstance(self._parent, DeckView) else self._parent
+            self._rows = array("I", (row for row in _iter_rows(parent) if self._keep(row)))
+        return self._rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, i):
+        """Deck row of the view's i-th card."""
+        return self.rows[i]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        card = self.deck[self.row(i)]
+        if self.flipped:
+            card.question, card.answer = card.answer, card.question
+        return card
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def question(self, i):
+        row = self.row(i)
+        return self.deck.answer(row) if self.flipped else self.deck.question(row)
+
+    def answer(self, i):
+        row = self.row(i)
+        return self.deck.question(row) if self.flipped else self.deck.answer(row)
+
+    def key(self, i):
+        return self.deck.key(self.row(i))
+
+    # ---------- composing ----------
+
+    def reversed(self):
+        """Same cards with question and answer swapped (or swapped back)."""
+        view = DeckView(self.deck, self._parent, not self.flipped, self._keep)
+        view._rows = self._rows
+        return view
+
+    def topic(self, name):
+        if self._rows == range(len(self.deck)):
+            # Whole deck: the column scan is vectorised
+            return DeckView(self.deck, self.deck.topic_rows(name), self.flipped)
+        number = self.deck._topic_no.get(name)
+        topic_ids = self.deck.topic_ids
+        return DeckView(self.deck, self, self.flipped, lambda row: topic_ids[row] == number)
+
+    def tagged(self, tag):
+        number = self.deck._tag_no.get(tag)
+        bit = 0 if number is None else 1 << number
+        tag_bits = self.deck.tag_bits
+        return DeckView(self.deck, self, self.flipped, lambda row: tag_bits[row] & bit)
+
+    def shuffled(self, seed=None):
+        """Same cards in a seeded random order; the order is computed per index, never stored."""
+        return DeckView(self.deck, _Shuffled(self, Permutation(len(self), seed)), self.flipped)
+
+
+class _Shuffled:
+    """Rows of a parent view, read through a Permutation."""
+
+    __slots__ = ("parent", "permutation")
+
+    def __init__(self, parent, permutation):
+        self.parent = parent
+        self.permutation = permutation
+
+    def __len__(self):
+        return len(self.permutation)
+
+    def __getitem__(self, i):
+        return self.parent.row(self.permutation[i])
+
+
+def _iter_rows(rows):
+    if isinstance(rows, (range, array)):
+        return iter(rows)
+    return (rows[i] for i in range(len(rows)))
+
+
+class ViewStream:
+    """Walks a DeckView in order, with the next_key()/card_for_key() interface
+    of InterleavedStream, so practice sessions can run on any view."""
+
+    def __init__(self, view):
+        self.view = view
+        self.position = 0
+        self.last_key = None
+        self._packed = None     # sorted (source << 32 | ident) of the view's cards...
+        self._index = None      # ...and each one's position in the view
+
+    def __len__(self):
+        return len(self.view)
+
+    def __iter__(self):
+        return self
+
+    def next_key(self):
+        """Key of the next card, or None at the end. Cards without a key
+        cannot be scheduled or looked up, so they are passed over."""
+        key = None
+        while key is None and self.position < len(self.view):
+            key = self.view.key(self.position)
+            self.position += 1
+        self.last_key = key
+        return key
+
+    def __next__(self):
+        key = self.next_key()
+        if key is None:
+            raise StopIteration
+        return self.card_for_key(key)
+
+    def card_for_key(self, key):
+        """Card for a scheduler key, or None if it is not in the view."""
+        source, _, ident = key.rpartition("#")
+        number = self.view.deck._source_no.get(source)
+        if number is None or not ident.isdigit():
+            return None
+        if self._packed is None:
+            self._build_lookup()
+        packed = (number + 1) << 32 | int(ident)
+        i = bisect.bisect_left(self._packed, packed)
+        if i == len(self._packed) or self._packed[i] != packed:
+            return None
+        return self.view[self._index[i]]
+
+    def _build_lookup(self):
+        deck = self.view.deck
+        rows = self.view.rows
+        order = sorted(range(len(rows)), key=lambda i: deck.source_ids[rows[i]] << 32 | deck.idents[rows[i]])
+        self._index = array("I", order)
+        self._packed = array("Q", (deck.source_ids[rows[i]] << 32 | deck.idents[rows[i]] for i in order))
@@ -1,5 +1,136 @@
 # data_model_flashcard.py
+from functools import cache, cached_property
+
+from storage_flashcard import DB_PATH, DEFAULT_TOPIC
+
+# Everything behind AppData is imported where it is first used, so the
+# start page does not wait for NumPy, the journal or telemetry.
+
+# Built-in cards shown on the topic pages
+TOPIC_CARDS = {
+    "English": [
+        ("What is haha?", "haha is a tawa"),
+        ("what is huhu?", "huhu is a iyak")
+    ],
+    "Math": [
+        ("1+1", "2"),
+        ("2+2", "4")
+    ],
+    "Science": [
+        ("Who discovered gravity?", "Isaac Newton"),
+    ],
+    "History": [
+        ("Who killed Magellan?", "Lapu-Lapu"),
+        ("Where is Rizal’s head?", "On the one-peso coin")
+    ],
+}
+
+
+@cache
+def topic_deck():
+    """The same cards, columnar, for the topic pages (keys are card_key(topic, i))."""
+    from cards_flashcard import Deck
+    return Deck.from_topics(TOPIC_CARDS)
+
+
 class AppData:
-    def __init__(self):
+    def __init__(self, db_path=DB_PATH):
         self.username = ""
         self.theme = "light"
+        self.instant_transitions = False
+        self.db_path = db_path
+        self._telemetry = {}  # username -> TelemetryStore
+
+    # The store and scheduler are opened on first use so the start page
+    # can paint before SQLite is touched.
+    @cached_property
+    def store(self):
+        from storage_flashcard import CardStore
+        return CardStore(self.db_path)
+
+    @cached_property
+    def scheduler(self):
+        from scheduler_flashcard import Scheduler
+        return Scheduler(self.store)
+
+    @cached_property
+    def deck_scheduler(self):
+        """Review state of flashcards_data decks, kept apart from the card grids'."""
+        from scheduler_flashcard import Scheduler
+        return Scheduler(self.store, queue="decks")
+
+    @cached_property
+    def search(self):
+        from search_flashcard import SearchIndex, index_topics
+        index = SearchIndex(self.store.conn)
+        index_topics(self.store.conn, TOPIC_CARDS)
+        return index
+
+    @cached_property
+    def duplicates(self):
+        from dedupe_flashcard import DuplicateIndex
+        return DuplicateIndex(self.store.conn)
+
+    @cached_property
+    def journal(self):
+        from journal_flashcard import Journal
+        # Opening it replays whatever a crash left behind
+        return Journal(self.store.conn, self.db_path, self.db_path + ".journal")
+
+    @property
+    def telemetry(self):
+        """Review event log and rolling aggregates of the current profile
+        (AppData.username); each profile has its own folder."""
+        store = self._telemetry.get(self.username)
+        if store is None:
+            from telemetry_flashcard import TelemetryStore, profile_folder
+            from rollup_flashcard import Rollups
+            folder = profile_folder(self.username)
+            store = self._telemetry[self.username] = TelemetryStore(folder, Rollups(folder))
+        return store
+
+    def find_duplicates(self, question, answer):
+        """Near-identical saved cards as (similarity, id, question, answer).
+
+        Cards still in the journal are compared too, with id None.
+        """
+        return self.duplicates.find(question, answer, pending=self.journal.pending_cards())
+
+    def add_flashcard(self, question, answer, topic=DEFAULT_TOPIC):
+        """Journal a user-made card; it reaches the store at the next compaction."""
+        self.journal.create(question, answer, topic)
+
+    def request_sync(self):
+        """Ask for pending journal records to be compacted into the store,
+        without waiting; journal.on_sync is called when they are."""
+        if "journal" in self.__dict__:
+            self.journal.request_sync()
+
+    @property
+    def journal_failed(self):
+        return "journal" in self.__dict__ and self.journal.failed
+
+    def add_flashcards(self, pairs, topic=DEFAULT_TOPIC, skip_duplicates=True):
+        """Journal many cards, after any saved before them; returns the pairs left out.
+
+        Unless `skip_duplicates` is False, near-duplicates of saved cards,
+        of cards still in the journal or of each other are left out. The
+        next compaction stores the rest and their duplicate signatures in
+        one transaction; request_sync() asks for it straight away.
+        """
+        skipped = []
+        if skip_duplicates:
+            from dedupe_flashcard import BatchFilter
+            dupes = BatchFilter(self.duplicates, self.journal.pending_cards())
+            kept = []
+            for pair in pairs:
+                (kept if dupes.keep(*pair) is not None else skipped).append(pair)
+            pairs = kept
+        self.journal.create_many(pairs, topic)
+        return skipped
+
+    def close(self):
+        if "journal" in self.__dict__:
+            self.journal.close()
+        for store in self._telemetry.values():
+            store.close()
@@ -0,0 +1,289 @@
+# deck_formats_flashcard.py
+"""Readers and writers for deck interchange formats: CSV, TSV, JSON, Anki .apkg.
+
+Readers are generators of (position, question, answer) where `position`
+runs from 0 to deck_size(path), so callers can report progress while
+rows are still streaming. Writers take any iterable of (question, answer)
+and return the number of cards written.
+"""
+import csv
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import zipfile
+
+from deck_loader_flashcard import scan_deck
+
+CSV = "csv"
+TSV = "tsv"
+JSON = "json"
+APKG = "apkg"
+FORMATS = (CSV, TSV, JSON, APKG)
+FILE_FILTER = "Decks (*.csv *.tsv *.txt *.json *.apkg);;All files (*)"
+
+_HEADER = ("question", "answer")
+_TAG = re.compile(r"<[^>]+>")
+_BREAK = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+ANKI_SEP = "\x1f"
+
+
+class DeckFormatError(ValueError):
+    pass
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "txt":
+        return TSV
+    if ext not in FORMATS:
+        raise DeckFormatError(f"Unsupported deck format: .{ext}")
+    return ext
+
+
+def deck_size(path, fmt=None):
+    """Upper bound of the positions read_deck() reports for `path`."""
+    fmt = fmt or detect_format(path)
+    if fmt == APKG:
+        with _anki_collection(path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    return os.path.getsize(path)
+
+
+def read_deck(path, fmt=None):
+    fmt = fmt or detect_format(path)
+    if fmt == JSON:
+        return _read_json(path)
+    if fmt == APKG:
+        return _read_apkg(path)
+    return _read_delimited(path, "\t" if fmt == TSV else ",")
+
+
+def write_deck(path, cards, fmt=None):
+    fmt = fmt or detect_format(path)
+    if fmt == JSON:
+        return _write_json(path, cards)
+    if fmt == APKG:
+        return _write_apkg(path, cards)
+    return _write_delimited(path, cards, "\t" if fmt == TSV else ",")
+
+
+# ---------- CSV / TSV ----------
+
+def _read_delimited(path, delimiter):
+    with open(path, "rb") as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        first = True
+        for row in csv.reader(text, delimiter=delimiter):
+            if first:
+                first = False
+                if tuple(cell.strip().lower() for cell in row[:2]) == _HEADER:
+                    continue
+            if len(row) < 2 or not row[0].strip() or not row[1].strip():
+                continue
+            # raw.tell() runs ahead by at most one read buffer; fine for progress
+            yield raw.tell(), row[0].strip(), row[1].strip()
+
+
+def _write_delimited(path, cards, delimiter):
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(_HEADER)
+        for question, answer in cards:
+            writer.writerow((question, answer))
+            count += 1
+    return count
+
+
+# ---------- JSON (same shape as flashcards_data decks) ----------
+
+def _read_json(path):
+    for offset, length, card in scan_deck(path):
+        question = str(card.get("question", "")).strip()
+        answer = str(card.get("answer", "")).strip()
+        if question and answer:
+            yield offset + length, question, answer
+
+
+def _write_json(path, cards):
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for question, answer in cards:
+            f.write(",\n " if count else "\n ")
+            f.write(dumps({"question": question, "answer": answer}))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+# ---------- Anki .apkg ----------
+
+class _anki_collection:
+    """Context manager opening the collection inside an .apkg as SQLite."""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp = None
+        self.conn = None
+
+    def __enter__(self):
+        try:
+            with zipfile.ZipFile(self.path) as z:
+                names = set(z.namelist())
+                # collection.anki21b is zstd-compressed (Anki 2.1.50+ "latest" export)
+                member = next((n for n in ("collection.anki21", "collection.anki2") if n in names), None)
+                if member is None:
+                    raise DeckFormatError("No legacy collection in package; re-export with "
+                                          "'Support older Anki versions' enabled")
+                fd, self.tmp = tempfile.mkstemp(suffix=".anki2")
+                with os.fdopen(fd, "wb") as out, z.open(member) as src:
+                    while True:
+                        chunk = src.read(1 << 20)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+        except zipfile.BadZipFile as e:
+            raise DeckFormatError(f"Not an Anki package: {e}") from None
+        self.conn = sqlite3.connect(self.tmp)
+        return self.conn
+
+    def __exit__(self, *exc):
+        if self.conn is not None:
+            self.conn.close()
+        if self.tmp is not None:
+            os.remove(self.tmp)
+
+
+def _anki_text(field):
+    return html.unescape(_TAG.sub("", _BREAK.sub("\n", field))).strip()
+
+
+def _read_apkg(path):
+    with _anki_collection(path) as conn:
+        for n, (flds,) in enumerate(conn.execute("SELECT flds FROM notes ORDER BY id"), 1):
+            fields = flds.split(ANKI_SEP)
+            if len(fields) < 2:
+                continue
+            question, answer = _anki_text(fields[0]), _anki_text(fields[1])
+            if question and answer:
+                yield n, question, answer
+
+
+ANKI_SCHEMA = """
+CREATE TABLE col (id integer primary key, crt integer not null, mod integer not null,
+    scm integer not null, ver integer not null, dty integer not null, usn integer not null,
+    ls integer not null, conf text not null, models text not null, decks text not null,
+    dconf text not null, tags text not null);
+CREATE TABLE notes (id integer primary key, guid text not null, mid integer not null,
+    mod integer not null, usn integer not null, tags text not null, flds text not null,
+    sfld integer not null, csum integer not null, flags integer not null, data text not null);
+CREATE TABLE cards (id integer primary key, nid integer not null, did integer not null,
+    ord integer not null, mod integer not null, usn integer not null, type integer not null,
+    queue integer not null, due integer not null, ivl integer not null, factor integer not null,
+    reps integer not null, lapses integer not null, left integer not null, odue integer not null,
+    odid integer not null, flags integer not null, data text not null);
+CREATE TABLE revlog (id integer primary key, cid integer not null, usn integer not null,
+    ease integer not null, ivl integer not null, lastIvl integer not null, factor integer not null,
+    time integer not null, type integer not null);
+CREATE TABLE graves (usn integer not null, oid integer not null, type integer not null);
+CREATE INDEX ix_notes_usn on notes (usn);
+CREATE INDEX ix_cards_usn on cards (usn);
+CREATE INDEX ix_revlog_usn on revlog (usn);
+CREATE INDEX ix_cards_nid on cards (nid);
+CREATE INDEX ix_cards_sched on cards (did, queue, due);
+CREATE INDEX ix_revlog_cid on revlog (cid);
+CREATE INDEX ix_notes_csum on notes (csum);
+"""
+
+
+def _anki_col_row(now, deck_name):
+    mid, did = now * 1000, now * 1000 + 1
+    model = {
+        "id": mid, "name": "Remora Basic", "type": 0, "mod": now, "usn": -1, "sortf": 0,
+        "did": did, "tags": [], "vers": [], "latexPre": "", "latexPost": "",
+        "css": ".card { font-family: arial; font-size: 20px; text-align: center; }",
+        "flds": [
+            {"name": name, "ord": i, "sticky": False, "rtl": False, "font": "Arial", "size": 20, "media": []}
+            for i, name in enumerate(("Front", "Back"))
+        ],
+        "tmpls": [{
+            "name": "Card 1", "ord": 0, "did": None, "bqfmt": "", "bafmt": "",
+            "qfmt": "{{Front}}", "afmt": "{{FrontSide}}<hr id=answer>{{Back}}",
+        }],
+        "req": [[0, "all", [0]]],
+    }
+    deck = {
+        "name": "", "extendRev": 50, "usn": 0, "collapsed": False, "newToday": [0, 0],
+        "revToday": [0, 0], "lrnToday": [0, 0], "timeToday": [0, 0], "dyn": 0,
+        "extendNew": 10, "conf": 1, "desc": "", "mod": now,
+    }
+    decks = {"1": dict(deck, id=1, name="Default"), str(did): dict(deck, id=did, name=deck_name)}
+    dconf = {"1": {
+        "id": 1, "name": "Default", "mod": 0, "usn": 0, "maxTaken": 60, "autoplay": True,
+        "timer": 0, "replayq": True, "dyn": False,
+        "new": {"delays": [1, 10], "ints": [1, 4, 7], "initialFactor": 2500, "order": 1,
+                "perDay": 20, "bury": True, "separate": True},
+        "rev": {"perDay": 100, "ease4": 1.3, "fuzz": 0.05, "maxIvl": 36500, "ivlFct": 1,
+                "minSpace": 1, "bury": True},
+        "lapse": {"delays": [10], "mult": 0, "minInt": 1, "leechFails": 8, "leechAction": 0},
+    }}
+    conf = {"nextPos": 1, "estTimes": True, "activeDecks": [1], "sortType": "noteFld",
+            "timeLim": 0, "sortBackwards": False, "addToCur": True, "curDeck": 1,
+            "newBury": True, "newSpread": 0, "dueCounts": True, "curModel": str(mid),
+            "collapseTime": 1200}
+    row = (1, now, now * 1000, now * 1000, 11, 0, 0, 0, json.dumps(conf),
+           json.dumps({str(mid): model}), json.dumps(decks), json.dumps(dconf), "{}")
+    return row, mid, did
+
+
+def _anki_field(text):
+    return html.escape(text).replace("\n", "<br>")
+
+
+def _write_apkg(path, cards, deck_name="Remora"):
+    now = int(time.time())
+    fd, tmp = tempfile.mkstemp(suffix=".anki2")
+    os.close(fd)
+    count = 0
+    try:
+        conn = sqlite3.connect(tmp)
+        conn.executescript(ANKI_SCHEMA)
+        col, mid, did = _anki_col_row(now, deck_name)
+        conn.execute("INSERT INTO col VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", col)
+        base = now * 1000 + 10
+        notes, rows = [], []
+        for question, answer in cards:
+            nid = base + count
+            front = _anki_field(question)
+            guid = hashlib.sha1(f"{question}\x1f{answer}".encode("utf-8")).hexdigest()[:10]
+            csum = int(hashlib.sha1(question.encode("utf-8")).hexdigest()[:8], 16)
+            notes.append((nid, guid, mid, now, -1, "", front + ANKI_SEP + _anki_field(answer),
+                          question, csum, 0, ""))
+            rows.append((nid, nid, did, 0, now, -1, 0, 0, count + 1, 0, 0, 0, 0, 0, 0, 0, 0, ""))
+            count += 1
+            if len(notes) >= 5000:
+                _flush_anki(conn, notes, rows)
+        _flush_anki(conn, notes, rows)
+        conn.commit()
+        conn.close()
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+            z.write(tmp, "collection.anki2")
+            z.writestr("media", "{}")
+    finally:
+        os.remove(tmp)
+    return count
+
+
+def _flush_anki(conn, notes, rows):
+    conn.executemany("INSERT INTO notes VALUES (?,?,?,?,?,?,?,?,?,?,?)", notes)
+    conn.executemany("INSERT INTO cards VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+    notes.clear()
+    rows.clear()
@@ -0,0 +1,90 @@
+# deck_loader_flashcard.py
+import json
+import os
+import re
+
+DECK_FOLDER = "flashcards_data"
+CHUNK_SIZE = 64 * 1024
+
+# Structural bytes outside strings, and the bytes that matter inside one.
+# JSON syntax is pure ASCII and UTF-8 continuation bytes never look like
+# ASCII, so scanning raw bytes is safe and gives exact byte offsets.
+_STRUCT = re.compile(rb'[\[\]{}"]')
+_STRING_END = re.compile(rb'["\\]')
+
+
+def list_decks(folder=DECK_FOLDER):
+    """Sorted paths of the .json decks in `folder` (empty if it is missing)."""
+    if not os.path.isdir(folder):
+        return []
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".json")
+    )
+
+
+def scan_deck(path, chunk_size=CHUNK_SIZE, start=0):
+    """Yield (offset, length, card) for each object in a JSON array deck.
+
+    The file is read in chunks and each card is decoded on its own, so the
+    first card is available without parsing the rest of the file. A
+    non-zero `start` must be the offset of a card yielded by an earlier
+    scan; scanning resumes there.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        buf = b""
+        base = start    # file offset of buf[0]
+        pos = 0
+        depth = 1 if start else 0
+        start = None    # buffer index of the '{' of the card being read
+        in_string = False
+        while True:
+            if in_string:
+                m = _STRING_END.search(buf, pos)
+                if m is not None and m.group() == b"\\" and m.end() < len(buf):
+                    pos = m.end() + 1
+                    continue
+                if m is not None and m.group() == b'"':
+                    in_string = False
+                    pos = m.end()
+                    continue
+                if m is not None:
+                    pos = m.start()  # escape split across chunks
+            else:
+                m = _STRUCT.search(buf, pos)
+                if m is not None:
+                    c = m.group()
+                    pos = m.end()
+                    if c == b'"':
+                        in_string = True
+                    elif c in b"{[":
+                        depth += 1
+                        if depth == 2 and c == b"{":
+                            start = m.start()
+                    else:
+                        if depth == 2 and start is not None:
+                            raw = buf[start:pos]
+                            yield base + start, len(raw), json.loads(raw)
+                            start = None
+                        depth -= 1
+                    continue
+
+            # Need more input: drop consumed bytes, then read the next chunk
+            keep = start if start is not None else pos
+            buf = buf[keep:]
+            base += keep
+            pos -= keep
+            if start is not None:
+                start = 0
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buf += chunk
+
+
+def read_card(path, offset, length):
+    """Decode a single card given its byte range."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
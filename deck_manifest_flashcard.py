@@ -0,0 +1,185 @@
+# deck_manifest_flashcard.py
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+
+from cards_flashcard import Card
+from deck_loader_flashcard import DECK_FOLDER, list_decks, scan_deck, read_card
+from scheduler_flashcard import card_key
+
+MANIFEST_NAME = ".deck_manifest"
+MANIFEST_MAGIC = b"REMMANI\0"
+MANIFEST_VERSION = 2
+HASH_CHUNK = 1024 * 1024
+LARGE_DECK_BYTES = 256 * 1024 * 1024  # bigger decks are streamed, not indexed
+
+# magic, version, length of the JSON entry list; then per entry (in list
+# order) its offsets and lengths arrays, little-endian
+_HEADER = struct.Struct("<8sHI")
+
+
+def file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+class DeckEntry:
+    """What the manifest remembers about one deck file."""
+
+    __slots__ = ("size", "mtime_ns", "digest", "offsets", "lengths")
+
+    def __init__(self, size, mtime_ns, digest, offsets, lengths):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.offsets = offsets  # array('Q') of card byte offsets
+        self.lengths = lengths  # array('I') of card byte lengths
+
+    @property
+    def count(self):
+        return len(self.offsets)
+
+
+def _little_endian(column):
+    if sys.byteorder != "little":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def _read_column(data, pos, code, count):
+    column = array(code)
+    end = pos + count * column.itemsize
+    if end > len(data):
+        raise ValueError("truncated manifest")
+    column.frombytes(data[pos:end])
+    return _little_endian(column), end
+
+
+class DeckManifest:
+    """Persistent per-folder index of deck files.
+
+    A deck is re-parsed only when its size/mtime changed *and* its content
+    hash differs from the cached one. Cards are then read straight from
+    their byte range, so unchanged decks never go through a full parse.
+
+    Decks over `large_deck_bytes` are not indexed (their offsets alone
+    could outgrow memory) and are not searchable; refresh() lists them in
+    `large` for interleave_flashcard.ScanTopic to stream.
+    """
+
+    def __init__(self, folder=DECK_FOLDER, large_deck_bytes=LARGE_DECK_BYTES):
+        self.folder = folder
+        self.path = os.path.join(folder, MANIFEST_NAME)
+        self.large_deck_bytes = large_deck_bytes
+        self.entries = {}  # deck file name -> DeckEntry
+        self.large = []    # names of decks too big to index
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Read the cached index; anything unreadable is a cache miss."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            self.entries = self._parse(data)
+        except (OSError, ValueError, TypeError, KeyError, struct.error):
+            self.entries = {}
+
+    @staticmethod
+    def _parse(data):
+        magic, version, size = _HEADER.unpack_from(data)
+        if magic != MANIFEST_MAGIC or version != MANIFEST_VERSION:
+            raise ValueError("not a current deck manifest")
+        pos = _HEADER.size + size
+        entries = {}
+        for item in json.loads(data[_HEADER.size:pos]):
+            name = item["name"]
+            if not isinstance(name, str) or os.path.basename(name) != name:
+                raise ValueError(f"bad deck name {name!r}")
+            offsets, pos = _read_column(data, pos, "Q", item["count"])
+            lengths, pos = _read_column(data, pos, "I", item["count"])
+            entries[name] = DeckEntry(int(item["size"]), int(item["mtime_ns"]),
+                                      bytes.fromhex(item["digest"]), offsets, lengths)
+        return entries
+
+    def save(self):
+        if not self.dirty or not os.path.isdir(self.folder):
+            return
+        items = [
+            {"name": name, "size": entry.size, "mtime_ns": entry.mtime_ns,
+             "digest": entry.digest.hex(), "count": entry.count}
+            for name, entry in self.entries.items()
+        ]
+        listing = json.dumps(items, ensure_ascii=False).encode("utf-8")
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MANIFEST_MAGIC, MANIFEST_VERSION, len(listing)))
+            f.write(listing)
+            for entry in self.entries.values():
+                _little_endian(entry.offsets).tofile(f)
+                _little_endian(entry.lengths).tofile(f)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def _index(self, path, st, digest):
+        offsets = array("Q")
+        lengths = array("I")
+        for offset, length, _card in scan_deck(path):
+            offsets.append(offset)
+            lengths.append(length)
+        return DeckEntry(st.st_size, st.st_mtime_ns, digest, offsets, lengths)
+
+    def refresh(self):
+        """Bring the manifest up to date with the folder; returns re-parsed deck names."""
+        seen = set()
+        reparsed = []
+        self.large = []
+        for path in list_decks(self.folder):
+            name = os.path.basename(path)
+            st = os.stat(path)
+            if st.st_size > self.large_deck_bytes:
+                self.large.append(name)
+                continue
+            seen.add(name)
+            entry = self.entries.get(name)
+            if entry and entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns:
+                continue
+            digest = file_digest(path)
+            if entry and entry.digest == digest:
+                entry.mtime_ns = st.st_mtime_ns  # touched, not changed
+            else:
+                self.entries[name] = self._index(path, st, digest)
+                reparsed.append(name)
+            self.dirty = True
+        for name in set(self.entries) - seen:
+            del self.entries[name]
+            self.dirty = True
+        self.save()
+        return reparsed
+
+    @property
+    def names(self):
+        return sorted(self.entries)
+
+    @property
+    def total(self):
+        return sum(entry.count for entry in self.entries.values())
+
+    @property
+    def bytes_per_card(self):
+        """Average card size of the indexed decks, to estimate the size of large ones."""
+        cards = self.total
+        return sum(entry.size for entry in self.entries.values()) / cards if cards else None
+
+    def card(self, name, i):
+        entry = self.entries[name]
+        card = read_card(os.path.join(self.folder, name), entry.offsets[i], entry.lengths[i])
+        return Card.from_dict(card, os.path.splitext(name)[0], card_key(name, i))
+
@@ -0,0 +1,352 @@
+# dedupe_flashcard.py
+"""Near-duplicate card detection with MinHash signatures and LSH buckets.
+
+A card's text (question and answer) is cut into character 3-grams. Its
+signature is a one-permutation MinHash: each shingle's crc32 picks one
+of NUM_HASHES bins and only the bin minimum is kept. Empty bins are
+filled from the next non-empty bin (rotation densification). That costs
+one hash per shingle, not one per shingle and permutation.
+
+Signatures are split into BANDS bands of ROWS values. Each band is
+stored as a bucket in the `lsh` table, so finding candidates for a new
+card takes a single indexed lookup, however large the library is.
+Candidates are then confirmed by their exact shingle Jaccard similarity.
+"""
+import hashlib
+import re
+import time
+import zlib
+from array import array
+
+NUM_HASHES = 32
+BANDS = 8
+ROWS = NUM_HASHES // BANDS
+BIN_BITS = 5                      # log2(NUM_HASHES)
+VALUE_LIMIT = 1 << (32 - BIN_BITS)
+EMPTY = 0xFFFFFFFF
+SHINGLE = 3
+THRESHOLD = 0.8                   # Jaccard similarity that counts as a duplicate
+BACKFILL_BATCH = 5000
+BUCKET_LIMIT = 64                 # cards compared per bucket; keeps common buckets cheap
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS minhash (
+    card_id INTEGER PRIMARY KEY,
+    sig BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    card_id INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, card_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_lsh_card ON lsh(card_id);
+CREATE TABLE IF NOT EXISTS removed_cards (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    created REAL NOT NULL,
+    kept_id INTEGER NOT NULL,
+    removed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_removed_time ON removed_cards(removed);
+CREATE TRIGGER IF NOT EXISTS minhash_card_gone AFTER DELETE ON cards BEGIN
+    DELETE FROM minhash WHERE card_id = old.id;
+    DELETE FROM lsh WHERE card_id = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS minhash_card_edited AFTER UPDATE OF question, answer ON cards BEGIN
+    DELETE FROM minhash WHERE card_id = old.id;
+    DELETE FROM lsh WHERE card_id = old.id;
+END;
+"""
+
+SQL_ADD_SIG = "INSERT OR REPLACE INTO minhash (card_id, sig) VALUES (?, ?)"
+SQL_ADD_BAND = "INSERT OR IGNORE INTO lsh (band, bucket, card_id) VALUES (?, ?, ?)"
+SQL_CANDIDATES = (
+    "SELECT id, question, answer FROM cards WHERE id IN ("
+    + " UNION ".join(
+        ["SELECT * FROM (SELECT card_id FROM lsh WHERE band = ? AND bucket = ? LIMIT ?)"] * BANDS
+    )
+    + ")"
+)
+SQL_UNSIGNED = (
+    "SELECT c.id, c.question, c.answer FROM cards c LEFT JOIN minhash m ON m.card_id = c.id "
+    "WHERE m.card_id IS NULL AND c.id > ? ORDER BY c.id LIMIT ?"
+)
+
+_WORD = re.compile(r"\w+")
+
+
+def shingles(question, answer):
+    """Character 3-grams of the normalised card text (case, spacing and punctuation ignored)."""
+    text = " ".join(_WORD.findall(f"{question} | {answer}".lower())).encode("utf-8")
+    if len(text) <= SHINGLE:
+        return {text}
+    return {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+
+
+def signature(question, answer, grams=None):
+    """MinHash signature as bytes (NUM_HASHES little-endian uint32)."""
+    if grams is None:
+        grams = shingles(question, answer)
+    mask = NUM_HASHES - 1
+    # Descending order, so the last write to each bin is its minimum
+    bins = {h & mask: h >> BIN_BITS for h in sorted(map(zlib.crc32, grams), reverse=True)}
+    sig = [bins.get(i, EMPTY) for i in range(NUM_HASHES)]
+    # Rotation densification: an empty bin takes the next filled bin's value,
+    # shifted by the distance so borrowed values do not collide by accident
+    for i in range(NUM_HASHES):
+        if sig[i] == EMPTY:
+            for step in range(1, NUM_HASHES):
+                v = sig[(i + step) % NUM_HASHES]
+                if v < VALUE_LIMIT:
+                    sig[i] = (v + step * VALUE_LIMIT) & 0xFFFFFFFF
+                    break
+    return array("I", sig).tobytes()
+
+
+def band_keys(sig):
+    """(band, bucket) pairs; bucket is a signed 64-bit hash of the band's rows."""
+    width = ROWS * 4
+    return [
+        (band, int.from_bytes(hashlib.blake2b(sig[band * width:(band + 1) * width], digest_size=8).digest(),
+                              "little", signed=True))
+        for band in range(BANDS)
+    ]
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def ensure_schema(conn):
+    with conn:
+        conn.executescript(SCHEMA)
+
+
+class DuplicateIndex:
+    """Persistent LSH index over the cards table, updated card by card."""
+
+    def __init__(self, conn, threshold=THRESHOLD):
+        self.conn = conn
+        self.threshold = threshold
+        ensure_schema(conn)
+
+    def find(self, question, answer, limit=5, pending=()):
+        """Near-duplicates of a card as (similarity, id, question, answer), best first.
+
+        `pending` (question, answer) pairs are cards not indexed yet (still
+        in the journal); they are compared too and reported with id None.
+        """
+        grams = shingles(question, answer)
+        keys = band_keys(signature(question, answer, grams))
+        rows = self.candidates(keys) + [(None, q, a) for q, a in pending]
+        return self.confirm(grams, rows)[:limit]
+
+    def candidates(self, keys):
+        params = [v for band, bucket in keys for v in (band, bucket, BUCKET_LIMIT)]
+        return self.conn.execute(SQL_CANDIDATES, params).fetchall()
+
+    def confirm(self, grams, rows):
+        hits = []
+        for card_id, question, answer in rows:
+            similarity = jaccard(grams, shingles(question, answer))
+            if similarity >= self.threshold:
+                hits.append((similarity, card_id, question, answer))
+        hits.sort(key=lambda hit: hit[0], reverse=True)
+        return hits
+
+    def add(self, card_id, question, answer, sig=None):
+        """Index a card that was just inserted (call inside its transaction)."""
+        self.add_many([(card_id, question, answer, sig)])
+
+    def add_many(self, cards):
+        """Index (card_id, question, answer, sig or None) rows in two statements."""
+        sigs, bands = [], []
+        for card_id, question, answer, sig in cards:
+            sig = sig or signature(question, answer)
+            sigs.append((card_id, sig))
+            bands.extend((band, bucket, card_id) for band, bucket in band_keys(sig))
+        self.conn.executemany(SQL_ADD_SIG, sigs)
+        self.conn.executemany(SQL_ADD_BAND, bands)
+
+    def backfill(self, batch=BACKFILL_BATCH, progress=None, cancelled=None):
+        """Sign cards that have no signature yet (older cards, edited cards)."""
+        done = 0
+        after = 0
+        while not (cancelled and cancelled()):
+            rows = self.conn.execute(SQL_UNSIGNED, (after, batch)).fetchall()
+            if not rows:
+                break
+            with self.conn:
+                self.add_many((card_id, question, answer, None) for card_id, question, answer in rows)
+            after = rows[-1][0]
+            done += len(rows)
+            if progress:
+                progress(done)
+        return done
+
+
+class BatchFilter:
+    """Drops near-duplicates from a stream of new cards.
+
+    A card is dropped if it is close to a card already in the index, to
+    one of the `pending` (question, answer) pairs (cards saved but not
+    indexed yet) or to an earlier card of the same batch stream. Survivors
+    are remembered in memory until they are inserted and passed to
+    DuplicateIndex.add().
+    """
+
+    def __init__(self, index, pending=()):
+        self.index = index
+        self.pending = {}   # (band, bucket) -> shingles of kept, not yet indexed cards
+        self.skipped = 0
+        for question, answer in pending:
+            self._remember(shingles(question, answer), band_keys(signature(question, answer)))
+
+    def keep(self, question, answer):
+        """The card's signature if it should be kept, None if it is a duplicate."""
+        grams = shingles(question, answer)
+        sig = signature(question, answer, grams)
+        keys = band_keys(sig)
+        for key in keys:
+            other = self.pending.get(key)
+            if other is not None and jaccard(grams, other) >= self.index.threshold:
+                self.skipped += 1
+                return None
+        if self.index.confirm(grams, self.index.candidates(keys)):
+            self.skipped += 1
+            return None
+        self._remember(grams, keys)
+        return sig
+
+    def _remember(self, grams, keys):
+        for key in keys:
+            self.pending.setdefault(key, grams)
+
+    def flush(self):
+        """Forget pending cards once they are in the index."""
+        self.pending.clear()
+
+
+def find_groups(conn, threshold=THRESHOLD, progress=None):
+    """Group every near-duplicate card in the library; offline pass.
+
+    Expects signatures for all cards (run DuplicateIndex.backfill first).
+    Candidate pairs come from equal LSH buckets, read band by band in
+    bucket order straight from the `lsh` primary key, so memory holds one
+    bucket at a time plus the union-find parent map. Pairs are confirmed
+    by exact Jaccard similarity. Returns lists of card ids, oldest first.
+    """
+    parent = {}
+
+    def root(x):
+        while parent.get(x, x) != x:
+            parent[x] = parent.get(parent[x], parent[x])  # path halving
+            x = parent[x]
+        return x
+
+    def union(a, b):
+        ra, rb = root(a), root(b)
+        if ra != rb:
+            parent.setdefault(ra, ra)
+            parent.setdefault(rb, rb)
+            parent[max(ra, rb)] = min(ra, rb)
+
+    texts = {}
+
+    def grams_of(card_id):
+        grams = texts.get(card_id)
+        if grams is None:
+            row = conn.execute("SELECT question, answer FROM cards WHERE id = ?", (card_id,)).fetchone()
+            grams = texts[card_id] = shingles(*row) if row else set()
+        return grams
+
+    for band in range(BANDS):
+        bucket_ids, current = [], None
+        rows = conn.execute("SELECT bucket, card_id FROM lsh WHERE band = ? ORDER BY bucket, card_id", (band,))
+        for bucket, card_id in rows:
+            if bucket != current:
+                _union_bucket(bucket_ids, grams_of, root, union, threshold)
+                bucket_ids, current = [], bucket
+            bucket_ids.append(card_id)
+        _union_bucket(bucket_ids, grams_of, root, union, threshold)
+        texts.clear()
+        if progress:
+            progress(band + 1, BANDS)
+
+    groups = {}
+    for card_id in list(parent):
+        groups.setdefault(root(card_id), []).append(card_id)
+    return [sorted(ids) for ids in groups.values() if len(ids) > 1]
+
+
+def _union_bucket(ids, grams_of, root, union, threshold):
+    # Compare each card with the first card of each cluster in this bucket.
+    # At most BUCKET_LIMIT clusters are tracked, so a crowded bucket costs
+    # O(cards * BUCKET_LIMIT) rather than O(cards ** 2).
+    if len(ids) < 2:
+        return
+    heads = []
+    for card_id in ids:
+        grams = grams_of(card_id)
+        for head in heads:
+            if root(head) == root(card_id) or jaccard(grams, grams_of(head)) >= threshold:
+                union(head, card_id)
+                break
+        else:
+            if len(heads) < BUCKET_LIMIT:
+                heads.append(card_id)
+
+
+def group_preview(conn, groups, limit=50):
+    """Question of each card in the first `limit` groups, oldest (kept) first."""
+    preview = []
+    for ids in groups[:limit]:
+        rows = dict(conn.execute(
+            f"SELECT id, question FROM cards WHERE id IN ({','.join('?' * len(ids))})", ids))
+        preview.append([rows.get(card_id, "") for card_id in ids])
+    return preview
+
+
+def merge_groups(conn, groups):
+    """Keep the oldest card of each group and move the rest to removed_cards.
+
+    Removed cards keep their ids, so restore_removed() brings them back
+    with their review history. Returns the number removed.
+    """
+    now = time.time()
+    doomed = [(ids[0], now, card_id) for ids in groups for card_id in ids[1:]]
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO removed_cards "
+            "SELECT id, topic, question, answer, created, ?, ? FROM cards WHERE id = ?", doomed)
+        conn.executemany("DELETE FROM cards WHERE id = ?", [(card_id,) for _, _, card_id in doomed])
+    return len(doomed)
+
+
+def restore_removed(conn, since=None):
+    """Put cards removed at or after `since` (default: the last merge) back; returns how many.
+
+    Cards come back under their own ids, which the cards table never
+    hands out again; only in a store from before that (see CardStore)
+    could an id have been taken, and such a card gets a new one.
+    """
+    if since is None:
+        since = conn.execute("SELECT MAX(removed) FROM removed_cards").fetchone()[0]
+        if since is None:
+            return 0
+    rows = conn.execute(
+        "SELECT id, topic, question, answer, created, id IN (SELECT id FROM cards) "
+        "FROM removed_cards WHERE removed >= ?", (since,)).fetchall()
+    with conn:
+        # Free ids first, so a renumbered card cannot take one of them
+        conn.executemany("INSERT INTO cards (id, topic, question, answer, created) VALUES (?, ?, ?, ?, ?)",
+                         [row[:5] for row in rows if not row[5]])
+        conn.executemany("INSERT INTO cards (topic, question, answer, created) VALUES (?, ?, ?, ?)",
+                         [row[1:5] for row in rows if row[5]])
+        conn.execute("DELETE FROM removed_cards WHERE removed >= ?", (since,))
+    return len(rows)
@@ -0,0 +1,105 @@
+# image_cache_flashcard.py
+import hashlib
+import os
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon, QPixmap, QPixmapCache
+
+THUMB_DIR = ".thumbnails"
+CACHE_LIMIT_KB = 64 * 1024
+ICON_SIZES = (16, 32, 64, 256)
+
+
+class ImageCache:
+    """Process-wide decoded image cache on top of QPixmapCache.
+
+    Each (path, size) variant is decoded and scaled once per run. Scaled
+    variants are also written to `thumb_dir`, so later runs load a small PNG
+    instead of decoding and smooth-scaling the full-size asset again.
+    """
+
+    def __init__(self, thumb_dir=THUMB_DIR, use_disk=True):
+        self.thumb_dir = thumb_dir
+        self.use_disk = use_disk
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._icons = {}
+        self._limit_set = False
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "disk_hits": self.disk_hits}
+
+    def _thumb_path(self, path, width, height):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        key = f"{os.path.abspath(path)}|{mtime}|{width}x{height}".encode("utf-8")
+        return os.path.join(self.thumb_dir, hashlib.sha1(key).hexdigest() + ".png")
+
+    def pixmap(self, path, width=None, height=None, source=None):
+        """Decoded pixmap of `path`, scaled to fit width x height if given.
+
+        `source` is an optional callable returning the already decoded
+        full-size image, used when several variants are made at once.
+        """
+        if height is None:
+            height = width
+        key = f"remora:{path}@{width}x{height}"
+        cached = QPixmapCache.find(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        if not self._limit_set:
+            QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), CACHE_LIMIT_KB))
+            self._limit_set = True
+
+        if width is None:
+            pixmap = QPixmap(path)
+        else:
+            pixmap = self._load_scaled(path, width, height, source)
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def _load_scaled(self, path, width, height, source=None):
+        thumb = self._thumb_path(path, width, height) if self.use_disk else None
+        if thumb and os.path.exists(thumb):
+            pixmap = QPixmap(thumb)
+            if not pixmap.isNull():
+                self.disk_hits += 1
+                return pixmap
+
+        # Decode the full image only for as long as it takes to scale it
+        full = source() if source is not None else QPixmap(path)
+        pixmap = full.scaled(
+            width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        )
+        if thumb and not pixmap.isNull():
+            os.makedirs(self.thumb_dir, exist_ok=True)
+            pixmap.save(thumb, "PNG")
+        return pixmap
+
+    def icon(self, path):
+        """QIcon built from a few pre-scaled variants instead of the full image."""
+        icon = self._icons.get(path)
+        if icon is not None:
+            self.hits += 1
+            return icon
+        decoded = []
+
+        def full():
+            if not decoded:
+                decoded.append(QPixmap(path))
+            return decoded[0]
+
+        icon = QIcon()
+        for size in ICON_SIZES:
+            icon.addPixmap(self.pixmap(path, size, source=full))
+        self._icons[path] = icon
+        return icon
+
+
+images = ImageCache()
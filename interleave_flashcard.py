@@ -0,0 +1,287 @@
+# interleave_flashcard.py
+"""Stratified interleaving: one stream per deck, mixed by weight.
+
+Each deck (topic) is drawn from its own stream, so no combined list of the
+whole library is ever built:
+
+- IndexedTopic walks a deck listed in the manifest through a seeded
+  Permutation of its card numbers, reproducible for a seed (see
+  Permutation for what it keeps in memory). BinaryTopic does the same
+  over a memory-mapped .rdeck file.
+- ScanTopic streams a deck too big to index (DeckManifest.large) through
+  a fixed-size reservoir: each draw takes a random slot and refills it
+  with the next card, so memory is bounded by the reservoir.
+
+InterleavedStream picks the topic of each draw by smooth weighted
+round-robin (equal weights give plain round-robin; the default weight is
+the deck size, so decks are drawn in proportion to their size). No topic
+is picked more than `max_run` times in a row while any other topic still
+has cards; a deck much larger than the rest is therefore held back and
+outlasts them. Keys the caller would skip (`skip`, e.g. cards the
+scheduler already knows) are passed over inside their topic, so they
+never break a run the caller sees.
+"""
+import os
+import random
+from array import array
+from collections import OrderedDict
+
+from binary_deck_flashcard import BinaryDeck, BinaryDeckError, list_binary_decks
+from cards_flashcard import Card, Permutation
+from deck_loader_flashcard import scan_deck
+from scheduler_flashcard import card_key
+
+MAX_RUN = 2
+RESERVOIR_SIZE = 256
+CHECKPOINT_EVERY = 1024    # ScanTopic remembers the offset of every 1024th card
+DEFAULT_CARD_BYTES = 100   # size estimate for a streamed deck when nothing is indexed
+
+
+class IndexedTopic:
+    """Cards of one manifest deck in a seeded random order."""
+
+    def __init__(self, manifest, name, seed=None, weight=None):
+        self.manifest = manifest
+        self.name = name
+        self.count = manifest.entries[name].count
+        self.order = Permutation(self.count, seed)
+        self.position = 0
+        self.weight = self.count if weight is None else weight
+        self.current = 0    # smooth round-robin credit
+
+    @property
+    def exhausted(self):
+        return self.position >= self.count
+
+    def next_key(self):
+        if self.exhausted:
+            return None
+        i = self.order[self.position]
+        self.position += 1
+        return card_key(self.name, i)
+
+    def close(self):
+        pass  # cards are read from the deck file one at a time; nothing is held open
+
+    def card(self, i):
+        entry = self.manifest.entries.get(self.name)
+        if entry is None or i >= entry.count:
+            return None
+        return self.manifest.card(self.name, i)
+
+
+class BinaryTopic(IndexedTopic):
+    """Cards of a memory-mapped binary deck in a seeded random order."""
+
+    def __init__(self, deck, seed=None, weight=None):
+        self.deck = deck
+        self.name = deck.source
+        self.count = len(deck)
+        self.order = Permutation(self.count, seed)
+        self.position = 0
+        self.weight = self.count if weight is None else weight
+        self.current = 0
+
+    def close(self):
+        self.deck.close()
+
+    def card(self, i):
+        return self.deck[i] if i < self.count else None
+
+
+class ScanTopic:
+    """Cards of a deck too big to index, shuffled through a bounded reservoir.
+
+    The file is read once, in order. Card i keeps key card_key(name, i),
+    so reviews work as for other decks: card() returns a card just drawn
+    from a small cache, and any other one (say a review due from an
+    earlier session) by scanning on from the nearest checkpoint. `count`
+    starts as an estimate and is exact once the whole file has been read.
+    """
+
+    def __init__(self, folder, name, count, seed=None, weight=None, size=RESERVOIR_SIZE):
+        self.path = os.path.join(folder, name)
+        self.name = name
+        self.topic = os.path.splitext(name)[0]
+        self.count = count
+        self.weight = count if weight is None else weight
+        self.current = 0
+        self.rng = random.Random(seed)
+        self.size = size
+        self.checkpoints = array("Q")   # offset of card k * CHECKPOINT_EVERY
+        self.drawn = OrderedDict()      # i -> card, for the last `size` draws
+        self.reservoir = []
+        self._reader = self._scan(0)
+        self._fill()
+
+    def _scan(self, i):
+        """(i, card) from card `i` on; `i` must be 0 or a checkpoint."""
+        start = self.checkpoints[i // CHECKPOINT_EVERY] if i else 0
+        for offset, _length, card in scan_deck(self.path, start=start):
+            if i % CHECKPOINT_EVERY == 0 and i // CHECKPOINT_EVERY == len(self.checkpoints):
+                self.checkpoints.append(offset)
+            yield i, card
+            i += 1
+        self.count = i
+
+    def _fill(self):
+        for item in self._reader:
+            self.reservoir.append(item)
+            if len(self.reservoir) >= self.size:
+                break
+
+    @property
+    def exhausted(self):
+        return not self.reservoir
+
+    def next_key(self):
+        if not self.reservoir:
+            return None
+        slot = self.rng.randrange(len(self.reservoir))
+        i, card = self.reservoir[slot]
+        refill = next(self._reader, None)
+        if refill is None:
+            self.reservoir[slot] = self.reservoir[-1]
+            self.reservoir.pop()
+        else:
+            self.reservoir[slot] = refill
+        self.drawn[i] = card
+        if len(self.drawn) > self.size:
+            self.drawn.popitem(last=False)
+        return card_key(self.name, i)
+
+    def close(self):
+        self._reader.close()
+        self.reservoir = []
+
+    def card(self, i):
+        card = self.drawn.get(i)
+        if card is None:
+            nearest = min(i // CHECKPOINT_EVERY, len(self.checkpoints) - 1)
+            scan = self._scan(max(0, nearest) * CHECKPOINT_EVERY)
+            try:
+                card = next((card for j, card in scan if j == i), None)
+            except OSError:
+                return None
+            finally:
+                scan.close()
+            if card is None:
+                return None
+        return Card.from_dict(card, self.topic, card_key(self.name, i))
+
+
+class InterleavedStream:
+    """Draws keys across topics with weights and a maximum run length.
+
+    Practice sessions use next_key() and card_for_key(); len() counts
+    every card (streamed decks by estimate until read through).
+    """
+
+    def __init__(self, topics, max_run=MAX_RUN, skip=None):
+        self.topics = list(topics)
+        self.skip = skip
+        self.by_name = {topic.name: topic for topic in self.topics}
+        self.max_run = max_run
+        self.last_topic = None
+        self.run = 0
+        self.last_key = None
+
+    @classmethod
+    def from_manifest(cls, manifest, weights=None, max_run=MAX_RUN, seed=None, skip=None):
+        """One topic per deck. `weights` maps deck names to weights
+        (missing decks weigh their size); `seed` makes the whole session
+        reproducible; keys for which `skip(key)` is true are never drawn.
+
+        .rdeck files in the folder are used too. One converted from a JSON
+        deck replaces it unless the JSON was changed after the conversion.
+        Decks too big for the manifest to index are streamed (ScanTopic),
+        weighed by their estimated card count.
+        """
+        rng = random.Random(seed)
+        weights = weights or {}
+        binary = {}
+        for path in list_binary_decks(manifest.folder):
+            try:
+                deck = BinaryDeck(path)
+            except (OSError, BinaryDeckError):
+                continue
+            json_path = os.path.join(manifest.folder, deck.source)
+            if os.path.exists(json_path) and os.path.getmtime(json_path) > os.path.getmtime(path):
+                deck.close()  # stale conversion
+                continue
+            binary[deck.source] = deck
+        topics = []
+        for name in sorted(set(manifest.names) | set(binary)):
+            if name in binary:
+                if len(binary[name]):
+                    topics.append(BinaryTopic(binary[name], rng.getrandbits(64), weights.get(name)))
+            elif manifest.entries[name].count:
+                topics.append(IndexedTopic(manifest, name, rng.getrandbits(64), weights.get(name)))
+        card_bytes = manifest.bytes_per_card or DEFAULT_CARD_BYTES
+        for name in manifest.large:
+            if name not in binary:
+                estimate = max(1, round(os.path.getsize(os.path.join(manifest.folder, name)) / card_bytes))
+                topics.append(ScanTopic(manifest.folder, name, estimate, rng.getrandbits(64), weights.get(name)))
+        rng.shuffle(topics)  # ties go to a seeded, not alphabetical, deck
+        return cls(topics, max_run, skip)
+
+    def close(self):
+        """Unmap the binary decks; the stream cannot be drawn from afterwards."""
+        for topic in self.topics:
+            topic.close()
+
+    def __len__(self):
+        return sum(topic.count for topic in self.topics)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        key = self.next_key()
+        if key is None:
+            raise StopIteration
+        return self.card_for_key(key)
+
+    def next_key(self):
+        """Advance without decoding; returns the drawn card's key or None at the end."""
+        while True:
+            topic = self._pick()
+            if topic is None:
+                self.last_key = None
+                return None
+            key = topic.next_key()
+            while key is not None and self.skip is not None and self.skip(key):
+                key = topic.next_key()
+            if key is None:
+                continue
+            if topic is self.last_topic:
+                self.run += 1
+            else:
+                self.last_topic, self.run = topic, 1
+            self.last_key = key
+            return key
+
+    def _pick(self):
+        # Smooth weighted round-robin: every active topic earns its weight,
+        # the richest one is drawn and pays back the total.
+        active = [topic for topic in self.topics if not topic.exhausted and topic.weight > 0]
+        if not active:
+            return None
+        total = 0
+        for topic in active:
+            topic.current += topic.weight
+            total += topic.weight
+        candidates = active
+        if self.run >= self.max_run and len(active) > 1:
+            candidates = [topic for topic in active if topic is not self.last_topic]
+        best = max(candidates, key=lambda topic: topic.current)
+        best.current -= total
+        return best
+
+    def card_for_key(self, key):
+        """Card for a scheduler key, or None if its deck is gone or changed."""
+        name, _, i = key.rpartition("#")
+        topic = self.by_name.get(name)
+        if topic is None or not i.isdigit():
+            return None
+        return topic.card(int(i))
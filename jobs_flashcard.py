@@ -0,0 +1,281 @@
+# jobs_flashcard.py
+"""Import/export jobs that run on the global QThreadPool.
+
+Each job opens its own SQLite connection to the card store's file, so the
+UI connection is never shared across threads; WAL mode lets the UI keep
+reading while a job writes. Jobs report back through JobSignals, whose
+queued connections deliver progress to the UI thread.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from deck_formats_flashcard import deck_size, read_deck, write_deck
+from deck_loader_flashcard import DECK_FOLDER
+from dedupe_flashcard import BatchFilter, DuplicateIndex, find_groups, group_preview, merge_groups, restore_removed
+from search_flashcard import ensure_schema, index_decks
+from storage_flashcard import DEFAULT_TOPIC, SQL_INSERT, SQL_PAGE, SQL_COUNT
+
+BATCH_SIZE = 2000            # rows per transaction
+PROGRESS_INTERVAL = 0.05     # seconds between progress signals
+BUSY_TIMEOUT = 30.0          # wait this long if the UI connection holds the write lock
+QUIT_WAIT_MS = 5000          # how long quitting waits for cancelled jobs to stop
+
+
+class JobSignals(QObject):
+    progress = pyqtSignal(int, int)   # done, total (same units as total)
+    finished = pyqtSignal(int)        # cards imported/exported
+    cancelled = pyqtSignal(int)       # cards committed before the cancel
+    failed = pyqtSignal(str)
+
+
+class Job(QRunnable):
+    """Base for cancellable background jobs; subclasses implement work()."""
+
+    def __init__(self, db_path):
+        super().__init__()
+        self.setAutoDelete(False)  # start() keeps the job (and its signals) alive while it runs
+        self.db_path = db_path
+        self.signals = JobSignals()
+        self._cancel = threading.Event()
+        self._last_progress = 0.0
+        self.note = ""  # extra detail for the finished message
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def report(self, done, total, force=False):
+        # Throttled so a fast job cannot flood the UI event queue
+        now = time.monotonic()
+        if force or now - self._last_progress >= PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.signals.progress.emit(done, total)
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def run(self):
+        try:
+            count = self.work()
+        except Exception as e:  # surfaced in the UI rather than lost on a worker thread
+            self.signals.failed.emit(str(e))
+            return
+        if self.cancelled:
+            self.signals.cancelled.emit(count)
+        else:
+            self.signals.finished.emit(count)
+
+    def work(self):
+        raise NotImplementedError
+
+
+class ImportJob(Job):
+    """Stream a deck file into the store, committing every BATCH_SIZE rows.
+
+    Batches already committed stay in the store when the job is cancelled.
+    Near-duplicates of library cards or of earlier rows are skipped unless
+    `skip_duplicates` is False.
+    """
+
+    def __init__(self, db_path, path, topic=DEFAULT_TOPIC, fmt=None, skip_duplicates=True):
+        super().__init__(db_path)
+        self.path = path
+        self.topic = topic
+        self.fmt = fmt
+        self.skip_duplicates = skip_duplicates
+
+    def work(self):
+        total = deck_size(self.path, self.fmt)
+        conn = self.connect()
+        index = DuplicateIndex(conn)
+        dupes = BatchFilter(index)
+        count = 0
+        batch = []
+        try:
+            for position, question, answer in read_deck(self.path, self.fmt):
+                # Per row read, not per batch kept: a file of duplicates keeps reporting
+                if self.cancelled:
+                    break
+                self.report(position, total)
+                sig = None
+                if self.skip_duplicates:
+                    sig = dupes.keep(question, answer)
+                    if sig is None:
+                        continue
+                batch.append(((self.topic, question, answer, time.time()), sig))
+                if len(batch) >= BATCH_SIZE:
+                    count += self.insert_batch(conn, index, batch)
+                    dupes.flush()
+                    batch = []
+            else:
+                if batch:
+                    count += self.insert_batch(conn, index, batch)
+                self.report(total, total, force=True)
+        finally:
+            conn.close()
+        if dupes.skipped:
+            self.note = f", {dupes.skipped} duplicates skipped"
+        return count
+
+    def insert_batch(self, conn, index, rows):
+        with conn:
+            added = [(conn.execute(SQL_INSERT, row).lastrowid, row[1], row[2], sig) for row, sig in rows]
+            index.add_many(added)
+        return len(rows)
+
+
+class ExportJob(Job):
+    """Write one topic of the store to a deck file, paging by id."""
+
+    def __init__(self, db_path, path, topic=DEFAULT_TOPIC, fmt=None):
+        super().__init__(db_path)
+        self.path = path
+        self.topic = topic
+        self.fmt = fmt
+
+    def work(self):
+        conn = self.connect()
+        try:
+            total = conn.execute(SQL_COUNT, (self.topic,)).fetchone()[0]
+            self.done = 0
+            count = write_deck(self.path, self.cards(conn, total), self.fmt)
+        finally:
+            conn.close()
+        if self.cancelled:
+            os.remove(self.path)  # don't leave a truncated deck behind
+            return 0
+        self.report(total, total, force=True)
+        return count
+
+    def cards(self, conn, total):
+        after_id = 0
+        while not self.cancelled:
+            rows = conn.execute(SQL_PAGE, (self.topic, after_id, BATCH_SIZE)).fetchall()
+            if not rows:
+                return
+            for card_id, question, answer in rows:
+                yield question, answer
+            after_id = rows[-1][0]
+            self.done += len(rows)
+            self.report(self.done, total)
+
+
+class DeckIndexJob(Job):
+    """Refresh the deck manifest and bring the search index up to date with it."""
+
+    def __init__(self, db_path, folder=DECK_FOLDER):
+        super().__init__(db_path)
+        self.folder = folder
+
+    def work(self):
+        from deck_manifest_flashcard import DeckManifest  # imports NumPy; keep it off the startup path
+        manifest = DeckManifest(self.folder)
+        manifest.refresh()
+        conn = self.connect()
+        try:
+            ensure_schema(conn)
+            index_decks(conn, manifest, cancelled=lambda: self.cancelled)
+        finally:
+            conn.close()
+        return manifest.total
+
+
+class SignatureJob(Job):
+    """Compute duplicate-detection signatures for cards that lack one."""
+
+    def work(self):
+        conn = self.connect()
+        try:
+            return DuplicateIndex(conn).backfill(cancelled=lambda: self.cancelled)
+        finally:
+            conn.close()
+
+
+class FindDuplicatesJob(Job):
+    """Offline pass over the whole library: group near-duplicates, changing nothing.
+
+    Leaves the groups (card ids, oldest first) in `groups` and their
+    questions in `preview`; returns how many cards a merge would remove.
+    """
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.groups = []
+        self.preview = []
+
+    def work(self):
+        conn = self.connect()
+        try:
+            index = DuplicateIndex(conn)
+            index.backfill(cancelled=lambda: self.cancelled)
+            if self.cancelled:
+                return 0
+            self.groups = find_groups(conn, index.threshold, progress=self.report)
+            self.preview = group_preview(conn, self.groups)
+        finally:
+            conn.close()
+        return sum(len(ids) - 1 for ids in self.groups)
+
+
+class MergeDuplicatesJob(Job):
+    """Keep the oldest card of each confirmed group; the rest go to removed_cards."""
+
+    def __init__(self, db_path, groups):
+        super().__init__(db_path)
+        self.groups = groups
+
+    def work(self):
+        conn = self.connect()
+        try:
+            return merge_groups(conn, self.groups)
+        finally:
+            conn.close()
+
+
+class RestoreDuplicatesJob(Job):
+    """Undo the last merge: removed duplicates go back into the library."""
+
+    def work(self):
+        conn = self.connect()
+        try:
+            DuplicateIndex(conn)  # removed_cards may not exist yet
+            return restore_removed(conn)
+        finally:
+            conn.close()
+
+
+_running = set()  # jobs queued or running; released on the UI thread once they end
+
+
+def start(job, pool=None):
+    """Queue `job` on the global thread pool and return it.
+
+    The job is kept alive until it ends, even if the caller drops it
+    (e.g. a closed window), so its signals outlive the worker thread.
+    """
+    _running.add(job)
+    release = lambda *_: _running.discard(job)
+    for signal in (job.signals.finished, job.signals.cancelled, job.signals.failed):
+        signal.connect(release)
+    (pool or QThreadPool.globalInstance()).start(job)
+    return job
+
+
+def stop_all(timeout_ms=QUIT_WAIT_MS):
+    """Cancel every running job and wait for the pool to drain; True if it did in time.
+
+    Call before the application exits: a job still running on a worker
+    thread while Python shuts down would emit through deleted signals.
+    """
+    for job in list(_running):
+        job.cancel()
+    return QThreadPool.globalInstance().waitForDone(timeout_ms)
@@ -0,0 +1,285 @@
+# journal_flashcard.py
+"""Write-behind journal for card creates.
+
+The UI thread only encodes a record and appends it to an in-memory
+buffer. A background thread writes and fsyncs the buffer once it holds
+FLUSH_BYTES or FLUSH_INTERVAL has passed, which bounds how long a save
+can sit unsaved. The thread also compacts the journal into the card store
+every COMPACT_INTERVAL seconds (or at COMPACT_BYTES). The active segment
+is rotated first, then applied in one transaction, then deleted.
+
+Record layout: <length u32><crc32 u32><payload>. The payload is a JSON list
+[seq, op, ...fields]. Every record has a sequence number, and the store
+keeps the last one it applied, so replaying a segment twice (after a
+crash between commit and delete) is harmless. On open, any leftover
+segments are replayed and a torn or corrupt tail is dropped.
+
+A failed write or compaction (disk full, the store locked past
+BUSY_TIMEOUT) is logged and retried with backoff; nothing is dropped. While
+it keeps failing, `error` holds the last exception and `on_sync` is told,
+so the UI can warn instead of waiting.
+"""
+import json
+import logging
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+
+from dedupe_flashcard import DuplicateIndex
+from storage_flashcard import DB_PATH, DEFAULT_TOPIC, SQL_INSERT
+
+JOURNAL_PATH = "remora.journal"
+FLUSH_BYTES = 16 * 1024
+FLUSH_INTERVAL = 0.1          # seconds a record may wait before fsync
+COMPACT_INTERVAL = 5.0
+COMPACT_BYTES = 1024 * 1024
+BUSY_TIMEOUT = 30.0
+RETRY_MIN = 0.5               # seconds before retrying a failed cycle, doubling...
+RETRY_MAX = 30.0              # ...up to this
+
+log = logging.getLogger(__name__)
+
+CREATE = "C"
+
+_HEADER = struct.Struct("<II")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    last_seq INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO journal_state VALUES (1, 0);
+"""
+
+
+def encode(seq, op, *fields):
+    payload = json.dumps([seq, op, *fields], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(path):
+    """Decoded records of a segment, stopping at the first torn or corrupt one."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    records = []
+    pos = 0
+    while pos + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, pos)
+        payload = data[pos + _HEADER.size:pos + _HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break  # torn write at the tail: everything after it is lost anyway
+        records.append(json.loads(payload))
+        pos += _HEADER.size + length
+    return records
+
+
+def apply_records(conn, records, index=None):
+    """Apply records newer than the store's last_seq in one transaction; returns how many.
+
+    New cards are also added to the duplicate `index` if one is given.
+    """
+    conn.executescript(SCHEMA)
+    last_seq = conn.execute("SELECT last_seq FROM journal_state").fetchone()[0]
+    applied = 0
+    with conn:
+        for seq, op, *fields in records:
+            if seq <= last_seq:
+                continue
+            if op == CREATE:
+                topic, question, answer, created = fields
+                card_id = conn.execute(SQL_INSERT, (topic, question, answer, created)).lastrowid
+                if index is not None:
+                    index.add(card_id, question, answer)
+            last_seq = seq
+            applied += 1
+        conn.execute("UPDATE journal_state SET last_seq = ?", (last_seq,))
+    return applied
+
+
+class Journal:
+    """Append-only write-behind log in front of the card store."""
+
+    def __init__(self, conn, db_path=DB_PATH, path=JOURNAL_PATH):
+        """`conn` is the caller's store connection, used only for start-up
+        replay; the background thread opens its own to `db_path`."""
+        self.path = path
+        self.compacting_path = path + ".compacting"
+        self.db_path = db_path
+
+        self.replay(conn)
+        self.seq = conn.execute("SELECT last_seq FROM journal_state").fetchone()[0]
+
+        self._lock = threading.Lock()            # guards the buffer and seq
+        self._wake = threading.Condition(self._lock)
+        self._buffer = []
+        self._buffered = 0
+        self._pending = {}                       # seq -> (question, answer) of creates not yet in the store
+        self._written = 0                        # bytes in the active segment
+        self._sync_requested = 0                 # request_sync() calls asked for...
+        self._synced = 0                         # ...and completed
+        self._closing = False
+        self.error = None                        # last failure, None while healthy
+        self.on_sync = None                      # called from the journal thread, see _notify
+        self._file = open(self.path, "ab", buffering=0)
+        self._thread = threading.Thread(target=self._run, name="card-journal", daemon=True)
+        self._thread.start()
+
+    # ---------- UI thread ----------
+
+    def create(self, question, answer, topic=DEFAULT_TOPIC):
+        with self._lock:
+            self._append(CREATE, topic, question, answer, time.time())
+            self._pending[self.seq] = (question, answer)
+
+    def create_many(self, pairs, topic=DEFAULT_TOPIC):
+        """Journal many (question, answer) pairs; compaction applies them in one transaction."""
+        now = time.time()
+        with self._lock:
+            for question, answer in pairs:
+                self._append(CREATE, topic, question, answer, now)
+                self._pending[self.seq] = (question, answer)
+            self._wake.notify_all()
+
+    def pending_cards(self):
+        """(question, answer) of created cards the store does not have yet."""
+        with self._lock:
+            return list(self._pending.values())
+
+    def _append(self, op, *fields):
+        # Caller holds the lock
+        self.seq += 1
+        record = encode(self.seq, op, *fields)
+        self._buffer.append(record)
+        self._buffered += len(record)
+        if self._buffered >= FLUSH_BYTES:
+            self._wake.notify_all()
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def request_sync(self):
+        """Ask for an immediate compaction without waiting; on_sync is
+        called once it is done (or has failed)."""
+        with self._lock:
+            self._sync_requested += 1
+            self._wake.notify_all()
+
+    def close(self):
+        with self._lock:
+            self._closing = True
+            self._wake.notify_all()
+        self._thread.join()
+
+    # ---------- background thread ----------
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT)
+        index = DuplicateIndex(conn)
+        last_compact = time.monotonic()
+        retry = 0.0
+        try:
+            while True:
+                with self._lock:
+                    if retry:
+                        self._wake.wait_for(lambda: self._closing, retry)  # back off; syncs wait too
+                    elif not (self._closing or self._sync_requested > self._synced
+                              or self._buffered >= FLUSH_BYTES):
+                        self._wake.wait(FLUSH_INTERVAL)
+                    closing = self._closing
+                    wanted = self._sync_requested  # covers every record appended so far
+                try:
+                    self._flush()
+                    now = time.monotonic()
+                    if closing or retry or wanted > self._synced or self._written >= COMPACT_BYTES or (
+                            self._written and now - last_compact >= COMPACT_INTERVAL):
+                        self._compact(conn, index)
+                        last_compact = now
+                except Exception as exc:
+                    if closing:
+                        log.exception("Card journal: giving up at exit; unwritten cards are lost, "
+                                      "written ones are replayed at the next start")
+                        break
+                    retry = min(RETRY_MAX, retry * 2 or RETRY_MIN)
+                    log.exception("Card journal: write failed, retrying in %.1f s", retry)
+                    with self._lock:
+                        self.error = exc
+                    self._notify(exc)
+                    continue
+                recovered, retry = retry, 0.0
+                with self._lock:
+                    done = wanted > self._synced
+                    self._synced = wanted
+                    self.error = None
+                if done or recovered:
+                    self._notify(None)
+                if closing:
+                    break
+        finally:
+            self._file.close()
+            conn.close()
+
+    def _notify(self, error):
+        if self.on_sync is not None:
+            self.on_sync(error)
+
+    def _flush(self):
+        with self._lock:
+            records, self._buffer, self._buffered = self._buffer, [], 0
+        if not records:
+            return
+        data = memoryview(b"".join(records))
+        size = len(data)
+        try:
+            while data:
+                data = data[self._file.write(data):]
+            os.fsync(self._file.fileno())
+        except BaseException:
+            # Cut off a partial write and put the records back ahead of newer ones
+            try:
+                os.ftruncate(self._file.fileno(), self._written)
+            except OSError:
+                pass
+            with self._lock:
+                self._buffer[:0] = records
+                self._buffered += sum(map(len, records))
+            raise
+        self._written += size
+
+    def _compact(self, conn, index):
+        if os.path.exists(self.compacting_path):
+            self._apply(conn, index)  # left by a failed attempt; replays are harmless
+        if self._written:
+            # Rotate, so new records keep going to a fresh segment while this one is applied
+            self._file.close()
+            os.replace(self.path, self.compacting_path)
+            self._file = open(self.path, "ab", buffering=0)
+            self._written = 0
+            self._apply(conn, index)
+
+    def _apply(self, conn, index):
+        apply_records(conn, read_records(self.compacting_path), index)
+        os.remove(self.compacting_path)
+        last_seq = conn.execute("SELECT last_seq FROM journal_state").fetchone()[0]
+        with self._lock:
+            for seq in [seq for seq in self._pending if seq <= last_seq]:
+                del self._pending[seq]
+
+    # ---------- start-up ----------
+
+    def replay(self, conn):
+        """Apply segments left by a crash or power cut, oldest first."""
+        conn.executescript(SCHEMA)
+        index = DuplicateIndex(conn)
+        applied = 0
+        for segment in (self.compacting_path, self.path):
+            if os.path.exists(segment):
+                applied += apply_records(conn, read_records(segment), index)
+                os.remove(segment)
+        return applied
@@ -1,62 +1,98 @@
 # main_app_flashcard.py
 from PyQt6.QtWidgets import (
-    QWidget, QPushButton, QLabel, QVBoxLayout, QStackedWidget,QStackedLayout,
-    QLineEdit, QHBoxLayout, QFrame, QGraphicsOpacityEffect, QMessageBox
+    QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QStackedWidget,
+    QLineEdit, QHBoxLayout, QFrame, QMessageBox, QFileDialog, QProgressBar, QListWidget,
+    QPlainTextEdit, QTableWidget, QTableWidgetItem, QHeaderView
 )
-from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QFont, QIcon, QPixmap
+from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QEvent, pyqtSignal
+from PyQt6.QtGui import QFont, QPainter
 from PyQt6.QtGui import QKeySequence, QShortcut #axl
-from data_model_flashcard import AppData
-from ui_styles_flashcard import (
-    APP_STYLE, SIDEBAR_BUTTON_STYLE, HAMBURGER_STYLE,
-    FONT_LARGE_BOLD, FONT_MEDIUM, FONT_BUTTON, FONT_LABEL,
-    FONT_SUBTITLE, APP_STYLE_DARK, APP_STYLE_LIGHT, CREATE_FLASH, 
-    MESSAGE_WARNING
+from data_model_flashcard import AppData, topic_deck
+from card_view_flashcard import CardListModel, CardGridView
+from page_registry_flashcard import PageRegistry, DEFAULT_BUDGET
+from transitions_flashcard import TransitionEngine, FADE, INSTANT
+from image_cache_flashcard import images
+from card_faces_flashcard import faces, FACE_SIZE
+from scheduler_flashcard import GOOD
+from timing_flashcard import session_clock
+from theme_flashcard import ThemeEngine
+from jobs_flashcard import (
+    ImportJob, ExportJob, DeckIndexJob, SignatureJob, FindDuplicatesJob, MergeDuplicatesJob,
+    RestoreDuplicatesJob, start as start_job, stop_all as stop_jobs
 )
+from deck_formats_flashcard import FILE_FILTER
+from bulk_flashcard import parse_bulk
+from toast_flashcard import Toast, INFO, WARNING
+import ui_styles_flashcard as styles
+from ui_styles_flashcard import MESSAGE_WARNING, TOPIC_PAGE_COLORS
+
+SEARCH_DEBOUNCE_MS = 150
+BULK_PREVIEW_MS = 200      # re-parse the paste once typing pauses
+BULK_PREVIEW_ROWS = 200    # rows shown in the preview table
+BULK_ERRORS_SHOWN = 5
+
 #-------BAGONG LAGAY TO------
 class FlipCard(QWidget):
-    """Simple, fully working flip card — front/back toggle with fade."""
-    def __init__(self, question, answer, bg_color="#FFFFFF", text_color="#333"):
+    """Flip card painted from two cached face pixmaps; a flip is one blit."""
+    revealed = pyqtSignal(str, float)  # `key` and seconds taken, when the answer is shown
+    flipped = pyqtSignal(str, float)   # `key` and seconds the face was up, on every flip
+
+    def __init__(self, question, answer, bg_color="#FFFFFF", text_color="#333", key=None):
         super().__init__()
         self.is_front = True
+        self.key = key
+        self.shown_at = session_clock()
+        self.texts = (question, answer)
+        self.colors = (bg_color, text_color)
+        self._faces = None  # (front, back) pixmaps for the current theme and scale
+        self._dpr = None
+        self.setFixedSize(FACE_SIZE)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+    def faces(self):
+        dpr = self.devicePixelRatioF()
+        if self._faces is None or self._dpr != dpr:  # moved to a screen with another scale
+            theme = self.window().property("theme") or ""
+            self._dpr = dpr
+            self._faces = tuple(
+                faces.face(text, FACE_SIZE, *self.colors, theme=theme, dpr=dpr) for text in self.texts
+            )
+        return self._faces
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.faces()[0 if self.is_front else 1])
+        painter.end()
+
+    def changeEvent(self, event):
+        # A theme switch repolishes every widget
+        if event.type() in (QEvent.Type.StyleChange, QEvent.Type.PaletteChange):
+            self._faces = None
+            self.update()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.shown_at = session_clock()
 
-        # Create the front and back labels
-        self.front = QLabel(question)
-        self.back = QLabel(answer)
-
-        for lbl in (self.front, self.back):
-            lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            lbl.setWordWrap(True)
-            lbl.setFont(QFont("Arial Rounded MT Bold", 14))
-            lbl.setFixedSize(300, 180)
-            lbl.setStyleSheet(f"""
-                background-color: {bg_color};
-                color: {text_color};
-                border-radius: 20px;
-                padding: 20px;
-                border: 3px solid #aaa;
-            """)
-
-        # Stack both sides
-        self.stack = QStackedLayout(self)
-        self.stack.addWidget(self.front)
-        self.stack.addWidget(self.back)
-        self.stack.setCurrentWidget(self.front)
-
-        # Connect click events
-        self.front.mousePressEvent = self.flip
-        self.back.mousePressEvent = self.flip
-
-    def flip(self, event):
+    def mousePressEvent(self, event):
+        self.flip(event)
+
+    def flip(self, event=None):
         """Instant flip (no fade) — guaranteed to show other side."""
-        if self.is_front:
-            self.stack.setCurrentWidget(self.back)
-        else:
-            self.stack.setCurrentWidget(self.front)
+        now = session_clock()
+        elapsed, self.shown_at = now - self.shown_at, now
+        if self.key is not None:
+            self.flipped.emit(self.key, elapsed)
         self.is_front = not self.is_front
+        self.update()
+        if not self.is_front and self.key is not None:
+            self.revealed.emit(self.key, elapsed)
 
               
 class FadeWidget(QWidget):
+    """Page container; transitions are run by the window's TransitionEngine."""
     def __init__(self, widget, parent_window):
         super().__init__()
         self.widget = widget
@@ -65,39 +101,24 @@ class FadeWidget(QWidget):
         layout.addWidget(widget)
         layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
-        self.effect = QGraphicsOpacityEffect()
-        self.widget.setGraphicsEffect(self.effect)
-        self.anim = None
-
-    def fade_in(self):
-        self.anim = QPropertyAnimation(self.effect, b"opacity")
-        self.anim.setDuration(500)
-        self.anim.setStartValue(0)
-        self.anim.setEndValue(1)
-        self.anim.start()
 
     def fade_out(self, next_widget):
-        self.anim = QPropertyAnimation(self.effect, b"opacity")
-        self.anim.setDuration(500)
-        self.anim.setStartValue(1)
-        self.anim.setEndValue(0)
-        self.anim.finished.connect(lambda: self.switch_page(next_widget))
-        self.anim.start()
+        self.parent_window.transitions.go(next_widget)
 
     def switch_page(self, next_widget):
-        next_widget.fade_in()
-        self.parent_window.stacked.setCurrentWidget(next_widget)
+        self.parent_window.transitions.jump(next_widget)
 
 class MainWindow(QWidget):
-    def __init__(self, app):
+    startup_finished = pyqtSignal()  # deferred startup work is done
+    journal_synced = pyqtSignal(object)  # None once the journal compacted, or its write error
+
+    def __init__(self, app, page_budget=DEFAULT_BUDGET):
         super().__init__()
         self.data = AppData()
         self.app = app
-        self.apply_theme()
         
         self.setWindowTitle("Remora App Flow")
-        self.setStyleSheet(APP_STYLE)
-        self.setWindowIcon(QIcon("Icon.png"))
+        self.theme_engine = ThemeEngine(QApplication.instance())
         
         self.theme_btn = QPushButton("🌙")
         self.theme_btn.clicked.connect(self.toggle_btn)
@@ -107,46 +128,53 @@ class MainWindow(QWidget):
         top_layout.addWidget(self.theme_btn)
         
         self.stacked = QStackedWidget()
+
+        self.practice = None  # InterleavedPractice window, made on first use
+
+        # Import/export status strip, shown while a background job runs
+        self.job = None
+        self.job_label = QLabel()
+        self.job_label.setProperty("role", "muted")
+        self.job_progress = QProgressBar()
+        self.job_progress.setTextVisible(False)
+        self.cancel_job_btn = QPushButton("Cancel")
+        self.cancel_job_btn.setProperty("role", "secondary")
+        self.cancel_job_btn.clicked.connect(self.cancel_job)
+        self.job_bar = QWidget()
+        job_layout = QHBoxLayout(self.job_bar)
+        job_layout.setContentsMargins(0, 0, 0, 0)
+        job_layout.addWidget(self.job_label)
+        job_layout.addWidget(self.job_progress, 1)
+        job_layout.addWidget(self.cancel_job_btn)
+        self.job_bar.hide()
         
         layout = QVBoxLayout()
         layout.addLayout(top_layout)
         layout.addWidget(self.stacked)
+        layout.addWidget(self.job_bar)
         self.setLayout(layout)
-        
-        # Pages
-        self.start_page = FadeWidget(self.create_start_page(), self)
-        self.name_page = FadeWidget(self.create_name_page(), self)
-        self.greet_page = FadeWidget(QLabel(alignment=Qt.AlignmentFlag.AlignCenter), self)
-        self.greet_page.widget.setFont(FONT_MEDIUM)
-        self.welcome_page = FadeWidget(self.create_welcome_page(), self)
-        self.ask_page = FadeWidget(self.create_ask_page(), self)
-        self.main_page = FadeWidget(self.create_main_page(), self)
-        
-        self.tutorial_page = FadeWidget(self.create_tutorial_page(), self)
-        self.current_tutorial_step = 0  # track which tutorial slide we're on
 
-        self.welcome_back_page = FadeWidget(QLabel(alignment=Qt.AlignmentFlag.AlignCenter), self)
-        self.welcome_back_page.widget.setFont(FONT_MEDIUM)
-
-        for page in [self.start_page, self.name_page, self.greet_page, self.welcome_page, self.ask_page, self.main_page]:
-            self.stacked.addWidget(page)
-            
-        self.stacked.addWidget(self.tutorial_page)
-        self.stacked.addWidget(self.welcome_back_page)
-
-        # Connections
-        self.start_btn.clicked.connect(lambda: self.start_page.fade_out(self.name_page))
-        self.submit_name_btn.clicked.connect(self.show_greet)
+        # Non-modal notices (saves, warnings) float over the bottom of the window
+        self.toast = Toast(self)
         
-        self.yes_btn.clicked.connect(self.show_tutorial)
-        self.no_btn.clicked.connect(self.show_welcome_back)
+        self.transitions = TransitionEngine(
+            self.stacked, mode=INSTANT if self.data.instant_transitions else FADE
+        )
+
+        # Pages are built on first navigation (see register_pages)
+        self.pages = PageRegistry(self.stacked, budget=page_budget)
+        self.register_pages()
+        self.current_tutorial_step = 0  # track which tutorial slide we're on
+        self.help_return = "main"  # page the help page goes back to
 
         # Start page
-        self.stacked.setCurrentWidget(self.start_page)
-        self.start_page.fade_in()
+        self.stacked.setCurrentWidget(self.page("start"))
 
-        # Apply default theme
-        self.apply_theme()
+        # Apply default theme (the only time the stylesheet is parsed)
+        self.theme_engine.install(self, self.data.theme)
+
+        # Everything the start page doesn't need waits for the first paint
+        QTimer.singleShot(0, self.finish_startup)
         
         # Topic pages
         
@@ -174,9 +202,61 @@ class MainWindow(QWidget):
         shortcut_help.setContext(Qt.ShortcutContext.ApplicationShortcut)
         shortcut_help.activated.connect(self.show_help_page)
        
-        shortcut_ctrl_tab = QShortcut(QKeySequence("Ctrl+Tab"), self)
-        shortcut_ctrl_tab.activated.connect(self.switch_tab)
+        # Power users: skip page animations
+        shortcut_instant = QShortcut(QKeySequence("Ctrl+I"), self)
+        shortcut_instant.setContext(Qt.ShortcutContext.ApplicationShortcut)
+        shortcut_instant.activated.connect(self.toggle_instant_transitions)
     
+    def finish_startup(self):
+        """Deferred startup work, run once the event loop is up."""
+        self.setWindowIcon(images.icon("Icon.png"))
+        self.data.scheduler  # opens the card store and loads review state
+        self.data.journal  # replays card saves a crash left in the journal
+        self.journal_warned = False
+        self.journal_synced.connect(self.on_journal_synced)
+        self.data.journal.on_sync = self.journal_synced.emit  # queued from the journal thread
+        self.app.aboutToQuit.connect(stop_jobs)  # before the store they write to closes
+        self.app.aboutToQuit.connect(self.data.close)
+        # flashcards_data decks are (re)indexed for search off the UI thread
+        self.deck_index_job = start_job(DeckIndexJob(self.data.store.path))
+        # ...and cards saved before duplicate detection existed get signatures
+        self.signature_job = start_job(SignatureJob(self.data.store.path))
+        self.startup_finished.emit()
+
+    def register_pages(self):
+        """Declare every page; each one is built the first time it is shown."""
+        register = self.pages.register
+        register("start", lambda: FadeWidget(self.create_start_page(), self), next_pages=("name",))
+        register("name", lambda: FadeWidget(self.create_name_page(), self), next_pages=("greet", "welcome"))
+        register("greet", self.create_message_page, next_pages=("ask",))
+        register("welcome", lambda: FadeWidget(self.create_welcome_page(), self), next_pages=("ask",))
+        register("ask", lambda: FadeWidget(self.create_ask_page(), self),
+                 next_pages=("main", "tutorial", "welcome_back"))
+        register("tutorial", lambda: FadeWidget(self.create_tutorial_page(), self), next_pages=("main",))
+        register("welcome_back", self.create_message_page, next_pages=("main",))
+        register("main", lambda: FadeWidget(self.create_main_page(), self), next_pages=("topics",))
+        register("topics", self.setup_topics_page)
+        register("create_flashcard", self.setup_create_flashcard_page, next_pages=("bulk_create",))
+        register("bulk_create", lambda: FadeWidget(self.create_bulk_page(), self))
+        register("saved_flashcards", self.setup_saved_flashcards_page, heavy=True)
+        register("existing_flashcard", self.setup_existing_flashcard_page)
+        register("statistics", lambda: FadeWidget(self.create_statistics_page(), self))
+        register("help", lambda: FadeWidget(self.create_help_page(), self))
+
+    def page(self, name):
+        """Return a page by name, building it if needed."""
+        return self.pages.get(name)
+
+    def create_message_page(self):
+        """Single-label page used for the greeting and welcome-back messages."""
+        page = FadeWidget(QLabel(alignment=Qt.AlignmentFlag.AlignCenter), self)
+        page.widget.setFont(styles.FONT_MEDIUM)
+        return page
+
+    def toggle_instant_transitions(self):
+        self.data.instant_transitions = not self.data.instant_transitions
+        self.transitions.mode = INSTANT if self.data.instant_transitions else FADE
+
     def quit_app(self):
         QApplication.quit()
 
@@ -197,19 +277,8 @@ class MainWindow(QWidget):
         self.theme_btn.setText("☀️" if self.data.theme == "dark" else "🌙")
 
     def apply_theme(self):
-        if self.data.theme == "dark":
-            self.setStyleSheet(APP_STYLE_DARK)
-        else:
-            self.setStyleSheet(APP_STYLE_LIGHT)
-            
-        for page_name in [
-            "main_page", "topics_page", "create_flashcard_page",
-            "saved_flashcards_page", "existing_flashcard_page"
-        ]:
-            if hasattr(self, page_name):
-                getattr(self, page_name).setStyleSheet(
-                    APP_STYLE_DARK if self.data.theme == "dark" else APP_STYLE_LIGHT
-                )
+        """Switch to self.data.theme; pages built later pick it up automatically."""
+        self.theme_engine.apply(self, self.data.theme)
             
     def toggle_theme(self):
         if self.data.theme == "light":
@@ -224,20 +293,20 @@ class MainWindow(QWidget):
         layout = QVBoxLayout(widget)
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        pixmap = QPixmap("Icon.png")
-        pixmap = pixmap.scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pixmap = images.pixmap("Icon.png", 400, 400)
         
         logo = QLabel()
         logo.setPixmap(pixmap)
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         subtitle = QLabel("READY WHEN YOU ARE!")
-        subtitle.setFont(FONT_SUBTITLE)
-        subtitle.setStyleSheet("color: #FC483D; letter-spacing: 2px; font-weight: 900;")
+        subtitle.setFont(styles.FONT_SUBTITLE)
+        subtitle.setProperty("role", "brand")
         subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         self.start_btn = QPushButton("BEGIN")
-        self.start_btn.setFont(FONT_LARGE_BOLD)
+        self.start_btn.setFont(styles.FONT_LARGE_BOLD)
+        self.start_btn.clicked.connect(lambda: self.page("start").fade_out(self.page("name")))
         
         layout.addStretch()
         layout.addWidget(logo, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -254,18 +323,19 @@ class MainWindow(QWidget):
         layout = QVBoxLayout(widget)
         
         self.name_label = QLabel("ENTER YOUR NAME")
-        self.name_label.setFont(FONT_SUBTITLE)
-        self.name_label.setStyleSheet("color: #434190")
+        self.name_label.setFont(styles.FONT_SUBTITLE)
+        self.name_label.setProperty("role", "title")
         self.name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         self.name_input = QLineEdit()
         self.name_input.setPlaceholderText("Type it here...")
         
         self.name_input.repaint()
-        self.name_input.setFont(FONT_SUBTITLE)
+        self.name_input.setFont(styles.FONT_SUBTITLE)
         
         self.submit_name_btn = QPushButton("Next")
-        self.submit_name_btn.setFont(FONT_BUTTON)
+        self.submit_name_btn.setFont(styles.FONT_BUTTON)
+        self.submit_name_btn.clicked.connect(self.show_greet)
         self.name_input.returnPressed.connect(self.show_greet)
         
         layout.addStretch()
@@ -281,13 +351,15 @@ class MainWindow(QWidget):
         widget = QWidget()
         layout = QVBoxLayout(widget)
         self.ask_label = QLabel("New here?")
-        self.ask_label.setFont(FONT_LABEL)
-        self.ask_label.setStyleSheet("color: #434190")
+        self.ask_label.setFont(styles.FONT_LABEL)
+        self.ask_label.setProperty("role", "title")
         self.ask_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.yes_btn = QPushButton("Yes")
         self.no_btn = QPushButton("No")
-        self.yes_btn.setFont(FONT_BUTTON)
-        self.no_btn.setFont(FONT_BUTTON)
+        self.yes_btn.setFont(styles.FONT_BUTTON)
+        self.no_btn.setFont(styles.FONT_BUTTON)
+        self.yes_btn.clicked.connect(self.show_tutorial)
+        self.no_btn.clicked.connect(self.show_welcome_back)
         layout.addStretch()
         layout.addWidget(self.ask_label)
         layout.addWidget(self.yes_btn, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -302,25 +374,23 @@ class MainWindow(QWidget):
         layout.setSpacing(20)
     
         self.tutorial_title = QLabel()
-        self.tutorial_title.setFont(FONT_LARGE_BOLD)
-        self.tutorial_title.setStyleSheet("color: #434190; font-weight: bold;")
+        self.tutorial_title.setFont(styles.FONT_LARGE_BOLD)
+        self.tutorial_title.setProperty("role", "title-bold")
         self.tutorial_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
     
         self.tutorial_desc = QLabel()
-        self.tutorial_desc.setFont(FONT_LABEL)
+        self.tutorial_desc.setFont(styles.FONT_LABEL)
         self.tutorial_desc.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.tutorial_desc.setWordWrap(True)
-        self.tutorial_desc.setStyleSheet("color: #555;")
+        self.tutorial_desc.setProperty("role", "tutorial-desc")
     
         self.next_btn = QPushButton("Next ➜")
-        self.next_btn.setFont(FONT_BUTTON)
+        self.next_btn.setFont(styles.FONT_BUTTON)
         self.next_btn.clicked.connect(self.next_tutorial_step)
         
         self.skip_btn = QPushButton("Skip Tutorial ⏭️")
-        self.skip_btn.setFont(FONT_BUTTON)
-        self.skip_btn.clicked.connect(lambda: self.tutorial_page.fade_out(self.main_page))
-        
-        self.tutorial_desc.setStyleSheet("color: #555; padding: 0 40px;")
+        self.skip_btn.setFont(styles.FONT_BUTTON)
+        self.skip_btn.clicked.connect(lambda: self.page("tutorial").fade_out(self.page("main")))
         
         layout.addStretch()
         layout.addWidget(self.tutorial_title)
@@ -334,7 +404,7 @@ class MainWindow(QWidget):
 
     def show_tutorial(self):
         self.current_tutorial_step = 0
-        self.ask_page.fade_out(self.tutorial_page)
+        self.page("ask").fade_out(self.page("tutorial"))
         self.update_tutorial_step()
         
     def update_tutorial_step(self):
@@ -372,15 +442,16 @@ class MainWindow(QWidget):
             self.update_tutorial_step()
         else:
             # End tutorial and go to main page
-            self.tutorial_page.fade_out(self.main_page)
+            self.page("tutorial").fade_out(self.page("main"))
 
     def show_welcome_back(self):
         """Show personalized welcome back message before main content"""
         name = self.data.username or "User"
-        self.welcome_back_page.widget.setText(f"Welcome back, {name}!")
-        self.welcome_back_page.widget.setStyleSheet("color: #434190; font-weight: bold;")
-        self.ask_page.fade_out(self.welcome_back_page)
-        QTimer.singleShot(1500, lambda: self.welcome_back_page.fade_out(self.main_page))
+        welcome_back = self.page("welcome_back")
+        welcome_back.widget.setText(f"Welcome back, {name}!")
+        welcome_back.widget.setProperty("role", "title-bold")
+        self.page("ask").fade_out(welcome_back)
+        QTimer.singleShot(1500, lambda: welcome_back.fade_out(self.page("main")))
 
     def create_main_page(self):
         page = QWidget()
@@ -389,16 +460,18 @@ class MainWindow(QWidget):
     
         self.sidebar = QFrame()
         self.sidebar.setMaximumWidth(0)
-        self.sidebar.setStyleSheet("background-color: #2d3436; color: white;")
+        self.sidebar.setProperty("role", "sidebar")
         side_layout = QVBoxLayout(self.sidebar)
         side_layout.setContentsMargins(10, 20, 10, 10)
     
-        for text in ["Home", "Profile", "Settings", "Statistics", "Saved Flashcards"]:
+        for text in ["Home", "Profile", "Settings", "Practice", "Statistics", "Saved Flashcards"]:
             btn = QPushButton(text)
-            btn.setStyleSheet(SIDEBAR_BUTTON_STYLE)
+            btn.setProperty("role", "sidebar")
     
             if text == "Saved Flashcards":
                 btn.clicked.connect(self.show_saved_flashcards)
+            elif text == "Practice":
+                btn.clicked.connect(self.show_practice)
             else:
                 btn.clicked.connect(lambda _, t=text: self.show_page(t))
                 
@@ -406,30 +479,29 @@ class MainWindow(QWidget):
     
         side_layout.addStretch()
     
-        pixmap = QPixmap("Remora-Main.png")
-        pixmap = pixmap.scaled(600, 600, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pixmap = images.pixmap("Remora-Main.png", 600, 600)
     
         logo = QLabel()
         logo.setPixmap(pixmap)
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
     
         self.existing_flashcard = QPushButton("Existing Flashcards")
-        self.existing_flashcard.setFont(FONT_LARGE_BOLD)
-        self.existing_flashcard.setStyleSheet(CREATE_FLASH)
+        self.existing_flashcard.setFont(styles.FONT_LARGE_BOLD)
+        self.existing_flashcard.setProperty("role", "hero")
         self.existing_flashcard.clicked.connect(self.toggle_existing_flashcard)
     
         self.create_flashcard = QPushButton("Create Flashcard")
-        self.create_flashcard.setFont(FONT_LARGE_BOLD)
-        self.create_flashcard.setStyleSheet(CREATE_FLASH)
+        self.create_flashcard.setFont(styles.FONT_LARGE_BOLD)
+        self.create_flashcard.setProperty("role", "hero")
         self.create_flashcard.clicked.connect(self.toggle_create_flashcard)
     
         self.saved_flashcard_btn = QPushButton("Saved Flashcards")
-        self.saved_flashcard_btn.setFont(FONT_LARGE_BOLD)
-        self.saved_flashcard_btn.setStyleSheet(CREATE_FLASH)
+        self.saved_flashcard_btn.setFont(styles.FONT_LARGE_BOLD)
+        self.saved_flashcard_btn.setProperty("role", "hero")
         self.saved_flashcard_btn.clicked.connect(self.show_saved_flashcards)
     
         self.hamburger = QPushButton("☰")
-        self.hamburger.setStyleSheet(HAMBURGER_STYLE)
+        self.hamburger.setProperty("role", "hamburger")
         self.hamburger.clicked.connect(self.toggle_sidebar)
     
         top = QHBoxLayout()
@@ -443,12 +515,30 @@ class MainWindow(QWidget):
     
         '''
         self.main_content = QLabel("Welcome to Remora")
-        self.main_content.setFont(FONT_LABEL)
+        self.main_content.setFont(styles.FONT_LABEL)
         self.main_content.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(self.main_content, alignment=Qt.AlignmentFlag.AlignCenter)
         content_layout.addSpacing(8)
         '''
     
+        # Search as you type; queries run once typing pauses
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Search all flashcards…")
+        self.search_input.setFont(QFont("Arial", 14))
+        self.search_input.setProperty("role", "card-input")
+        self.search_input.setMaximumWidth(600)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_results = QListWidget()
+        self.search_results.setMaximumWidth(600)
+        self.search_results.setWordWrap(True)
+        self.search_results.hide()
+        content_layout.addWidget(self.search_input, alignment=Qt.AlignmentFlag.AlignCenter)
+        content_layout.addWidget(self.search_results, alignment=Qt.AlignmentFlag.AlignCenter)
+
         # Buttons area
         btns_row = QVBoxLayout()
         btns_row.setSpacing(30)
@@ -466,6 +556,15 @@ class MainWindow(QWidget):
     
         return page
     
+    def run_search(self):
+        text = self.search_input.text().strip()
+        hits = self.data.search.search(text) if text else []
+        self.search_results.clear()
+        self.search_results.addItems(f"{question}\n→ {answer}" for _key, question, answer in hits)
+        if len(text) > 1 and not hits:
+            self.search_results.addItem("No matching flashcards")
+        self.search_results.setVisible(self.search_results.count() > 0)
+
     def toggle_create_flashcard(self):
         print(" ")
         
@@ -477,8 +576,8 @@ class MainWindow(QWidget):
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Icon.Warning)
             msg.setWindowTitle("Missing Name")
-            msg.setFont(FONT_SUBTITLE)
-            msg.setWindowIcon(QIcon("Icon.png"))
+            msg.setFont(styles.FONT_SUBTITLE)
+            msg.setWindowIcon(images.icon("Icon.png"))
             msg.setText("Enter your name before continuing.")
             msg.setStandardButtons(QMessageBox.StandardButton.Ok)
             msg.setStyleSheet(MESSAGE_WARNING)
@@ -486,9 +585,10 @@ class MainWindow(QWidget):
             return
     
         self.data.username = name
-        self.greet_page.widget.setText(f"Hi, {name}!")
-        self.greet_page.widget.setStyleSheet("color: #434190")
-        self.name_page.fade_out(self.greet_page)
+        greet = self.page("greet")
+        greet.widget.setText(f"Hi, {name}!")
+        greet.widget.setProperty("role", "title")
+        self.page("name").fade_out(greet)
         QTimer.singleShot(1000, lambda: self.show_welcome())
 
     def create_welcome_page(self):
@@ -496,20 +596,19 @@ class MainWindow(QWidget):
         layout = QVBoxLayout(widget)
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        pixmap = QPixmap("Icon.png")
-        pixmap = pixmap.scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pixmap = images.pixmap("Icon.png", 400, 400)
         
         logo = QLabel()
         logo.setPixmap(pixmap)
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         title = QLabel("WELCOME!")
-        title.setFont(FONT_LARGE_BOLD)
-        title.setStyleSheet("color: #FC483D; font-weight: 900; letter-spacing: 2px;")
+        title.setFont(styles.FONT_LARGE_BOLD)
+        title.setProperty("role", "brand")
         
         subtitle = QLabel("Remora is a flashcard for students")
-        subtitle.setFont(FONT_LABEL)
-        subtitle.setStyleSheet("color: #A0522D; font-weight: bold;")
+        subtitle.setFont(styles.FONT_LABEL)
+        subtitle.setProperty("role", "tagline")
         subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         layout.addStretch()
@@ -523,8 +622,8 @@ class MainWindow(QWidget):
         return widget
     
     def show_welcome(self):
-        self.greet_page.fade_out(self.welcome_page)
-        QTimer.singleShot(1500, lambda: self.welcome_page.fade_out(self.ask_page))
+        self.page("greet").fade_out(self.page("welcome"))
+        QTimer.singleShot(1500, lambda: self.page("welcome").fade_out(self.page("ask")))
 
     def toggle_sidebar(self):
         current_width = self.sidebar.maximumWidth()
@@ -537,8 +636,24 @@ class MainWindow(QWidget):
         anim.start()
         self.sidebar.anim = anim
 
+    def record_review(self, key, latency=0.0):
+        """Revealing an answer in a card grid counts as a 'Good' review."""
+        from telemetry_flashcard import GRADE  # loaded with data.telemetry, not at startup
+        since = self.data.scheduler.since_review(key)
+        self.data.scheduler.grade(key, GOOD)
+        self.data.telemetry.log(GRADE, key, latency, GOOD, since)
+
+    def record_flip(self, key, latency):
+        from telemetry_flashcard import FLIP
+        self.data.telemetry.log(FLIP, key, latency)
+
     def show_page(self, text):
-        self.main_content.setText(f"You selected: {text}")
+        if text == "Statistics":
+            self.show_statistics()
+        elif text == "Home":
+            self.toggle_sidebar()
+        else:
+            self.toast.show_message(f"{text} is not available yet.")
         
         
         #-------BAGONG LAGAY TO------
@@ -549,15 +664,15 @@ class MainWindow(QWidget):
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         title = QLabel("Choose Topics")
-        title.setFont(FONT_LARGE_BOLD)
-        title.setStyleSheet("color: #434190; font-weight: bold;")
+        title.setFont(styles.FONT_LARGE_BOLD)
+        title.setProperty("role", "title-bold")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
      
     
 
         back_btn = QPushButton("⬅ Back to Main")
-        back_btn.setFont(FONT_BUTTON)
-        back_btn.clicked.connect(lambda: self.existing_flashcard_page.fade_out(self.main_page))
+        back_btn.setFont(styles.FONT_BUTTON)
+        back_btn.clicked.connect(lambda: self.page("existing_flashcard").fade_out(self.page("main")))
      
         layout.addStretch()
         layout.addWidget(title)
@@ -568,21 +683,18 @@ class MainWindow(QWidget):
         return widget
 
     def setup_existing_flashcard_page(self):
-         """Setup and add the existing flashcard page to stacked widget."""
-         self.existing_flashcard_page = FadeWidget(self.create_existing_flashcard(), self)
-         self.stacked.addWidget(self.existing_flashcard_page)
-         self.apply_theme()
+        """Build the existing flashcard page (added to the stack by the page registry)."""
+        return FadeWidget(self.create_existing_flashcard(), self)
      
     def toggle_existing_flashcard(self):
         """Show the topics page when 'Existing Flashcards' is clicked."""
-        if not hasattr(self, "topics_page"):
-            self.setup_topics_page()
-        self.main_page.fade_out(self.topics_page)
+        self.page("main").fade_out(self.page("topics"))
 
                 
         # ========== INDIVIDUAL TOPIC PAGES ==========
-    def create_topic_page(self, topic_name, bg_color, text_color):
+    def create_topic_page(self, topic_name):
         """Create a topic page with flipping flashcards."""
+        text_color = TOPIC_PAGE_COLORS[topic_name][1]
         widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -590,46 +702,31 @@ class MainWindow(QWidget):
 
         title = QLabel(f"{topic_name} Flashcards")
         title.setFont(QFont("Arial Rounded MT Bold", 26))
-        title.setStyleSheet(f"color: {text_color};")
+        title.setProperty("role", "topic-title")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        # QUESTIONS EXISTING
-        qa_sets = {
-            "English": [
-                ("What is haha?", "haha is a tawa"),
-                ("what is huhu?", "huhu is a iyak")
-            ],
-            "Math": [
-                ("1+1", "2"),
-                ("2+2", "4")
-            ],
-            "Science": [
-                ("Who discovered gravity?", "Isaac Newton"),
-            ],
-            "History": [
-                ("Who killed Magellan?", "Lapu-Lapu"),
-                ("Where is Rizal’s head?", "On the one-peso coin")
-            ],
-        }
-
         flashcards_layout = QHBoxLayout()
         flashcards_layout.setSpacing(30)
 
-        for q, a in qa_sets.get(topic_name, []):
-            card = FlipCard(q, a, bg_color="#FFFFFF", text_color=text_color)
+        for card_data in topic_deck().view().topic(topic_name):
+            card = FlipCard(card_data.question, card_data.answer, bg_color="#FFFFFF",
+                            text_color=text_color, key=card_data.key)
+            card.revealed.connect(self.record_review)
+            card.flipped.connect(self.record_flip)
             flashcards_layout.addWidget(card, alignment=Qt.AlignmentFlag.AlignCenter)
 
         back_btn = QPushButton("⬅ Back to Topics")
         back_btn.setFont(QFont("Arial", 14))
         back_btn.setFixedWidth(200)
-        back_btn.clicked.connect(lambda: self.topic_pages[topic_name].fade_out(self.topics_page))
+        back_btn.clicked.connect(lambda: self.page(f"topic:{topic_name}").fade_out(self.page("topics")))
 
         layout.addWidget(title)
         layout.addLayout(flashcards_layout)
         layout.addSpacing(40)
         layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignCenter)
 
-        widget.setStyleSheet(f"background-color: {bg_color};")
+        widget.setProperty("role", "topic-page")
+        widget.setProperty("topic", topic_name)
         return widget
 
     #-------BAGONG LAGAY TO------
@@ -645,36 +742,27 @@ class MainWindow(QWidget):
         title = QLabel("TOPICS")
         title.setFont(QFont("Arial Rounded MT Bold", 36, QFont.Weight.Bold))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("""
-            background-color: #F08080;
-            color: white;
-            padding: 20px;
-            border-radius: 15px;
-            letter-spacing: 2px;
-        """)
+        title.setProperty("role", "topics-header")
         layout.addWidget(title)
         layout.addSpacing(20)
 
         # === Custom function to create each topic row ===
-        def make_topic(icon_path, text, bg_color, text_color):
+        def make_topic(icon_path, text):
+            # Row colors come from TOPIC_ROW_COLORS via the "topic-row" rules
             container = QFrame()
-            container.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {bg_color};
-                    border-radius: 35px;
-                }}
-            """)
+            container.setProperty("role", "topic-row")
+            container.setProperty("topic", text)
             container.setFixedHeight(80)
 
             icon_label = QLabel()
-            icon_label.setPixmap(QPixmap(icon_path).scaled(40, 40, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            icon_label.setPixmap(images.pixmap(icon_path, 40, 40))
             icon_label.setFixedSize(60, 60)
-            icon_label.setStyleSheet("background-color: white; border-radius: 30px;")
+            icon_label.setProperty("role", "topic-icon")
             icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
             text_label = QLabel(text)
             text_label.setFont(QFont("Arial Rounded MT Bold", 20))
-            text_label.setStyleSheet(f"color: {text_color};")
+            text_label.setProperty("role", "topic-name")
             text_label.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
 
             row = QHBoxLayout()
@@ -689,70 +777,48 @@ class MainWindow(QWidget):
 
             return container
 
-        # Topic Buttons (icon path, label, background color, text color)
+        # Topic Buttons (icon path, label)
         topics = [
-            ("book.png", "English", "#ADD8FF", "#3A4CC0"),
-            ("math.png", "Math", "#A5E6A0", "#2E4B2E"),
-            ("science.png", "Science", "#FFE8A0", "#D98C00"),
-            ("history.png", "History", "#FFB0A0", "#7B2D2D"),
+            ("book.png", "English"),
+            ("math.png", "Math"),
+            ("science.png", "Science"),
+            ("history.png", "History"),
     ]
 
         # Add topic buttons
-        for icon, text, bg_color, text_color in topics:
-            layout.addWidget(make_topic(icon, text, bg_color, text_color))
+        for icon, text in topics:
+            layout.addWidget(make_topic(icon, text))
 
     # Back Button
         back_btn = QPushButton("⬅ Back to Main")
         back_btn.setFont(QFont("Arial", 14))
         back_btn.setFixedWidth(200)
-        back_btn.clicked.connect(lambda: self.topics_page.fade_out(self.main_page))
+        back_btn.clicked.connect(lambda: self.page("topics").fade_out(self.page("main")))
         layout.addSpacing(30)
         layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # Background of entire page
-        widget.setStyleSheet("background-color: #FFF6E9;")
+        widget.setProperty("role", "surface")
 
         return widget
 
     #-------BAGONG LAGAY TO------
     def setup_topics_page(self):
-        """Initialize the topics page."""
-        self.topics_page = FadeWidget(self.create_topics_page(), self)
-        self.stacked.addWidget(self.topics_page)
-        self.apply_theme()
+        """Build the topics page (added to the stack by the page registry)."""
+        return FadeWidget(self.create_topics_page(), self)
 
     def toggle_existing_flashcard(self):
         """Show the topics page when 'Existing Flashcards' is clicked."""
-        if not hasattr(self, "topics_page"):
-            self.setup_topics_page()
-        self.main_page.fade_out(self.topics_page)
+        self.page("main").fade_out(self.page("topics"))
 
     def show_topic_page(self, topic_name):
         """Display the selected topic’s flashcard page."""
-        if not hasattr(self, "topic_pages"):
-            self.topic_pages = {}
-
-        if topic_name not in self.topic_pages:
-            bg_colors = {
-                "English": "#D8E6FF",
-                "Math": "#C9F7C5",
-                "Science": "#FFF6BF",
-                "History": "#FFD5CC",
-            }
-            text_colors = {
-                "English": "#1A237E",
-                "Math": "#1B5E20",
-                "Science": "#BF360C",
-                "History": "#4E342E",
-            }
-            page = FadeWidget(
-                self.create_topic_page(topic_name, bg_colors[topic_name], text_colors[topic_name]),
-                self
-            )
-            self.topic_pages[topic_name] = page
-            self.stacked.addWidget(page)
+        name = f"topic:{topic_name}"
+        if not self.pages.is_registered(name):
+            # Topic pages are heavy: rebuilt on demand once evicted
+            self.pages.register(name, lambda: FadeWidget(self.create_topic_page(topic_name), self), heavy=True)
 
-        self.topics_page.fade_out(self.topic_pages[topic_name])
+        self.page("topics").fade_out(self.page(name))
     
       # ========== CREATE FLASHCARD PAGE ==========
     def create_create_flashcard_page(self):
@@ -761,34 +827,38 @@ class MainWindow(QWidget):
         layout = QVBoxLayout(widget)
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.setSpacing(15)
-        self.apply_theme()
 
         title = QLabel("Create Flashcard")
         title.setFont(QFont("Arial Rounded MT Bold", 28))
-        title.setStyleSheet("color: #434190;")
+        title.setProperty("role", "title")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.q_input = QLineEdit()
         self.q_input.setPlaceholderText("Enter question here...")
         self.q_input.setFont(QFont("Arial", 14))
         self.q_input.setFixedWidth(400)
-        self.q_input.setStyleSheet("padding: 8px; border-radius: 10px; border: 2px solid #888;")
+        self.q_input.setProperty("role", "card-input")
 
         self.a_input = QLineEdit()
         self.a_input.setPlaceholderText("Enter answer here...")
         self.a_input.setFont(QFont("Arial", 14))
         self.a_input.setFixedWidth(400)
-        self.a_input.setStyleSheet("padding: 8px; border-radius: 10px; border: 2px solid #888;")
+        self.a_input.setProperty("role", "card-input")
 
         save_btn = QPushButton("💾 Save Flashcard")
         save_btn.setFont(QFont("Arial Rounded MT Bold", 14))
-        save_btn.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px 20px; border-radius: 10px;")
+        save_btn.setProperty("role", "success")
         save_btn.clicked.connect(self.save_flashcard)
 
+        bulk_btn = QPushButton("📋 Bulk Add")
+        bulk_btn.setFont(QFont("Arial Rounded MT Bold", 14))
+        bulk_btn.setProperty("role", "secondary")
+        bulk_btn.clicked.connect(lambda: self.page("create_flashcard").fade_out(self.page("bulk_create")))
+
         back_btn = QPushButton("⬅ Back to Main")
         back_btn.setFont(QFont("Arial Rounded MT Bold", 14))
-        back_btn.setStyleSheet("background-color: #888; color: white; padding: 8px 20px; border-radius: 10px;")
-        back_btn.clicked.connect(lambda: self.create_flashcard_page.fade_out(self.main_page))
+        back_btn.setProperty("role", "secondary")
+        back_btn.clicked.connect(lambda: self.page("create_flashcard").fade_out(self.page("main")))
 
         layout.addStretch()
         layout.addWidget(title)
@@ -797,63 +867,181 @@ class MainWindow(QWidget):
         layout.addWidget(self.a_input, alignment=Qt.AlignmentFlag.AlignCenter)
         layout.addSpacing(15)
         layout.addWidget(save_btn, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(bulk_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         layout.addStretch()
 
-        widget.setStyleSheet("background-color: #FFF6E9;")
+        widget.setProperty("role", "surface")
         return widget
     
-   def setup_create_flashcard_page(self): #axl
-    """Initialize and add the Create Flashcard page to stacked widget."""
-    self.create_flashcard_page = FadeWidget(self.create_create_flashcard_page(), self)
-    self.stacked.addWidget(self.create_flashcard_page)
-
-    # 🔹 Add Ctrl+Enter shortcut to save flashcard
-    shortcut_save_flash = QShortcut(QKeySequence("Ctrl+Return"), self)
-    shortcut_save_flash.setContext(Qt.ShortcutContext.ApplicationShortcut)
-    shortcut_save_flash.activated.connect(self.save_flashcard)
+    def setup_create_flashcard_page(self): #axl
+        """Build the Create Flashcard page (added to the stack by the page registry)."""
+        page = FadeWidget(self.create_create_flashcard_page(), self)
+
+        # 🔹 Add Ctrl+Enter shortcut to save flashcard
+        shortcut_save_flash = QShortcut(QKeySequence("Ctrl+Return"), self)
+        shortcut_save_flash.setContext(Qt.ShortcutContext.ApplicationShortcut)
+        shortcut_save_flash.activated.connect(self.save_flashcard)
+        return page
 
    
 
     def toggle_create_flashcard(self):
         """Show the Create Flashcard page when button is clicked."""
-        if not hasattr(self, "create_flashcard_page"):
-            self.setup_create_flashcard_page()
-        self.main_page.fade_out(self.create_flashcard_page)
+        self.page("main").fade_out(self.page("create_flashcard"))
 
     def save_flashcard(self):
-        """Save the flashcard temporarily."""
+        """Save the flashcard to the card store."""
         question = self.q_input.text().strip()
         answer = self.a_input.text().strip()
 
         if not question or not answer:
-            msg = QMessageBox()
-            msg.setIcon(QMessageBox.Icon.Warning)
-            msg.setWindowTitle("Incomplete Flashcard")
-            msg.setText("Please fill out both the question and the answer before saving.")
-            msg.setStandardButtons(QMessageBox.StandardButton.Ok)
-            msg.setStyleSheet(MESSAGE_WARNING)
-            msg.exec()
+            self.toast.show_message("Please fill out both the question and the answer before saving.", WARNING)
+            return
+
+        # Near-identical card already saved? Offer to save anyway, without blocking.
+        duplicates = self.data.find_duplicates(question, answer)
+        if duplicates:
+            old_q = duplicates[0][2]
+            self.toast.show_message(
+                f"You already have a very similar card: “{old_q}”", WARNING,
+                "Save anyway", lambda: self.commit_flashcard(question, answer),
+            )
             return
+        self.commit_flashcard(question, answer)
+
+    def commit_flashcard(self, question, answer):
+        # Persist through AppData's card store
+        self.data.add_flashcard(question, answer)
+        self.toast.show_message("Flashcard saved ✅")
+
+        # Clear inputs for next entry, unless a later "Save anyway" finds
+        # the user already typing another card
+        if self.q_input.text().strip() == question and self.a_input.text().strip() == answer:
+            self.q_input.clear()
+            self.a_input.clear()
+            self.q_input.setFocus()
+
+    # ========== BULK AUTHORING PAGE ==========
+    def create_bulk_page(self):
+        """Paste many cards at once, with a live parsed preview."""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setSpacing(12)
+        layout.setContentsMargins(30, 30, 30, 30)
 
-        # Save to AppData (you can modify this later to save per topic)
-        if not hasattr(self.data, "custom_flashcards"):
-            self.data.custom_flashcards = []
+        title = QLabel("Bulk Add Flashcards")
+        title.setFont(QFont("Arial Rounded MT Bold", 28))
+        title.setProperty("role", "title")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.data.custom_flashcards.append((question, answer))
+        hint = QLabel("One card per line: question ⇥ answer, question :: answer, "
+                      "question | answer, CSV, or Q:/A: blocks.")
+        hint.setFont(QFont("Arial", 12))
+        hint.setProperty("role", "muted")
+        hint.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.bulk_input = QPlainTextEdit()
+        self.bulk_input.setFont(QFont("Arial", 13))
+        self.bulk_input.setProperty("role", "card-input")
+        self.bulk_input.setPlaceholderText("Paste your cards here…")
+
+        self.bulk_preview = QTableWidget(0, 2)
+        self.bulk_preview.setHorizontalHeaderLabels(["Question", "Answer"])
+        self.bulk_preview.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.bulk_preview.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+
+        self.bulk_summary = QLabel()
+        self.bulk_summary.setFont(QFont("Arial", 12))
+        self.bulk_summary.setProperty("role", "muted")
+        self.bulk_errors = QLabel()
+        self.bulk_errors.setFont(QFont("Arial", 12))
+        self.bulk_errors.setProperty("role", "error")
+        self.bulk_errors.setWordWrap(True)
+
+        self.bulk_timer = QTimer(self)
+        self.bulk_timer.setSingleShot(True)
+        self.bulk_timer.setInterval(BULK_PREVIEW_MS)
+        self.bulk_timer.timeout.connect(self.update_bulk_preview)
+        self.bulk_input.textChanged.connect(self.bulk_timer.start)
+        self.bulk_parse = parse_bulk("")
+
+        self.bulk_add_btn = QPushButton("💾 Add Cards")
+        self.bulk_add_btn.setFont(QFont("Arial Rounded MT Bold", 14))
+        self.bulk_add_btn.setProperty("role", "success")
+        self.bulk_add_btn.setEnabled(False)
+        self.bulk_add_btn.clicked.connect(self.save_bulk_flashcards)
+
+        back_btn = QPushButton("⬅ Back")
+        back_btn.setFont(QFont("Arial Rounded MT Bold", 14))
+        back_btn.setProperty("role", "secondary")
+        back_btn.clicked.connect(lambda: self.page("bulk_create").fade_out(self.page("create_flashcard")))
+
+        panes = QHBoxLayout()
+        panes.addWidget(self.bulk_input, 1)
+        panes.addWidget(self.bulk_preview, 1)
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(self.bulk_add_btn)
+        buttons.addWidget(back_btn)
+        buttons.addStretch()
 
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Icon.Information)
-        msg.setWindowTitle("Saved!")
-        msg.setText("Flashcard saved successfully ✅")
-        msg.setStandardButtons(QMessageBox.StandardButton.Ok)
-        msg.setStyleSheet(MESSAGE_WARNING)
-        msg.setWindowIcon(QIcon("Icon.png"))
-        msg.exec()
+        layout.addWidget(title)
+        layout.addWidget(hint)
+        layout.addLayout(panes, 1)
+        layout.addWidget(self.bulk_summary)
+        layout.addWidget(self.bulk_errors)
+        layout.addLayout(buttons)
 
-        # Clear inputs for next entry
-        self.q_input.clear()
-        self.a_input.clear()
+        widget.setProperty("role", "surface")
+        return widget
+
+    def update_bulk_preview(self):
+        """Re-parse the paste and refresh the preview (first BULK_PREVIEW_ROWS rows)."""
+        result = self.bulk_parse = parse_bulk(self.bulk_input.toPlainText())
+        shown = result.cards[:BULK_PREVIEW_ROWS]
+        self.bulk_preview.setUpdatesEnabled(False)
+        self.bulk_preview.setRowCount(len(shown))
+        for row, (question, answer) in enumerate(shown):
+            self.bulk_preview.setItem(row, 0, QTableWidgetItem(question))
+            self.bulk_preview.setItem(row, 1, QTableWidgetItem(answer))
+        self.bulk_preview.setUpdatesEnabled(True)
+
+        count = len(result.cards)
+        more = f" (showing first {BULK_PREVIEW_ROWS})" if count > len(shown) else ""
+        self.bulk_summary.setText(f"{count} cards ready{more}" + (
+            f", {len(result.errors)} lines skipped" if result.errors else ""))
+        self.bulk_errors.setText("\n".join(
+            f"Line {line}: {message}" for line, message in result.errors[:BULK_ERRORS_SHOWN]))
+        self.bulk_add_btn.setText(f"💾 Add {count} Cards" if count else "💾 Add Cards")
+        self.bulk_add_btn.setEnabled(count > 0)
+
+    def save_bulk_flashcards(self):
+        """Commit every valid parsed card in a single transaction, leaving out near-duplicates."""
+        if self.bulk_timer.isActive():  # typed since the last preview
+            self.bulk_timer.stop()
+            self.update_bulk_preview()
+        cards = self.bulk_parse.cards
+        if not cards:
+            return
+        duplicates = self.data.add_flashcards(cards)
+        self.data.request_sync()
+        skipped = len(self.bulk_parse.errors)
+        message = f"Added {len(cards) - len(duplicates)} flashcards ✅" + (
+            f" ({skipped} lines skipped)" if skipped else "")
+        if duplicates:
+            self.toast.show_message(
+                f"{message}. Left out {len(duplicates)} near-duplicates.", WARNING,
+                "Add them anyway", lambda: self.add_bulk_duplicates(duplicates))
+        else:
+            self.toast.show_message(message)
+        self.bulk_input.clear()
+        self.update_bulk_preview()
+
+    def add_bulk_duplicates(self, cards):
+        self.data.add_flashcards(cards, skip_duplicates=False)
+        self.data.request_sync()
+        self.toast.show_message(f"Added {len(cards)} flashcards ✅")
 
     # ========== SAVED FLASHCARDS REVIEW PAGE ==========
     def create_saved_flashcards_page(self):
@@ -866,101 +1054,336 @@ class MainWindow(QWidget):
     
         title = QLabel("Your Saved Flashcards")
         title.setFont(QFont("Arial Rounded MT Bold", 28))
-        title.setStyleSheet("color: #434190;")
+        title.setProperty("role", "title")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
     
-        # ✅ Use a QWidget to host the horizontal layout (prevents vertical push)
-        self.saved_flashcards_container_widget = QWidget()
-        self.saved_flashcards_container_widget.setSizePolicy(
-            self.saved_flashcards_container_widget.sizePolicy().horizontalPolicy(),
-            self.saved_flashcards_container_widget.sizePolicy().verticalPolicy()
-        )
-        self.saved_flashcards_container = QHBoxLayout(self.saved_flashcards_container_widget)
-        self.saved_flashcards_container.setSpacing(30)
-        self.saved_flashcards_container.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # Virtualized grid: the delegate paints only the visible cards
+        self.saved_cards_model = CardListModel(self.data.store)
+        self.saved_cards_model.revealed.connect(self.record_review)
+        self.saved_cards_view = CardGridView(self.saved_cards_model)
+
+        self.no_saved_label = QLabel("No saved flashcards yet! Create some first. 📚")
+        self.no_saved_label.setFont(QFont("Arial", 14))
+        self.no_saved_label.setProperty("role", "muted")
+        self.no_saved_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
     
+        # Deck import/export (runs in the background, see jobs_flashcard)
+        import_btn = QPushButton("📥 Import Deck")
+        import_btn.setFont(QFont("Arial Rounded MT Bold", 14))
+        import_btn.setProperty("role", "secondary")
+        import_btn.clicked.connect(self.import_deck)
+        export_btn = QPushButton("📤 Export Deck")
+        export_btn.setFont(QFont("Arial Rounded MT Bold", 14))
+        export_btn.setProperty("role", "secondary")
+        export_btn.clicked.connect(self.export_deck)
+        dedupe_btn = QPushButton("🧹 Remove Duplicates")
+        dedupe_btn.setFont(QFont("Arial Rounded MT Bold", 14))
+        dedupe_btn.setProperty("role", "secondary")
+        dedupe_btn.clicked.connect(self.dedupe_library)
+        deck_row = QHBoxLayout()
+        deck_row.addStretch()
+        deck_row.addWidget(import_btn)
+        deck_row.addWidget(export_btn)
+        deck_row.addWidget(dedupe_btn)
+        deck_row.addStretch()
+
         # Back button
         back_btn = QPushButton("⬅ Back to Main")
         back_btn.setFont(QFont("Arial Rounded MT Bold", 14))
-        back_btn.setStyleSheet("background-color: #888; color: white; padding: 8px 20px; border-radius: 10px;")
-        back_btn.clicked.connect(lambda: self.saved_flashcards_page.fade_out(self.main_page))
+        back_btn.setProperty("role", "secondary")
+        back_btn.clicked.connect(lambda: self.page("saved_flashcards").fade_out(self.page("main")))
     
         layout.addWidget(title)
-        # Add the container widget (not the layout) to the vertical layout
-        layout.addWidget(self.saved_flashcards_container_widget, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addLayout(deck_row)
+        layout.addWidget(self.no_saved_label)
+        layout.addWidget(self.saved_cards_view, 1)
         layout.addSpacing(20)
         layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignCenter)
     
-        widget.setStyleSheet("background-color: #FFF6E9;")
+        widget.setProperty("role", "surface")
         return widget
     
 
 
     def setup_saved_flashcards_page(self):
-        """Initialize the saved flashcards review page."""
-        self.saved_flashcards_page = FadeWidget(self.create_saved_flashcards_page(), self)
-        self.stacked.addWidget(self.saved_flashcards_page)
-        self.apply_theme()
+        """Build the saved flashcards review page (added to the stack by the page registry)."""
+        return FadeWidget(self.create_saved_flashcards_page(), self)
 
 
     def show_saved_flashcards(self):
-        """Display user-saved flashcards as FlipCards."""
-        if not hasattr(self, "saved_flashcards_page"):
-            self.setup_saved_flashcards_page()
-    
-        # Clear previous child widgets from the container widget (safe)
-        if hasattr(self, "saved_flashcards_container"):
-            layout = self.saved_flashcards_container
-            for i in reversed(range(layout.count())):
-                item = layout.itemAt(i)
-                w = item.widget()
-                if w:
-                    w.setParent(None)
-                else:
-                    # if it's a spacer or layout, take it out
-                    layout.removeItem(item)
-    
-        # Populate cards or show a friendly message
-        if not hasattr(self.data, "custom_flashcards") or not self.data.custom_flashcards:
-            no_card_label = QLabel("No saved flashcards yet! Create some first. 📚")
-            no_card_label.setFont(QFont("Arial", 14))
-            no_card_label.setStyleSheet("color: #777;")
-            no_card_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.saved_flashcards_container.addWidget(no_card_label)
-        else:
-            for q, a in self.data.custom_flashcards:
-                card = FlipCard(q, a, bg_color="#FFFFFF", text_color="#333")
-                self.saved_flashcards_container.addWidget(card, alignment=Qt.AlignmentFlag.AlignCenter)
-    
-        # Use your fade transition to show the page
-        self.main_page.fade_out(self.saved_flashcards_page)
+        """Display user-saved flashcards in the virtualized card grid."""
+        saved_page = self.page("saved_flashcards")
+        self.refresh_saved_flashcards()
+        self.page("main").fade_out(saved_page)
+
+    def refresh_saved_flashcards(self):
+        # Show what the store has now; on_journal_synced reloads once
+        # journaled saves are in
+        self.data.request_sync()
+        self.reload_saved_cards()
+
+    def on_journal_synced(self, error):
+        """The journal compacted into the store (`error` None) or failed to; it keeps retrying."""
+        if error is not None:
+            if not self.journal_warned:
+                self.journal_warned = True
+                self.toast.show_message("Couldn't save your latest cards yet. Retrying…", WARNING)
+            return
+        if self.journal_warned:
+            self.journal_warned = False
+            self.toast.show_message("Your cards are saved ✅")
+        self.reload_saved_cards()
+
+    def reload_saved_cards(self):
+        if self.pages.peek("saved_flashcards") is None:
+            return  # not built (or evicted); it reloads when next shown
+        self.saved_cards_model.reload()
+        has_cards = self.saved_cards_model.rowCount() > 0
+        self.no_saved_label.setVisible(not has_cards)
+        self.saved_cards_view.setVisible(has_cards)
+
+    # ========== STATISTICS PAGE ==========
+    def create_statistics_page(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        layout.setSpacing(15)
+        layout.setContentsMargins(30, 30, 30, 30)
 
+        title = QLabel("Your Study Statistics")
+        title.setFont(QFont("Arial Rounded MT Bold", 28))
+        title.setProperty("role", "title")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-    def show_saved_flashcards(self):
-        """Display user-saved flashcards as FlipCards."""
-        # Create the page if it doesn’t exist yet
-        if not hasattr(self, "saved_flashcards_page"):
-            self.setup_saved_flashcards_page()
-
-        # Clear previous cards (to refresh)
-        for i in reversed(range(self.saved_flashcards_container.count())):
-            widget_item = self.saved_flashcards_container.itemAt(i).widget()
-            if widget_item:
-                widget_item.setParent(None)
-
-        # Check if there are saved flashcards
-        if not hasattr(self.data, "custom_flashcards") or not self.data.custom_flashcards:
-            no_card_label = QLabel("No saved flashcards yet! Create some first. 📚")
-            no_card_label.setFont(QFont("Arial", 14))
-            no_card_label.setStyleSheet("color: #777;")
-            no_card_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.saved_flashcards_container.addWidget(no_card_label)
-        else:
-            # Create FlipCards for each saved flashcard
-            for q, a in self.data.custom_flashcards:
-                card = FlipCard(q, a, bg_color="#FFFFFF", text_color="#333")
-                self.saved_flashcards_container.addWidget(card, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.stats_summary = QLabel()
+        self.stats_summary.setFont(QFont("Arial", 14))
+        self.stats_summary.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.stats_topics = QTableWidget(0, 3)
+        self.stats_topics.setHorizontalHeaderLabels(["Topic", "Reviews", "Accuracy"])
+        self.stats_topics.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.stats_topics.verticalHeader().hide()
+        self.stats_topics.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+
+        # Retention curve and time-per-card histogram as text bar charts
+        self.stats_retention = QLabel()
+        self.stats_latency = QLabel()
+        for chart in (self.stats_retention, self.stats_latency):
+            chart.setFont(QFont("Courier New", 12))
+            chart.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        charts = QHBoxLayout()
+        charts.addWidget(self.stats_retention, alignment=Qt.AlignmentFlag.AlignTop)
+        charts.addWidget(self.stats_latency, alignment=Qt.AlignmentFlag.AlignTop)
+
+        back_btn = QPushButton("⬅ Back to Main")
+        back_btn.setFont(QFont("Arial Rounded MT Bold", 14))
+        back_btn.setProperty("role", "secondary")
+        back_btn.clicked.connect(lambda: self.page("statistics").fade_out(self.page("main")))
 
-        self.main_page.fade_out(self.saved_flashcards_page)
+        layout.addWidget(title)
+        layout.addWidget(self.stats_summary)
+        layout.addLayout(charts)
+        layout.addWidget(self.stats_topics, 1)
+        layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        widget.setProperty("role", "surface")
+        return widget
 
-  
+    # ========== HELP PAGE ==========
+    def create_help_page(self):
+        """Help page: navigation, shortcuts, and flashcard tips."""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        layout.setContentsMargins(40, 30, 40, 30)
+
+        def add_section(title, content, emoji=""):
+            lbl_title = QLabel(f"{emoji} {title}")
+            lbl_title.setFont(QFont("Arial Rounded MT Bold", 22))
+            lbl_title.setProperty("role", "title")
+            lbl_text = QLabel(content)
+            lbl_text.setFont(QFont("Arial", 14))
+            lbl_text.setProperty("role", "muted")
+            lbl_text.setWordWrap(True)
+            layout.addWidget(lbl_title)
+            layout.addWidget(lbl_text)
+            layout.addSpacing(10)
+
+        header = QLabel("HELP & GUIDE")
+        header.setFont(QFont("Arial Rounded MT Bold", 32))
+        header.setProperty("role", "title-bold")
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(header)
+
+        add_section("Navigation",
+            "• Use ☰ to open sidebar\n"
+            "• Access Home, Practice or Statistics\n"
+            "• 'Create Flashcard' = make new\n"
+            "• 'Existing Flashcards' = browse topics\n"
+            "• 'Saved Flashcards' = view your saved ones", "🧭")
+
+        add_section("Shortcut Keys",
+            "• Ctrl + Q – Quit app\n"
+            "• Ctrl + S – Save data or flashcard\n"
+            "• Ctrl + F – Open flashcard view\n"
+            "• Ctrl + Enter – Save new flashcard\n"
+            "• Ctrl + I – Turn page animations on or off\n"
+            "• Spacebar – Flip/check flashcard\n"
+            "• F1 – Open this Help page", "⌨️")
+
+        add_section("Tips for Great Flashcards",
+            "• Keep questions short\n"
+            "• One idea per card\n"
+            "• Use hints or keywords\n"
+            "• Be clear and specific\n"
+            "• Review often\n"
+            "• Add emojis or color 🎨", "💡")
+
+        back_btn = QPushButton("⬅ Back")
+        back_btn.setFont(QFont("Arial Rounded MT Bold", 14))
+        back_btn.setProperty("role", "secondary")
+        back_btn.clicked.connect(lambda: self.page("help").fade_out(self.page(self.help_return)))
+        layout.addStretch()
+        layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        widget.setProperty("role", "surface")
+        return widget
+
+    def show_help_page(self):
+        """Show the help page (F1); Back returns to the page it was opened from."""
+        current = self.stacked.currentWidget()
+        help_page = self.page("help")
+        if current is help_page:
+            return
+        self.help_return = next((name for name, page in self.pages.built() if page is current), "main")
+        current.fade_out(help_page)
+
+    def show_practice(self):
+        """Open interleaved practice over the flashcards_data decks, logging to the profile's telemetry."""
+        from study_techniques_code import InterleavedPractice  # decks, NumPy: only when opened
+        if self.practice is None or not self.practice.isVisible():
+            # Closing the window released its decks, so each opening starts a fresh session
+            if self.practice is not None:
+                self.practice.deleteLater()
+            self.practice = InterleavedPractice(self.data.deck_scheduler, telemetry=self.data.telemetry)
+            self.practice.setWindowIcon(images.icon("Icon.png"))
+        self.practice.show()
+        self.practice.raise_()
+        self.practice.activateWindow()
+
+    def show_statistics(self):
+        stats_page = self.page("statistics")
+        self.refresh_statistics()
+        self.page("main").fade_out(stats_page)
+
+    def refresh_statistics(self):
+        # Precomputed rolling aggregates, so opening the page never rescans the log
+        stats = self.data.telemetry.rollups.summary()
+        if not stats.reviews:
+            self.stats_summary.setText("No reviews yet — flip some cards and come back! 📊")
+        else:
+            median = f"{stats.median_latency:.1f} s" if stats.median_latency is not None else "–"
+            self.stats_summary.setText(
+                f"{stats.reviews} reviews · {stats.accuracy:.0%} correct · median {median} per card\n"
+                f"🔥 {stats.current_streak}-day streak (best {stats.longest_streak}) · "
+                f"{stats.study_days} study days\n"
+                f"Today: {stats.today.reviews} reviews · this week: {stats.this_week.reviews}"
+            )
+
+        self.stats_topics.setRowCount(len(stats.topic_accuracy))
+        for row, (topic, reviews, accuracy) in enumerate(stats.topic_accuracy):
+            for col, text in enumerate((topic, str(reviews), f"{accuracy:.0%}")):
+                self.stats_topics.setItem(row, col, QTableWidgetItem(text))
+
+        retention = [(f"{days:>3g}+ d", share) for days, _seen, share in stats.retention if share is not None]
+        self.stats_retention.setText(
+            "Retention after a gap of\n" + "\n".join(
+                f"{label} {'█' * round(share * 20):<20} {share:.0%}" for label, share in retention))
+        peak = max((count for _edge, count in stats.latency_histogram), default=0) or 1
+        self.stats_latency.setText(
+            "Seconds per card\n" + "\n".join(
+                f"{edge:>3g}+ s {'█' * round(count / peak * 20):<20} {count}"
+                for edge, count in stats.latency_histogram))
+
+    # ========== DECK IMPORT / EXPORT ==========
+    def import_deck(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Deck", "", FILE_FILTER)
+        if path:
+            self.run_job(ImportJob(self.data.store.path, path), "Importing")
+
+    def export_deck(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Deck", "flashcards.csv", FILE_FILTER)
+        if path:
+            self.run_job(ExportJob(self.data.store.path, path), "Exporting")
+
+    def dedupe_library(self):
+        """Find near-duplicates, and remove them only once the user has seen and accepted them."""
+        self.run_job(FindDuplicatesJob(self.data.store.path), "Finding duplicates",
+                     unit="duplicates found", on_finished=self.confirm_dedupe)
+
+    def confirm_dedupe(self, job):
+        if not job.groups:
+            return
+        removable = sum(len(ids) - 1 for ids in job.groups)
+        msg = QMessageBox(self)
+        msg.setIcon(QMessageBox.Icon.Question)
+        msg.setWindowTitle("Remove Duplicates")
+        msg.setFont(styles.FONT_SUBTITLE)
+        msg.setWindowIcon(images.icon("Icon.png"))
+        msg.setText(
+            f"Found {len(job.groups)} groups of near-identical cards. Keep the oldest card of "
+            f"each group and remove the other {removable}?\n\nYou can undo this right after.")
+        shown = "\n\n".join(
+            "\n".join(("Keep:   " if i == 0 else "Remove: ") + question for i, question in enumerate(group))
+            for group in job.preview)
+        more = len(job.groups) - len(job.preview)
+        msg.setDetailedText(shown + (f"\n\n…and {more} more groups" if more > 0 else ""))
+        msg.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel)
+        msg.setDefaultButton(QMessageBox.StandardButton.Cancel)
+        if msg.exec() != QMessageBox.StandardButton.Yes:
+            return
+        self.run_job(MergeDuplicatesJob(self.data.store.path, job.groups), "Removing duplicates",
+                     unit="duplicates removed", on_finished=self.offer_undo_dedupe)
+
+    def offer_undo_dedupe(self, job):
+        removed = sum(len(ids) - 1 for ids in job.groups)
+        self.toast.show_message(
+            f"Removed {removed} duplicate cards", INFO,
+            "Undo", lambda: self.run_job(RestoreDuplicatesJob(self.data.store.path), "Restoring duplicates",
+                                         unit="cards restored"))
+
+    def run_job(self, job, verb, unit="cards", on_finished=None):
+        """Start a background import/export; one at a time. `on_finished(job)`
+        runs once it has finished (not when cancelled or failed)."""
+        if self.job is not None:
+            self.toast.show_message("Please wait for the current import/export to finish.", WARNING)
+            return
+        self.job = job
+        job.signals.progress.connect(self.on_job_progress)
+        job.signals.finished.connect(lambda n: self.end_job(f"{verb} done: {n} {unit}{job.note} ✅"))
+        if on_finished is not None:
+            job.signals.finished.connect(lambda _n: on_finished(job))
+        job.signals.cancelled.connect(lambda n: self.end_job(f"{verb} cancelled after {n} {unit}"))
+        job.signals.failed.connect(lambda err: self.end_job(f"{verb} failed: {err}"))
+        self.job_label.setText(f"{verb}…")
+        self.job_progress.setRange(0, 0)  # busy until the first progress report
+        self.cancel_job_btn.setEnabled(True)
+        self.job_bar.show()
+        start_job(job)
+
+    def on_job_progress(self, done, total):
+        # Scale to per-mille so byte offsets past 2**31 still fit the bar
+        self.job_progress.setRange(0, 1000)
+        self.job_progress.setValue(int(1000 * done / total) if total else 1000)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.cancel_job_btn.setEnabled(False)
+
+    def end_job(self, message):
+        self.job = None
+        self.job_label.setText(message)
+        self.cancel_job_btn.setEnabled(False)
+        self.refresh_saved_flashcards()
+        QTimer.singleShot(4000, lambda: self.job is None and self.job_bar.hide())
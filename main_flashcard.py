@@ -1,9 +1,55 @@
 # main_flashcard.py
 import sys
+import time
+
+START = time.perf_counter()
+
 from PyQt6.QtWidgets import QApplication
-from main_app_flashcard import MainWindow
+from PyQt6.QtCore import QObject, QEvent, QTimer
+
+PROFILE_FLAG = "--profile-startup"
+
+
+class StartupProfiler(QObject):
+    """Reports time-to-first-paint and time-to-interactive, then quits."""
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self.first_paint = None
+        app.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if self.first_paint is None and event.type() == QEvent.Type.Paint:
+            self.first_paint = time.perf_counter() - START
+        return False
+
+    def watch(self, window):
+        # Interactive = deferred startup work done and the event loop idle again
+        window.startup_finished.connect(lambda: QTimer.singleShot(0, self.report))
+
+    def report(self):
+        interactive = time.perf_counter() - START
+        first_paint = self.first_paint if self.first_paint is not None else interactive
+        print(f"startup: first paint {first_paint * 1000:.1f} ms, "
+              f"interactive {interactive * 1000:.1f} ms", file=sys.stderr)
+        self.app.quit()
+
+
+def main():
+    app = QApplication(sys.argv)
+    profiler = StartupProfiler(app) if PROFILE_FLAG in sys.argv else None
+
+    # Imported after QApplication exists so the window module loads while
+    # nothing else competes for the first paint
+    from main_app_flashcard import MainWindow
+
+    window = MainWindow(app)
+    if profiler is not None:
+        profiler.watch(window)
+    window.showMaximized()
+    sys.exit(app.exec())
+
 
-app = QApplication(sys.argv)
-window = MainWindow()
-window.showMaximized()
-sys.exit(app.exec())
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# page_registry_flashcard.py
+from collections import OrderedDict
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QWidget
+
+# Rough resident cost of one widget (object, style data, layout item).
+WIDGET_BYTES = 4 * 1024
+DEFAULT_BUDGET = 2 * 1024 * 1024
+PREWARM_DELAY_MS = 50
+
+
+def estimate_page_bytes(page):
+    return (len(page.findChildren(QWidget)) + 1) * WIDGET_BYTES
+
+
+class PageSpec:
+    __slots__ = ("factory", "heavy", "next_pages", "on_evict")
+
+    def __init__(self, factory, heavy, next_pages, on_evict):
+        self.factory = factory
+        self.heavy = heavy
+        self.next_pages = next_pages
+        self.on_evict = on_evict
+
+
+class PageRegistry:
+    """Builds MainWindow pages on first navigation.
+
+    Heavy pages (topic pages, saved cards) are kept in LRU order and removed
+    from the stacked widget once their estimated size goes over `budget`
+    bytes. After a page is fetched, the pages listed as its likely next
+    pages are built one per idle tick.
+    """
+
+    def __init__(self, stacked, budget=DEFAULT_BUDGET, on_build=None):
+        self.stacked = stacked
+        self.budget = budget
+        self.on_build = on_build
+        self.specs = {}
+        self.pages = {}
+        self.heavy_lru = OrderedDict()  # name -> estimated bytes
+        self._prewarm_queue = []
+        self._prewarm_scheduled = False
+
+    def register(self, name, factory, heavy=False, next_pages=(), on_evict=None):
+        if name not in self.specs:
+            self.specs[name] = PageSpec(factory, heavy, tuple(next_pages), on_evict)
+
+    def is_registered(self, name):
+        return name in self.specs
+
+    def peek(self, name):
+        """The page if it is already built, without building it."""
+        return self.pages.get(name)
+
+    def built(self):
+        return list(self.pages.items())
+
+    def get(self, name):
+        page = self.pages.get(name)
+        if page is None:
+            page = self._build(name)
+        if self.specs[name].heavy:
+            self.heavy_lru.move_to_end(name)
+            self._evict_over_budget(keep=name)
+        self.prewarm(self.specs[name].next_pages)
+        return page
+
+    def _build(self, name):
+        page = self.specs[name].factory()
+        self.pages[name] = page
+        self.stacked.addWidget(page)
+        if self.specs[name].heavy:
+            self.heavy_lru[name] = estimate_page_bytes(page)
+        if self.on_build is not None:
+            self.on_build(name, page)
+        return page
+
+    def _evict_over_budget(self, keep=None):
+        current = self.stacked.currentWidget()
+        for name in list(self.heavy_lru):
+            if sum(self.heavy_lru.values()) <= self.budget:
+                break
+            if name == keep or self.pages[name] is current:
+                continue
+            self.evict(name)
+
+    def evict(self, name):
+        page = self.pages.pop(name, None)
+        if page is None:
+            return
+        self.heavy_lru.pop(name, None)
+        self.stacked.removeWidget(page)
+        page.deleteLater()
+        if self.specs[name].on_evict is not None:
+            self.specs[name].on_evict()
+
+    def prewarm(self, names):
+        """Queue pages to be built during idle time."""
+        queued = False
+        for name in names:
+            if name in self.specs and name not in self.pages and name not in self._prewarm_queue:
+                self._prewarm_queue.append(name)
+                queued = True
+        if queued:
+            self._schedule_prewarm()
+
+    def _schedule_prewarm(self):
+        if not self._prewarm_scheduled:
+            self._prewarm_scheduled = True
+            QTimer.singleShot(PREWARM_DELAY_MS, self._prewarm_next)
+
+    def _prewarm_next(self):
+        self._prewarm_scheduled = False
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if name in self.pages:
+                continue
+            if self.specs[name].heavy and sum(self.heavy_lru.values()) >= self.budget:
+                continue  # don't push out pages the user actually opened
+            self._build(name)
+            break
+        if self._prewarm_queue:
+            self._schedule_prewarm()
@@ -0,0 +1,270 @@
+# prefetch_flashcard.py
+"""Look-ahead for practice sessions: the next cards are ready before they are asked for.
+
+While a card is on screen, CardPrefetcher draws the next keys from the deck
+stream, decodes their cards and lays out both faces as QStaticText, one
+card per idle turn of the event loop. Show Answer and Next then only swap
+in a prepared layout.
+
+How far ahead to look follows the user's pace, an exponential average of
+the seconds spent per card: about LOOKAHEAD_SECONDS of study is kept
+ready, so quick answer runs cannot outrun the preparation while slow
+readers do not decode cards they may never reach.
+
+Due reviews come first, as before. The scheduler's next due card (or the
+next one to fall due within the look-ahead) is prepared too, but kept
+aside by key, because grading can change which review comes next.
+
+The work runs on the UI thread, in zero-interval QTimer turns, not on a
+worker thread: QStaticText and the font engine behind it are only safe
+to use from the GUI thread, and one card's decode and layout is short
+enough to fit between events. Cards carry text only (question, answer,
+topic, tags), so there are no image attachments to prefetch.
+"""
+import math
+import time
+from collections import OrderedDict, deque
+
+from PyQt6.QtCore import QObject, QPointF, QSize, QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QPainter, QStaticText, QTextOption, QTransform
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+from timing_flashcard import session_clock
+
+LOOKAHEAD_SECONDS = 20.0   # keep about this much study time prepared
+DEFAULT_AHEAD = 3          # until the user's pace is known
+MIN_AHEAD = 1
+MAX_AHEAD = 8
+PACE_ALPHA = 0.3           # weight of the latest card in the pace average
+MAX_PACE_SAMPLE = 120.0    # longer pauses (the user stepped away) count as this
+DUE_CACHE = 4
+
+
+def lay_out(text, font, width):
+    """Centred, word-wrapped QStaticText of `text`, laid out for `font` and `width`."""
+    static = QStaticText(text)
+    static.setTextFormat(Qt.TextFormat.PlainText)
+    option = QTextOption(Qt.AlignmentFlag.AlignHCenter)
+    option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+    static.setTextOption(option)
+    static.setTextWidth(width)
+    static.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+    static.prepare(QTransform(), font)
+    return static
+
+
+class PreparedCard:
+    """A drawn card and its laid-out faces."""
+
+    __slots__ = ("key", "card", "_faces", "_faces_for")
+
+    def __init__(self, key, card):
+        self.key = key
+        self.card = card
+        self._faces = None
+        self._faces_for = None
+
+    def is_laid_out(self, reverse, font, width):
+        return self._faces_for == (reverse, font.key(), width)
+
+    def faces(self, reverse, font, width):
+        """(prompt, reveal) static texts; laid out again only if the direction, font or width changed."""
+        if not self.is_laid_out(reverse, font, width):
+            question, answer = self.card["question"], self.card["answer"]
+            if reverse:
+                question, answer = answer, question
+            self._faces = (lay_out(f"❓ {question}", font, width), lay_out(f"💡 {answer}", font, width))
+            self._faces_for = (reverse, font.key(), width)
+        return self._faces
+
+
+class CardPrefetcher(QObject):
+    """Prepares the cards after the current one while the UI thread is idle.
+
+    `stream` is anything with next_key() and card_for_key() (an
+    InterleavedStream or ViewStream); `reverse` is the session's
+    ReverseFlashcards.
+    """
+
+    def __init__(self, scheduler, reverse, font, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.reverse = reverse
+        self.font = font
+        self.width = 400
+        self.stream = None
+        self.queue = deque()          # new cards, in stream order
+        self.due = OrderedDict()      # key -> PreparedCard for upcoming reviews
+        self.exhausted = False
+        self.pace = None
+        self.hits = 0
+        self.misses = 0
+        self._started = None
+        self._current = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    def reset(self, stream):
+        """Start over on `stream`; None stops all preparation."""
+        self.stream = stream
+        self.queue.clear()
+        self.due.clear()
+        self.exhausted = False
+        self._started = None
+        self.schedule()
+
+    @property
+    def ahead(self):
+        """How many new cards to keep prepared at the current pace."""
+        if self.pace is None:
+            return DEFAULT_AHEAD
+        return max(MIN_AHEAD, min(MAX_AHEAD, math.ceil(LOOKAHEAD_SECONDS / max(self.pace, 0.1))))
+
+    def set_width(self, width):
+        if width != self.width:
+            self.width = width
+            self.schedule()
+
+    def faces(self, prepared):
+        return prepared.faces(self.reverse.reversed, self.font, self.width)
+
+    # ---------- drawing ----------
+
+    def next(self):
+        """The next card to show: overdue reviews first, then cards never seen."""
+        now = session_clock()
+        if self._started is not None:
+            sample = min(now - self._started, MAX_PACE_SAMPLE)
+            self.pace = sample if self.pace is None else self.pace + PACE_ALPHA * (sample - self.pace)
+        self._started = now
+        prepared = self._next()
+        self._current = None if prepared is None else prepared.key
+        self.schedule()
+        return prepared
+
+    def _next(self):
+        while True:
+            key = self.scheduler.next_due()
+            if key is None:
+                break
+            if key in self.due:
+                prepared = self.due.pop(key)
+                self.hits += prepared is not None
+            else:
+                prepared = self._prepare(key)
+                self.misses += prepared is not None
+            if prepared is not None:
+                return prepared
+            self.scheduler.remove(key)  # its deck was removed or rewritten
+
+        while self.queue:
+            prepared = self.queue.popleft()
+            if prepared.key not in self.scheduler:
+                self.hits += 1
+                return prepared
+        prepared = self._draw()
+        if prepared is not None:
+            self.misses += 1
+        return prepared
+
+    def _draw(self):
+        """Prepare the next stream card the scheduler does not know yet.
+
+        An InterleavedStream given the scheduler as `skip` never yields
+        such keys, so its run limit holds; the check here covers other
+        streams.
+        """
+        while not self.exhausted:
+            key = self.stream.next_key()
+            if key is None:
+                self.exhausted = True
+            elif key not in self.scheduler:
+                prepared = self._prepare(key)
+                if prepared is not None:
+                    return prepared
+        return None
+
+    def _prepare(self, key):
+        card = self.stream.card_for_key(key)
+        if card is None:
+            return None
+        prepared = PreparedCard(key, card)
+        self.faces(prepared)
+        return prepared
+
+    # ---------- idle work ----------
+
+    def schedule(self):
+        if self.stream is not None and not self._timer.isActive():
+            self._timer.start()
+
+    def _step(self):
+        """Do one unit of preparation, and come back while any is left."""
+        if self._work():
+            self._timer.start()
+
+    def _work(self):
+        if self.stream is None:
+            return False
+        # The review that would come next, or falls due within the look-ahead
+        key = self.scheduler.next_due(time.time() + LOOKAHEAD_SECONDS)
+        if key is not None and key != self._current and key not in self.due:
+            self.due[key] = self._prepare(key)   # None if stale; next() drops the key
+            while len(self.due) > DUE_CACHE:
+                self.due.popitem(last=False)
+            return True
+
+        # Faces laid out before a resize or a direction change
+        for prepared in (*self.due.values(), *self.queue):
+            if prepared is not None and not prepared.is_laid_out(self.reverse.reversed, self.font, self.width):
+                self.faces(prepared)
+                return True
+
+        if len(self.queue) < self.ahead and not self.exhausted:
+            prepared = self._draw()
+            if prepared is not None:
+                self.queue.append(prepared)
+                return True
+        return False
+
+
+class CardText(QWidget):
+    """Paints one prepared QStaticText, centred in the widget."""
+
+    resized = pyqtSignal(int)   # new text width
+
+    def __init__(self, font, parent=None):
+        super().__init__(parent)
+        self.setFont(font)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.static = QStaticText()
+
+    def text_width(self):
+        return max(1, self.width())
+
+    def setText(self, text):
+        self.setStaticText(lay_out(text, self.font(), self.text_width()))
+
+    def setStaticText(self, static):
+        self.static = static
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self):
+        return QSize(400, max(60, math.ceil(self.static.size().height())))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if event.size().width() != event.oldSize().width():
+            self.resized.emit(self.text_width())
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setFont(self.font())   # the font the text was prepared with
+        size = self.static.size()
+        painter.drawStaticText(
+            QPointF((self.width() - size.width()) / 2, (self.height() - size.height()) / 2), self.static
+        )
+        painter.end()
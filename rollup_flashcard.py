@@ -0,0 +1,266 @@
+# rollup_flashcard.py
+"""Rolling review aggregates, updated in O(1) per event.
+
+A Rollup holds counts, accuracy and streaming latency quantiles (P²
+estimators: five markers each, no samples kept) for one bucket. Rollups
+keeps one bucket for all time, one per local day and ISO week, and one
+per topic. It also keeps the retention and latency histograms and the
+study streak, so the Statistics page reads finished numbers instead of
+scanning history.
+
+The state is saved next to the profile's telemetry with the number of
+events it has folded in. On open, events logged after the last save
+(e.g. before a crash) are replayed from the telemetry columns.
+"""
+import json
+import os
+import time
+
+from scheduler_flashcard import AGAIN
+from telemetry_flashcard import GRADE, NEXT, RETENTION_BINS, LATENCY_BINS, _bin, local_day
+
+ROLLUPS_FILE = "rollups.json"
+ROLLUPS_VERSION = 1
+DAYS_KEPT = 120
+WEEKS_KEPT = 104
+
+
+class P2Quantile:
+    """Jain & Chlamtac's P² estimate of quantile `p` in constant memory."""
+
+    __slots__ = ("p", "heights", "positions", "desired")
+
+    def __init__(self, p, state=None):
+        self.p = p
+        if state is None:
+            self.heights, self.positions, self.desired = [], [0, 1, 2, 3, 4], [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        else:
+            self.heights, self.positions, self.desired = state
+
+    def state(self):
+        return [self.heights, self.positions, self.desired]
+
+    def add(self, x):
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        p = self.p
+        for i, step in enumerate((0, p / 2, p, (1 + p) / 2, 1)):
+            self.desired[i] += step
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # Piecewise-parabolic prediction, linear if it would break the order
+                guess = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < guess < q[i + 1]:
+                    guess = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = guess
+                n[i] += d
+
+    def value(self):
+        q = self.heights
+        if not q:
+            return None
+        if len(q) < 5:
+            return q[min(len(q) - 1, int(self.p * len(q)))]
+        return q[2]
+
+
+class Rollup:
+    """Aggregates of one bucket (a day, a week, a topic or all time)."""
+
+    __slots__ = ("reviews", "correct", "timed", "latency_sum", "median", "p90")
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.reviews = state.get("reviews", 0)
+        self.correct = state.get("correct", 0)
+        self.timed = state.get("timed", 0)
+        self.latency_sum = state.get("latency_sum", 0.0)
+        self.median = P2Quantile(0.5, state.get("median"))
+        self.p90 = P2Quantile(0.9, state.get("p90"))
+
+    def state(self):
+        return {"reviews": self.reviews, "correct": self.correct, "timed": self.timed,
+                "latency_sum": self.latency_sum, "median": self.median.state(), "p90": self.p90.state()}
+
+    def add(self, kind, grade, latency):
+        if kind != NEXT:
+            self.timed += 1
+            self.latency_sum += latency
+            self.median.add(latency)
+            self.p90.add(latency)
+        if kind == GRADE:
+            self.reviews += 1
+            self.correct += grade != AGAIN
+
+    @property
+    def accuracy(self):
+        return self.correct / self.reviews if self.reviews else None
+
+    @property
+    def mean_latency(self):
+        return self.latency_sum / self.timed if self.timed else None
+
+
+class Rollups:
+    """Every rolling aggregate of one profile; see the module docstring."""
+
+    def __init__(self, folder):
+        self.path = os.path.join(folder, ROLLUPS_FILE)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != ROLLUPS_VERSION:
+                state = {}
+        except (OSError, ValueError):
+            state = {}
+        self._load(state)
+
+    def _load(self, state):
+        self.events = state.get("events", 0)
+        self.total = Rollup(state.get("total"))
+        self.daily = {int(day): Rollup(s) for day, s in state.get("daily", {}).items()}
+        self.weekly = {int(week): Rollup(s) for week, s in state.get("weekly", {}).items()}
+        self.topics = {topic: Rollup(s) for topic, s in state.get("topics", {}).items()}
+        self.retention_seen = state.get("retention_seen", [0] * len(RETENTION_BINS))
+        self.retention_kept = state.get("retention_kept", [0] * len(RETENTION_BINS))
+        self.latency_counts = state.get("latency_counts", [0] * len(LATENCY_BINS))
+        self.last_day = state.get("last_day")
+        self.run = state.get("run", 0)
+        self.longest_streak = state.get("longest_streak", 0)
+        self.study_days = state.get("study_days", 0)
+
+    def reset(self):
+        self._load({})
+
+    # ---------- updating ----------
+
+    def add(self, wall, kind, grade, latency, topic, since):
+        """Fold one event in; O(1) apart from dropping expired buckets on a new day."""
+        self.events += 1
+        day = local_day(wall)
+        week = day - (day + 3) % 7     # day 0 (1970-01-01) was a Thursday; weeks start Monday
+        self._bucket(self.daily, day, DAYS_KEPT).add(kind, grade, latency)
+        self._bucket(self.weekly, week, WEEKS_KEPT * 7).add(kind, grade, latency)
+        topic_rollup = self.topics.get(topic)
+        if topic_rollup is None:
+            topic_rollup = self.topics[topic] = Rollup()
+        topic_rollup.add(kind, grade, latency)
+        self.total.add(kind, grade, latency)
+
+        if kind != NEXT:
+            self.latency_counts[_bin(LATENCY_BINS, latency)] += 1
+        if kind == GRADE and since >= 0:
+            i = _bin(RETENTION_BINS, since)
+            self.retention_seen[i] += 1
+            self.retention_kept[i] += grade != AGAIN
+
+        if self.last_day is None or day > self.last_day:
+            self.run = self.run + 1 if self.last_day == day - 1 else 1
+            self.longest_streak = max(self.longest_streak, self.run)
+            self.study_days += 1
+            self.last_day = day
+
+    @staticmethod
+    def _bucket(buckets, key, keep):
+        rollup = buckets.get(key)
+        if rollup is None:
+            rollup = buckets[key] = Rollup()
+            for old in [k for k in buckets if k <= key - keep]:
+                del buckets[old]
+        return rollup
+
+    def catch_up(self, store):
+        """Fold in events the store has that these aggregates have not seen."""
+        stored = store.stored_count()
+        if self.events > stored:
+            self.reset()  # the log was cleared or trimmed: start over
+        if self.events == stored:
+            return 0
+        columns = store.columns(self.events, stored)
+        topics = store.topics
+        start = self.events
+        for wall, kind, grade, latency, topic, since in zip(
+                columns["wall"], columns["kind"], columns["grade"], columns["latency"],
+                columns["topic"], columns["since"]):
+            self.add(float(wall), int(kind), int(grade), float(latency), topics[topic], float(since))
+        return self.events - start
+
+    def save(self):
+        state = {
+            "version": ROLLUPS_VERSION, "events": self.events, "total": self.total.state(),
+            "daily": {day: r.state() for day, r in self.daily.items()},
+            "weekly": {week: r.state() for week, r in self.weekly.items()},
+            "topics": {topic: r.state() for topic, r in self.topics.items()},
+            "retention_seen": self.retention_seen, "retention_kept": self.retention_kept,
+            "latency_counts": self.latency_counts, "last_day": self.last_day, "run": self.run,
+            "longest_streak": self.longest_streak, "study_days": self.study_days,
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    # ---------- reading ----------
+
+    def today(self, now=None):
+        return self.daily.get(self._day(now)) or Rollup()
+
+    def this_week(self, now=None):
+        day = self._day(now)
+        return self.weekly.get(day - (day + 3) % 7) or Rollup()
+
+    @staticmethod
+    def _day(now=None):
+        return local_day(time.time() if now is None else now)
+
+    def current_streak(self, now=None):
+        if self.last_day is None or self.last_day < self._day(now) - 1:
+            return 0
+        return self.run
+
+    def summary(self, now=None):
+        """The Statistics page's numbers."""
+        return RollupSummary(self, now)
+
+
+class RollupSummary:
+    """Read-only view of Rollups for the Statistics page."""
+
+    def __init__(self, rollups, now=None):
+        total = rollups.total
+        self.events = rollups.events
+        self.reviews = total.reviews
+        self.accuracy = total.accuracy
+        self.median_latency = total.median.value()
+        self.p90_latency = total.p90.value()
+        self.topic_accuracy = sorted(
+            (topic, r.reviews, r.accuracy) for topic, r in rollups.topics.items() if r.reviews)
+        self.retention = [
+            (edge, seen, kept / seen if seen else None)
+            for edge, seen, kept in zip(RETENTION_BINS, rollups.retention_seen, rollups.retention_kept)
+        ]
+        self.latency_histogram = list(zip(LATENCY_BINS, rollups.latency_counts))
+        self.longest_streak = rollups.longest_streak
+        self.current_streak = rollups.current_streak(now)
+        self.study_days = rollups.study_days
+        self.today = rollups.today(now)
+        self.this_week = rollups.this_week(now)
@@ -0,0 +1,173 @@
+# scheduler_flashcard.py
+import heapq
+import time
+
+DAY = 86400.0
+
+AGAIN, HARD, GOOD, EASY = range(4)
+GRADE_NAMES = ("Again", "Hard", "Good", "Easy")
+
+START_EASE = 2.5
+MIN_EASE = 1.3
+RELEARN_INTERVAL = 10 * 60 / DAY  # 10 minutes, in days
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedule (
+    queue TEXT NOT NULL,
+    key TEXT NOT NULL,
+    ease REAL NOT NULL,
+    interval REAL NOT NULL,
+    due REAL NOT NULL,
+    reps INTEGER NOT NULL,
+    lapses INTEGER NOT NULL,
+    PRIMARY KEY (queue, key)
+);
+"""
+SQL_LOAD = "SELECT key, ease, interval, due, reps, lapses FROM schedule WHERE queue = ?"
+SQL_SAVE = (
+    "INSERT OR REPLACE INTO schedule (queue, key, ease, interval, due, reps, lapses) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_REMOVE = "DELETE FROM schedule WHERE queue = ? AND key = ?"
+
+
+def card_key(source, ident):
+    """Scheduler key of a card: its deck file or topic plus its id within it."""
+    return f"{source}#{ident}"
+
+
+class CardState:
+    """SM-2 review state of one card. `interval` is in days, `due` is epoch seconds."""
+
+    __slots__ = ("ease", "interval", "due", "reps", "lapses")
+
+    def __init__(self, ease=START_EASE, interval=0.0, due=0.0, reps=0, lapses=0):
+        self.ease = ease
+        self.interval = interval
+        self.due = due
+        self.reps = reps
+        self.lapses = lapses
+
+
+def review(state, grade, now):
+    """Apply one SM-2 style review to `state` in place."""
+    if grade == AGAIN:
+        state.reps = 0
+        state.lapses += 1
+        state.ease = max(MIN_EASE, state.ease - 0.2)
+        state.interval = RELEARN_INTERVAL
+    elif grade == HARD:
+        state.ease = max(MIN_EASE, state.ease - 0.15)
+        state.interval = max(1.0, state.interval * 1.2)
+        state.reps += 1
+    else:
+        if state.reps == 0:
+            interval = 1.0
+        elif state.reps == 1:
+            interval = 6.0
+        else:
+            interval = state.interval * state.ease
+        if grade == EASY:
+            state.ease += 0.15
+            interval *= 1.3
+        state.interval = interval
+        state.reps += 1
+    state.due = now + state.interval * DAY
+    return state
+
+
+class Scheduler:
+    """Spaced-repetition scheduler with a min-heap of due times.
+
+    Cards are identified by any string key; `queue` keeps independent study
+    flows (card grids, deck practice) apart in the same table. Re-grading a
+    card pushes a new heap entry and leaves the old one behind; stale entries
+    are skipped when they reach the top and the heap is rebuilt once they
+    outnumber live ones.
+    """
+
+    def __init__(self, store=None, queue="cards"):
+        self.store = store
+        self.queue = queue
+        self.cards = {}
+        self.heap = []  # (due, key)
+        if store is not None:
+            store.conn.executescript(SCHEMA)
+            for key, ease, interval, due, reps, lapses in store.conn.execute(SQL_LOAD, (queue,)):
+                self.cards[key] = CardState(ease, interval, due, reps, lapses)
+            self.heap = [(state.due, key) for key, state in self.cards.items()]
+            heapq.heapify(self.heap)
+
+    def __contains__(self, key):
+        return key in self.cards
+
+    def __len__(self):
+        return len(self.cards)
+
+    def add(self, key, now=None):
+        """Start scheduling a new card; it is due immediately."""
+        if key in self.cards:
+            return self.cards[key]
+        state = CardState(due=time.time() if now is None else now)
+        self.cards[key] = state
+        heapq.heappush(self.heap, (state.due, key))
+        self._persist(key, state)
+        return state
+
+    def grade(self, key, grade, now=None):
+        now = time.time() if now is None else now
+        state = self.cards.get(key) or self.add(key, now)
+        review(state, grade, now)
+        heapq.heappush(self.heap, (state.due, key))
+        self._persist(key, state)
+        if len(self.heap) > 2 * len(self.cards) + 64:
+            self._rebuild()
+        return state
+
+    def since_review(self, key, now=None):
+        """Days since `key` was last reviewed, or -1.0 if it never was."""
+        state = self.cards.get(key)
+        if state is None or (state.reps == 0 and state.lapses == 0):
+            return -1.0
+        now = time.time() if now is None else now
+        return max(0.0, (now - (state.due - state.interval * DAY)) / DAY)
+
+    def remove(self, key):
+        """Stop scheduling a card (e.g. its deck was deleted)."""
+        if self.cards.pop(key, None) is not None and self.store is not None:
+            with self.store.conn:
+                self.store.conn.execute(SQL_REMOVE, (self.queue, key))
+
+    def _live(self, entry):
+        due, key = entry
+        state = self.cards.get(key)
+        return state is not None and state.due == due
+
+    def _drop_stale(self):
+        while self.heap and not self._live(self.heap[0]):
+            heapq.heappop(self.heap)
+
+    def next_due(self, now=None):
+        """Key of the most overdue card, or None if nothing is due yet."""
+        now = time.time() if now is None else now
+        self._drop_stale()
+        if self.heap and self.heap[0][0] <= now:
+            return self.heap[0][1]
+        return None
+
+    def due_count(self, now=None):
+        now = time.time() if now is None else now
+        return sum(1 for state in self.cards.values() if state.due <= now)
+
+    def _rebuild(self):
+        self.heap = [(state.due, key) for key, state in self.cards.items()]
+        heapq.heapify(self.heap)
+
+    def _persist(self, key, state):
+        if self.store is None:
+            return
+        with self.store.conn:
+            self.store.conn.execute(
+                SQL_SAVE,
+                (self.queue, key, state.ease, state.interval, state.due, state.reps, state.lapses),
+            )
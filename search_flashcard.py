@@ -0,0 +1,235 @@
+# search_flashcard.py
+"""Full-text search over every card source, backed by SQLite FTS5.
+
+User cards are indexed by `cards_fts`, an external-content table kept in
+step with `cards` by triggers, so save_flashcard, the import jobs and any
+other writer update the index in the same transaction. Built-in topic
+cards and flashcards_data decks go into `extra_fts`; each source owns a
+block of rowids and is re-indexed only when its digest changes.
+"""
+import difflib
+import hashlib
+import os
+import re
+
+from deck_loader_flashcard import scan_deck
+from scheduler_flashcard import card_key
+
+RESULT_LIMIT = 20
+FUZZY_CUTOFF = 0.75
+FUZZY_ALTERNATIVES = 3
+MIN_FUZZY_LENGTH = 3       # shorter words are matched by prefix only
+BLOCK_BITS = 32            # rowid = source block << 32 | card index
+TOPIC_SOURCE = "topic"     # built-in topic page cards
+DECK_SOURCE = "deck"       # flashcards_data decks
+QUESTION_WEIGHT = 2.0
+ANSWER_WEIGHT = 1.0
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+    question, answer, content='cards', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards BEGIN
+    INSERT INTO cards_fts(rowid, question, answer) VALUES (new.id, new.question, new.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards BEGIN
+    INSERT INTO cards_fts(cards_fts, rowid, question, answer)
+    VALUES ('delete', old.id, old.question, old.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF question, answer ON cards BEGIN
+    INSERT INTO cards_fts(cards_fts, rowid, question, answer)
+    VALUES ('delete', old.id, old.question, old.answer);
+    INSERT INTO cards_fts(rowid, question, answer) VALUES (new.id, new.question, new.answer);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS extra_fts USING fts5(
+    key UNINDEXED, question, answer,
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TABLE IF NOT EXISTS extra_sources (
+    name TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    block INTEGER NOT NULL UNIQUE,
+    digest BLOB NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS cards_vocab USING fts5vocab(cards_fts, 'row');
+CREATE VIRTUAL TABLE IF NOT EXISTS extra_vocab USING fts5vocab(extra_fts, 'row');
+"""
+
+SQL_SEARCH = f"""
+SELECT key, question, answer FROM (
+    SELECT * FROM (
+        SELECT 'db#' || rowid AS key, question, answer,
+               bm25(cards_fts, {QUESTION_WEIGHT}, {ANSWER_WEIGHT}) AS score
+        FROM cards_fts WHERE cards_fts MATCH :q ORDER BY score LIMIT :limit)
+    UNION ALL
+    SELECT * FROM (
+        SELECT key, question, answer,
+               bm25(extra_fts, 0.0, {QUESTION_WEIGHT}, {ANSWER_WEIGHT}) AS score
+        FROM extra_fts WHERE extra_fts MATCH :q ORDER BY score LIMIT :limit)
+) ORDER BY score LIMIT :limit
+"""
+SQL_VOCAB = (
+    "SELECT term FROM cards_vocab WHERE term >= :lo AND term < :hi "
+    "UNION SELECT term FROM extra_vocab WHERE term >= :lo AND term < :hi"
+)
+SQL_HAS_TERM = (
+    "SELECT 1 FROM cards_vocab WHERE term >= :lo AND term < :hi "
+    "UNION ALL SELECT 1 FROM extra_vocab WHERE term >= :lo AND term < :hi LIMIT 1"
+)
+
+_WORD = re.compile(r"\w+")
+
+
+def ensure_schema(conn):
+    """Create the index tables; back-fill cards_fts the first time."""
+    with conn:
+        fresh = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'cards_fts'"
+        ).fetchone() is None
+        conn.executescript(SCHEMA)
+        if fresh:
+            conn.execute("INSERT INTO cards_fts(cards_fts) VALUES ('rebuild')")
+
+
+def cards_digest(cards):
+    h = hashlib.blake2b(digest_size=16)
+    for question, answer in cards:
+        h.update(question.encode("utf-8") + b"\x1f" + answer.encode("utf-8") + b"\x1e")
+    return h.digest()
+
+
+def sync_source(conn, kind, name, digest, cards):
+    """Replace the indexed cards of source `name` unless `digest` is unchanged.
+
+    `cards` is an iterable (or a callable returning one) of (question,
+    answer); card i gets the scheduler key card_key(name, i). Returns
+    True if the source was re-indexed.
+    """
+    row = conn.execute("SELECT block, digest FROM extra_sources WHERE name = ?", (name,)).fetchone()
+    if row is not None and row[1] == digest:
+        return False
+    with conn:
+        if row is None:
+            block = conn.execute("SELECT COALESCE(MAX(block), 0) + 1 FROM extra_sources").fetchone()[0]
+            conn.execute("INSERT INTO extra_sources VALUES (?, ?, ?, ?)", (name, kind, block, digest))
+        else:
+            block = row[0]
+            _delete_block(conn, block)
+            conn.execute("UPDATE extra_sources SET digest = ? WHERE name = ?", (digest, name))
+        base = block << BLOCK_BITS
+        conn.executemany(
+            "INSERT INTO extra_fts(rowid, key, question, answer) VALUES (?, ?, ?, ?)",
+            ((base + i, card_key(name, i), q, a)
+             for i, (q, a) in enumerate(cards() if callable(cards) else cards)),
+        )
+    return True
+
+
+def drop_sources(conn, kind, keep):
+    """Remove indexed sources of `kind` whose names are not in `keep`."""
+    rows = conn.execute("SELECT name, block FROM extra_sources WHERE kind = ?", (kind,))
+    gone = [(name, block) for name, block in rows if name not in keep]
+    with conn:
+        for name, block in gone:
+            _delete_block(conn, block)
+            conn.execute("DELETE FROM extra_sources WHERE name = ?", (name,))
+    return [name for name, _ in gone]
+
+
+def _delete_block(conn, block):
+    lo = block << BLOCK_BITS
+    conn.execute("DELETE FROM extra_fts WHERE rowid >= ? AND rowid < ?", (lo, lo + (1 << BLOCK_BITS)))
+
+
+def index_topics(conn, topic_cards):
+    """Index the built-in {topic: [(q, a), ...]} sets."""
+    for topic, cards in topic_cards.items():
+        sync_source(conn, TOPIC_SOURCE, topic, cards_digest(cards), cards)
+    return drop_sources(conn, TOPIC_SOURCE, set(topic_cards))
+
+
+def index_decks(conn, manifest, cancelled=None):
+    """Index flashcards_data decks, re-reading only decks whose digest changed.
+
+    Call after manifest.refresh(). Card i matches the manifest index (as
+    drawn by interleave_flashcard), so result keys are scheduler keys.
+    `cancelled()` is checked between decks; a cancelled run leaves stale
+    sources in place for the next one.
+    """
+    def deck_cards(path):
+        for _offset, _length, card in scan_deck(path):
+            yield str(card.get("question", "")), str(card.get("answer", ""))
+
+    names = manifest.names
+    for name in names:
+        if cancelled is not None and cancelled():
+            return 0
+        path = os.path.join(manifest.folder, name)
+        sync_source(conn, DECK_SOURCE, name, manifest.entries[name].digest, lambda p=path: deck_cards(p))
+    return drop_sources(conn, DECK_SOURCE, set(names))
+
+
+def _escape(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+class SearchIndex:
+    """Ranked prefix search with a fuzzy fallback for misspelt words."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        ensure_schema(conn)
+
+    def search(self, text, limit=RESULT_LIMIT):
+        """Return up to `limit` (key, question, answer), best match first.
+
+        Every word must match as a prefix (single letters must match
+        exactly). Every match is ranked; each table keeps only its best
+        `limit` while sorting, and the two are merged. If fewer than
+        `limit` cards match, words with no indexed prefix are widened to
+        close vocabulary terms (difflib ratio) and the query is run again.
+        """
+        words = [w.lower() for w in _WORD.findall(text)]
+        if not words or sum(map(len, words)) < 2:
+            return []
+        results = self._run(" AND ".join(self._prefix(w) for w in words), limit)
+        if len(results) >= limit:
+            return results
+
+        clauses, widened = [], False
+        for word in words:
+            options = [self._prefix(word)]
+            if len(word) >= MIN_FUZZY_LENGTH and not self._has_prefix(word):
+                options += [_escape(t) for t in self._close_terms(word)]
+                widened = True
+            clauses.append("(" + " OR ".join(options) + ")")
+        if not widened:
+            return results
+        seen = {key for key, _, _ in results}
+        for hit in self._run(" AND ".join(clauses), limit):
+            if hit[0] not in seen and len(results) < limit:
+                results.append(hit)
+        return results
+
+    @staticmethod
+    def _prefix(word):
+        # One-letter prefixes are not in the prefix index and match nearly everything
+        return _escape(word) + ("*" if len(word) > 1 else "")
+
+    def _run(self, query, limit):
+        params = {"q": query, "limit": limit}
+        return self.conn.execute(SQL_SEARCH, params).fetchall()
+
+    def _has_prefix(self, word):
+        bounds = {"lo": word, "hi": word + "\U0010ffff"}
+        return self.conn.execute(SQL_HAS_TERM, bounds).fetchone() is not None
+
+    def _close_terms(self, word):
+        # Candidates share the first letter (typos rarely hit it) and are
+        # within two characters of the word's length.
+        first = word[0]
+        bounds = {"lo": first, "hi": chr(ord(first) + 1)}
+        terms = [t for (t,) in self.conn.execute(SQL_VOCAB, bounds) if abs(len(t) - len(word)) <= 2]
+        return difflib.get_close_matches(word, terms, n=FUZZY_ALTERNATIVES, cutoff=FUZZY_CUTOFF)
+
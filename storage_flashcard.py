@@ -0,0 +1,132 @@
+# storage_flashcard.py
+import sqlite3
+import time
+
+DB_PATH = "remora.db"
+DEFAULT_TOPIC = "custom"
+
+# AUTOINCREMENT: ids are never reused, because review state, telemetry and
+# search results refer to a card as "db#<id>" after it is deleted or merged
+CARDS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+SCHEMA = CARDS_TABLE.format(name="cards") + """
+CREATE INDEX IF NOT EXISTS idx_cards_topic ON cards(topic, id);
+"""
+
+# Statements are module constants so sqlite3's statement cache reuses
+# the prepared form on every call instead of re-parsing the SQL.
+SQL_INSERT = "INSERT INTO cards (topic, question, answer, created) VALUES (?, ?, ?, ?)"
+SQL_UPDATE = "UPDATE cards SET question = ?, answer = ? WHERE id = ?"
+SQL_DELETE = "DELETE FROM cards WHERE id = ?"
+SQL_GET = "SELECT id, topic, question, answer FROM cards WHERE id = ?"
+SQL_COUNT = "SELECT COUNT(*) FROM cards WHERE topic = ?"
+SQL_PAGE = (
+    "SELECT id, question, answer FROM cards "
+    "WHERE topic = ? AND id > ? ORDER BY id LIMIT ?"
+)
+SQL_ID_AFTER = "SELECT id FROM cards WHERE topic = ? AND id > ? ORDER BY id LIMIT 1 OFFSET ?"
+SQL_TOPICS = "SELECT DISTINCT topic FROM cards ORDER BY topic"
+
+# Highest card id any table may still refer to, for stores made before AUTOINCREMENT
+SQL_IDS_IN_USE = {
+    "removed_cards": "SELECT MAX(id) FROM removed_cards",
+    "schedule": "SELECT MAX(CAST(substr(key, 4) AS INTEGER)) FROM schedule WHERE key LIKE 'db#%'",
+}
+
+
+class CardStore:
+    """SQLite (WAL) card storage. Cards are read a page at a time, never a whole deck."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, cached_statements=256)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is durable in WAL mode except for the last commit on power loss
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def _migrate(self):
+        """Rebuild a cards table made without AUTOINCREMENT, keeping ids and triggers."""
+        row = self.conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'cards'").fetchone()
+        if row is None or "AUTOINCREMENT" in row[0].upper():
+            return
+        triggers = [sql for (sql,) in self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'cards'")]
+        tables = {name for (name,) in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        used = [self.conn.execute(sql).fetchone()[0] for name, sql in SQL_IDS_IN_USE.items() if name in tables]
+        # Deleted cards above the current maximum must not get their ids back either
+        last = int(max([n for n in used if n is not None], default=0))
+        script = "".join((
+            "BEGIN;",
+            CARDS_TABLE.format(name="cards_new"),
+            "INSERT INTO cards_new SELECT id, topic, question, answer, created FROM cards;",
+            "DROP TABLE cards;",
+            "ALTER TABLE cards_new RENAME TO cards;",
+            *(sql + ";" for sql in triggers),
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT 'cards', {last} "
+            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'cards');",
+            f"UPDATE sqlite_sequence SET seq = MAX(seq, {last}) WHERE name = 'cards';",
+            "COMMIT;",
+        ))
+        try:
+            self.conn.executescript(script)
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    def add_card(self, question, answer, topic=DEFAULT_TOPIC):
+        """Insert one card and return its id."""
+        with self.conn:
+            cur = self.conn.execute(SQL_INSERT, (topic, question, answer, time.time()))
+        return cur.lastrowid
+
+    def add_cards(self, pairs, topic=DEFAULT_TOPIC):
+        """Insert many (question, answer) pairs in a single transaction; returns their ids."""
+        now = time.time()
+        insert = self.conn.execute
+        with self.conn:
+            return [insert(SQL_INSERT, (topic, q, a, now)).lastrowid for q, a in pairs]
+
+    def update_card(self, card_id, question, answer):
+        with self.conn:
+            self.conn.execute(SQL_UPDATE, (question, answer, card_id))
+
+    def delete_card(self, card_id):
+        with self.conn:
+            self.conn.execute(SQL_DELETE, (card_id,))
+
+    def get_card(self, card_id):
+        """Return (id, topic, question, answer) or None."""
+        return self.conn.execute(SQL_GET, (card_id,)).fetchone()
+
+    def count(self, topic=DEFAULT_TOPIC):
+        return self.conn.execute(SQL_COUNT, (topic,)).fetchone()[0]
+
+    def page(self, topic=DEFAULT_TOPIC, after_id=0, limit=50):
+        """Keyset page: up to `limit` (id, question, answer) rows with id > after_id."""
+        return self.conn.execute(SQL_PAGE, (topic, after_id, limit)).fetchall()
+
+    def id_after(self, topic=DEFAULT_TOPIC, after_id=0, skip=0):
+        """Id of the card `skip` places past the first one with id > after_id, or None.
+
+        Walks only the (topic, id) index, never card text, so a jump to a
+        far page costs an index scan once; page() then continues by key.
+        """
+        row = self.conn.execute(SQL_ID_AFTER, (topic, after_id, skip)).fetchone()
+        return row[0] if row else None
+
+    def topics(self):
+        return [row[0] for row in self.conn.execute(SQL_TOPICS)]
+
+    def close(self):
+        self.conn.close()
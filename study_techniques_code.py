@@ -2,22 +2,72 @@
 # techniques/pomodoro_timer.py
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QObject, QTimer, Qt
 from PyQt6.QtGui import QFont
+from timing_flashcard import Countdown, TimerHub, session_clock
+
+WAKEUP_SLACK_MS = 5  # coarse timers may fire a little early
+
+
+class HubDriver(QObject):
+    """Runs a TimerHub off one coarse single-shot QTimer, re-armed for the
+    next moment any watched countdown changes its displayed value."""
+
+    def __init__(self, hub=None):
+        super().__init__()
+        self.hub = hub or TimerHub()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self.timer.timeout.connect(self.tick)
+
+    def watch(self, countdown, on_change, on_expire):
+        self.hub.watch(countdown, on_change, on_expire)
+        self.schedule()
+
+    def unwatch(self, countdown):
+        self.hub.unwatch(countdown)
+        self.schedule()
+
+    def tick(self):
+        self.hub.tick()
+        self.schedule()
+
+    def schedule(self):
+        wait = self.hub.next_wakeup()
+        if wait is None:
+            self.timer.stop()
+        else:
+            self.timer.start(int(wait * 1000) + WAKEUP_SLACK_MS)
+
+
+_shared_driver = None
+
+
+def shared_driver():
+    """One driver for every timer widget in the process."""
+    global _shared_driver
+    if _shared_driver is None:
+        _shared_driver = HubDriver()
+    return _shared_driver
+
 
 class PomodoroTimer(QWidget):
-    def __init__(self):
+    def __init__(self, driver=None):
         super().__init__()
 
         self.study_duration = 30 * 60  # 30 minutes
         self.break_duration = 10 * 60  # 10 minutes
-        self.time_left = self.study_duration
+        self.countdown = Countdown(self.study_duration)
         self.is_study_time = True
         self.is_running = False
+        self.driver = driver or shared_driver()
 
         self.init_ui()
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_timer)
+
+    @property
+    def time_left(self):
+        return self.countdown.display_seconds()
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -60,57 +110,76 @@ class PomodoroTimer(QWidget):
 
     def toggle_timer(self):
         if self.is_running:
-            self.timer.stop()
+            self.countdown.pause()
+            self.driver.unwatch(self.countdown)
             self.start_btn.setText("Start")
         else:
-            self.timer.start(1000)
+            self.countdown.start()
+            self.driver.watch(self.countdown, self.update_timer, self.finish_session)
             self.start_btn.setText("Pause")
         self.is_running = not self.is_running
 
-    def update_timer(self):
-        if self.time_left > 0:
-            self.time_left -= 1
-            self.timer_display.setText(self.format_time(self.time_left))
-        else:
-            self.timer.stop()
-            self.is_running = False
-            self.start_btn.setText("Start")
-            self.switch_mode()
+    def update_timer(self, seconds):
+        # Called only when the displayed value changes
+        self.timer_display.setText(self.format_time(seconds))
+
+    def finish_session(self):
+        self.is_running = False
+        self.start_btn.setText("Start")
+        self.switch_mode()
 
     def switch_mode(self):
         if self.is_study_time:
-            self.time_left = self.break_duration
+            self.countdown.reset(self.break_duration)
             self.status_label.setText("Break Time (Flashcards Paused)")
         else:
-            self.time_left = self.study_duration
+            self.countdown.reset(self.study_duration)
             self.status_label.setText("Study Time")
         self.is_study_time = not self.is_study_time
         self.timer_display.setText(self.format_time(self.time_left))
 
     def reset_timer(self):
-        self.timer.stop()
+        self.driver.unwatch(self.countdown)
         self.is_running = False
         self.start_btn.setText("Start")
-        self.time_left = self.study_duration if self.is_study_time else self.break_duration
+        self.countdown.reset(self.study_duration if self.is_study_time else self.break_duration)
         self.timer_display.setText(self.format_time(self.time_left))
 
 # techniques/interleaved_practice.py
 
-import random
-import json
-import os
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from deck_loader_flashcard import DECK_FOLDER
+from deck_manifest_flashcard import DeckManifest
+from interleave_flashcard import InterleavedStream
+from scheduler_flashcard import Scheduler, GOOD, GRADE_NAMES
+from storage_flashcard import CardStore
+from cards_flashcard import ViewStream
+from telemetry_flashcard import FLIP, GRADE, NEXT
+from prefetch_flashcard import CardPrefetcher, CardText
 
 
 class InterleavedPractice(QWidget):
-    def __init__(self):
+    def __init__(self, scheduler=None, cards=None, telemetry=None):
+        """`cards` is an optional DeckView to practise; by default every
+        deck in flashcards_data is used. Flips, grades and Next presses go
+        to `telemetry` (a TelemetryStore) when one is given."""
         super().__init__()
         self.setWindowTitle("Interleaved Practice")
-        self.deck = []
+        self.deck = None
+        self.current = None
+        self.current_key = None
+        self.prepared = None
         self.current_index = 0
         self.showing_answer = False
+        self.cards = cards
+        self.telemetry = telemetry
+        self.shown_at = session_clock()
+        self.reverse = ReverseFlashcards()
+        self.scheduler = scheduler if scheduler is not None else Scheduler(CardStore(), queue="decks")
+        # Lays out the next cards while the current one is read
+        self.prefetcher = CardPrefetcher(self.scheduler, self.reverse, QFont("Arial", 28), parent=self)
 
         self.init_ui()
         self.load_flashcards()
@@ -120,55 +189,115 @@ class InterleavedPractice(QWidget):
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.flashcard_label = QLabel("")
-        self.flashcard_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.flashcard_label.setFont(QFont("Arial", 28))
-        self.flashcard_label.setWordWrap(True)
+        self.flashcard_label = CardText(self.prefetcher.font)
+        self.flashcard_label.resized.connect(self.resize_card)
 
         self.next_btn = QPushButton("Next")
         self.next_btn.setFixedWidth(200)
         self.next_btn.setFont(QFont("Arial", 18))
         self.next_btn.clicked.connect(self.next_card)
 
+        self.reverse_btn = QPushButton("⇄ Reverse")
+        self.reverse_btn.setCheckable(True)
+        self.reverse_btn.setFont(QFont("Arial", 14))
+        self.reverse_btn.toggled.connect(self.toggle_reverse)
+
+        # Grade buttons, shown with the answer
+        grade_layout = QHBoxLayout()
+        self.grade_btns = []
+        for grade, name in enumerate(GRADE_NAMES):
+            btn = QPushButton(name)
+            btn.setFont(QFont("Arial", 16))
+            btn.clicked.connect(lambda _, g=grade: self.grade_card(g))
+            btn.hide()
+            grade_layout.addWidget(btn)
+            self.grade_btns.append(btn)
+
         layout.addWidget(self.flashcard_label)
+        layout.addLayout(grade_layout)
         layout.addWidget(self.next_btn, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.reverse_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         self.setLayout(layout)
 
     def load_flashcards(self):
-        folder = "flashcards_data"
-        combined_deck = []
-
-        # Load all .json files in the folder
-        for file in os.listdir(folder):
-            if file.endswith(".json"):
-                path = os.path.join(folder, file)
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    combined_deck.extend(data)
-
-        random.shuffle(combined_deck)
-        self.deck = combined_deck
+        self.close_deck()
+        if self.cards is not None:
+            self.deck = ViewStream(self.cards)
+        else:
+            # Only decks changed since the last run are re-parsed. Decks are
+            # then mixed by weight, and each card is decoded from its cached
+            # byte offsets only when drawn
+            manifest = DeckManifest(DECK_FOLDER)
+            manifest.refresh()
+            # Cards already scheduled come back as due reviews, not as new cards
+            self.deck = InterleavedStream.from_manifest(manifest, skip=self.scheduler.__contains__)
+        self.prefetcher.reset(self.deck)
+        self.advance()
+
+    def close_deck(self):
+        # Only a stream built here is ours to close; `cards` belongs to the caller
+        self.prefetcher.reset(None)
+        if isinstance(self.deck, InterleavedStream):
+            self.deck.close()
+        self.deck = None
+
+    def closeEvent(self, event):
+        self.close_deck()
+        super().closeEvent(event)
+
+    def advance(self):
+        """Pick the next card: overdue reviews first, then cards never seen."""
+        self.prepared = self.prefetcher.next()
+        self.current_key = None if self.prepared is None else self.prepared.key
+        self.current = None if self.prepared is None else self.prepared.card
 
     def show_flashcard(self):
-        if self.current_index >= len(self.deck):
+        for btn in self.grade_btns:
+            btn.setVisible(self.showing_answer and self.current is not None)
+
+        if self.current is None:
             self.flashcard_label.setText("🎉 Done with all flashcards!")
             self.next_btn.setEnabled(False)
             return
 
-        flashcard = self.deck[self.current_index]
-        if self.showing_answer:
-            self.flashcard_label.setText(f"💡 {flashcard['answer']}")
-            self.next_btn.setText("Next")
-        else:
-            self.flashcard_label.setText(f"❓ {flashcard['question']}")
-            self.next_btn.setText("Show Answer")
+        self.shown_at = session_clock()
+        self.show_face()
+        self.next_btn.setText("Next" if self.showing_answer else "Show Answer")
+
+    def show_face(self):
+        prompt, reveal = self.prefetcher.faces(self.prepared)
+        self.flashcard_label.setStaticText(reveal if self.showing_answer else prompt)
+
+    def resize_card(self, width):
+        self.prefetcher.set_width(width)
+        if self.prepared is not None:
+            self.show_face()
 
     def next_card(self):
         if not self.showing_answer:
+            self.log(FLIP)
             self.showing_answer = True
+            self.show_flashcard()
         else:
-            self.current_index += 1
-            self.showing_answer = False
+            # Plain "Next" after seeing the answer counts as a Good review
+            self.log(NEXT)
+            self.grade_card(GOOD)
+
+    def toggle_reverse(self):
+        self.reverse.toggle()
+        self.show_flashcard()
+
+    def log(self, kind, grade=-1, since=-1.0):
+        if self.telemetry is not None and self.current_key is not None:
+            self.telemetry.log(kind, self.current_key, session_clock() - self.shown_at, grade, since)
+
+    def grade_card(self, grade):
+        if self.current_key is not None:
+            self.log(GRADE, grade, self.scheduler.since_review(self.current_key))
+            self.scheduler.grade(self.current_key, grade)
+        self.current_index += 1
+        self.advance()
+        self.showing_answer = False
         self.show_flashcard()
 
 # techniques/reverse_flashcards.py
@@ -180,11 +309,5 @@ class ReverseFlashcards:
     def toggle(self):
         self.reversed = not self.reversed
 
-    def apply(self, card: dict):
-        """Return a new card with question/answer flipped if reverse mode is on"""
-        if self.reversed:
-            return {"question": card["answer"], "answer": card["question"]}
-        return card
-
 
 
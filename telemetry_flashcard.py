@@ -0,0 +1,186 @@
+# telemetry_flashcard.py
+"""Append-only review telemetry in columnar files.
+
+Every flip, grade and Next is one event. Each column is its own file of
+fixed-width values (`<name>.col`) under the profile's folder, so appending
+is a plain write at the end of every file and reading is a memory map per
+column (or a plain read when NumPy is missing). The Statistics page reads
+rollup_flashcard's running aggregates, which replay these columns.
+
+Events are buffered and written FLUSH_EVENTS at a time. A crash between
+column writes can leave columns of different lengths; readers use the
+shortest column and the writer trims the others on open.
+"""
+import json
+import mmap
+import os
+import re
+import time
+import zlib
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # columns are read into plain arrays
+    np = None
+
+from timing_flashcard import session_clock
+
+TELEMETRY_DIR = "remora_telemetry"
+TOPICS_FILE = "topics.json"
+FLUSH_EVENTS = 256
+
+FLIP = 0        # answer revealed (or hidden again)
+GRADE = 1       # review graded
+NEXT = 2        # moved on to the next card
+NO_GRADE = -1
+
+# name -> array typecode; NumPy reads the same bytes with the same code
+COLUMNS = {
+    "wall": "d",        # epoch seconds, for days and streaks
+    "mono": "d",        # monotonic seconds, for ordering within a session
+    "latency": "f",     # seconds from the card being shown to this event
+    "kind": "B",
+    "grade": "b",
+    "topic": "H",       # index into topics.json
+    "card": "I",        # crc32 of the card's scheduler key
+    "since": "f",       # days since the card's previous review, -1 if none
+}
+
+RETENTION_BINS = (0.0, 1.0, 2.0, 4.0, 8.0, 15.0, 31.0, 91.0)           # days since previous review
+LATENCY_BINS = (0.0, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0, 60.0)  # seconds
+
+
+def profile_folder(username, root=TELEMETRY_DIR):
+    """Folder of one profile's data; names are reduced to safe file characters."""
+    safe = re.sub(r"[^\w.-]+", "_", username.strip()).strip("._") or "default"
+    return os.path.join(root, safe)
+
+
+def key_topic(key):
+    """Topic of a scheduler key: its deck, topic page or "db" source."""
+    return key.rpartition("#")[0] or key
+
+
+class TelemetryStore:
+    """One profile's event log.
+
+    If `rollups` (a rollup_flashcard.Rollups) is given, every event is also
+    folded into it, and it is saved whenever the log is flushed.
+    """
+
+    def __init__(self, folder, rollups=None):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.topics_path = os.path.join(folder, TOPICS_FILE)
+        try:
+            with open(self.topics_path, encoding="utf-8") as f:
+                self.topics = json.load(f)
+        except (OSError, ValueError):
+            self.topics = []
+        self._topic_no = {name: i for i, name in enumerate(self.topics)}
+        self._buffers = {name: array(code) for name, code in COLUMNS.items()}
+        self._trim()
+        self.rollups = rollups
+        if rollups is not None and rollups.catch_up(self):
+            rollups.save()
+
+    def _path(self, name):
+        return os.path.join(self.folder, name + ".col")
+
+    def _trim(self):
+        count = self.stored_count()
+        for name, code in COLUMNS.items():
+            path = self._path(name)
+            size = count * array(code).itemsize
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                os.truncate(path, size)
+
+    def stored_count(self):
+        counts = []
+        for name, code in COLUMNS.items():
+            path = self._path(name)
+            counts.append(os.path.getsize(path) // array(code).itemsize if os.path.exists(path) else 0)
+        return min(counts)
+
+    def __len__(self):
+        return self.stored_count() + len(self._buffers["kind"])
+
+    # ---------- writing ----------
+
+    def log(self, kind, key, latency=0.0, grade=NO_GRADE, since=-1.0):
+        """Record one event. `since` (days since the card was last reviewed,
+        from the scheduler) is stored so retention needs no per-card join."""
+        topic = key_topic(key)
+        number = self._topic_no.get(topic)
+        if number is None:
+            number = self._topic_no[topic] = len(self.topics)
+            self.topics.append(topic)
+            self._save_topics()
+        event = (time.time(), session_clock(), max(0.0, latency), kind, grade, number,
+                 zlib.crc32(key.encode("utf-8")), since)
+        for (name, _code), value in zip(COLUMNS.items(), event):
+            self._buffers[name].append(value)
+        if self.rollups is not None:
+            self.rollups.add(event[0], kind, grade, event[2], topic, since)
+        if len(self._buffers["kind"]) >= FLUSH_EVENTS:
+            self.flush()
+
+    def _save_topics(self):
+        tmp = self.topics_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.topics, f, ensure_ascii=False)
+        os.replace(tmp, self.topics_path)
+
+    def flush(self):
+        if not len(self._buffers["kind"]):
+            return
+        for name, buffer in self._buffers.items():
+            with open(self._path(name), "ab") as f:
+                buffer.tofile(f)
+            del buffer[:]
+        if self.rollups is not None:
+            self.rollups.save()
+
+    close = flush
+
+    # ---------- reading ----------
+
+    def columns(self, start=0, stop=None):
+        """Stored events [start:stop] as {column: array}. NumPy arrays are
+        read-only views of memory-mapped files; without NumPy, plain arrays
+        are read."""
+        if stop is None:
+            self.flush()
+            stop = self.stored_count()
+        count = max(0, stop - start)
+        columns = {}
+        for name, code in COLUMNS.items():
+            itemsize = array(code).itemsize
+            if count == 0:  # the files may not exist yet
+                column = array(code) if np is None else np.zeros(0, dtype=code)
+            elif np is None:
+                column = array(code)
+                with open(self._path(name), "rb") as f:
+                    f.seek(start * itemsize)
+                    column.fromfile(f, count)
+            else:
+                with open(self._path(name), "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                column = np.frombuffer(mapped, dtype=code, count=count, offset=start * itemsize)
+            columns[name] = column
+        return columns
+
+
+def local_day(wall):
+    """Local calendar day number of epoch seconds `wall`, with the UTC offset
+    (DST included) in force at that moment."""
+    return int((wall + time.localtime(wall).tm_gmtoff) // 86400)
+
+
+def _bin(edges, value):
+    """Index of the histogram bin of `value`; `edges` are the bins' lower edges."""
+    i = 0
+    while i + 1 < len(edges) and value >= edges[i + 1]:
+        i += 1
+    return i
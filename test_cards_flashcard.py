@@ -0,0 +1,45 @@
+# test_cards_flashcard.py
+"""Permutation shuffles as well as random.sample, in memory and through the Feistel network."""
+import random
+
+import pytest
+
+from cards_flashcard import Permutation
+
+SEEDS = 100
+
+
+class FeistelPermutation(Permutation):
+    STORED_MAX = 0  # every size goes through the network
+
+
+def shuffle_stats(make, n):
+    """Mean share of neighbouring outputs that are neighbouring cards, and mean fixed points."""
+    adjacent = fixed = 0
+    for seed in range(SEEDS):
+        order = make(n, seed)
+        adjacent += sum(abs(order[i + 1] - order[i]) == 1 for i in range(n - 1)) / (n - 1)
+        fixed += sum(order[i] == i for i in range(n))
+    return adjacent / SEEDS, fixed / SEEDS
+
+
+@pytest.mark.parametrize("cls", [Permutation, FeistelPermutation])
+@pytest.mark.parametrize("n", [1, 2, 10, 100, 1000, 5000])
+def test_is_a_permutation(cls, n):
+    assert sorted(cls(n, seed=7)) == list(range(n))
+
+
+@pytest.mark.parametrize("cls", [Permutation, FeistelPermutation])
+@pytest.mark.parametrize("n", [10, 100, 1000])
+def test_shuffles_like_random_sample(cls, n):
+    adjacent, fixed = shuffle_stats(cls, n)
+    base_adjacent, base_fixed = shuffle_stats(lambda n, seed: random.Random(seed).sample(range(n), n), n)
+    # A random shuffle has 2/n neighbouring steps and one fixed point on average
+    assert adjacent < 1.5 * base_adjacent + 0.01
+    assert fixed < base_fixed + 0.5
+
+
+def test_seeded():
+    assert list(FeistelPermutation(1000, seed=3)) == list(FeistelPermutation(1000, seed=3))
+    assert list(FeistelPermutation(1000, seed=3)) != list(FeistelPermutation(1000, seed=4))
+    assert list(Permutation(1000, seed=3)) != list(Permutation(1000, seed=4))
@@ -0,0 +1,70 @@
+# theme_flashcard.py
+from PyQt6.QtGui import QColor, QPalette
+from PyQt6.QtWidgets import QWidget
+
+from ui_styles_flashcard import (
+    THEME_COLORS, THEME_TEMPLATE, TOPIC_TEMPLATE, TOPIC_ROW_COLORS, TOPIC_PAGE_COLORS
+)
+
+
+def build_palette(colors):
+    palette = QPalette()
+    role = QPalette.ColorRole
+    palette.setColor(role.Window, QColor(colors["bg"]))
+    palette.setColor(role.WindowText, QColor(colors["text"]))
+    palette.setColor(role.Base, QColor(colors["input_bg"]))
+    palette.setColor(role.Text, QColor(colors["input_text"]))
+    palette.setColor(role.Button, QColor(colors["button"]))
+    palette.setColor(role.ButtonText, QColor(colors["button_text"]))
+    palette.setColor(role.Highlight, QColor(colors["title"]))
+    palette.setColor(role.PlaceholderText, QColor(colors["faint"]))
+    return palette
+
+
+def compile_stylesheet():
+    """One stylesheet holding every theme, each scoped by the window's theme property."""
+    parts = [
+        THEME_TEMPLATE.format(scope=f'*[theme="{name}"]', **colors)
+        for name, colors in THEME_COLORS.items()
+    ]
+    for topic, (row_bg, row_text) in TOPIC_ROW_COLORS.items():
+        page_bg, page_text = TOPIC_PAGE_COLORS[topic]
+        parts.append(TOPIC_TEMPLATE.format(
+            topic=topic, row_bg=row_bg, row_text=row_text, page_bg=page_bg, page_text=page_text
+        ))
+    return "".join(parts)
+
+
+def repolish(root):
+    """Re-evaluate stylesheet rules for `root` and its children (no re-parse)."""
+    style = root.style()
+    for widget in [root, *root.findChildren(QWidget)]:
+        style.unpolish(widget)
+        style.polish(widget)
+    root.update()
+
+
+class ThemeEngine:
+    """Applies precompiled light/dark themes.
+
+    The stylesheet is parsed once, at install(). Switching theme swaps the
+    application palette, flips the `theme` property on the top-level window
+    and repolishes, so no CSS is re-parsed on toggle.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.palettes = {name: build_palette(colors) for name, colors in THEME_COLORS.items()}
+        self.stylesheet = compile_stylesheet()
+
+    def install(self, root, theme):
+        root.setProperty("theme", theme)
+        self.app.setPalette(self.palettes[theme])
+        self.app.setStyleSheet(self.stylesheet)
+
+    def apply(self, root, theme):
+        if root.property("theme") == theme:
+            return
+        self.app.setPalette(self.palettes[theme])
+        root.setProperty("theme", theme)
+        repolish(root)
@@ -0,0 +1,139 @@
+# timing_flashcard.py
+"""Deadline-based countdowns with no Qt dependency.
+
+Remaining time is always computed from a clock, never by counting ticks,
+so late or skipped ticks cannot make a session run long. TimerHub drives
+any number of countdowns and says when the next displayed value changes,
+so a single (coarse) timer can serve all of them.
+"""
+import heapq
+import itertools
+import math
+import time
+
+
+def _session_clock():
+    # CLOCK_BOOTTIME keeps counting while the machine sleeps, so a session
+    # that spans a suspend ends at the right wall time.
+    if hasattr(time, "CLOCK_BOOTTIME"):
+        try:
+            time.clock_gettime(time.CLOCK_BOOTTIME)
+            return lambda: time.clock_gettime(time.CLOCK_BOOTTIME)
+        except OSError:
+            pass
+    return time.monotonic
+
+
+session_clock = _session_clock()
+
+
+class Countdown:
+    """A countdown of `duration` seconds measured against `clock`."""
+
+    __slots__ = ("duration", "clock", "deadline", "paused_remaining")
+
+    def __init__(self, duration, clock=session_clock):
+        self.duration = duration
+        self.clock = clock
+        self.deadline = None            # clock time the countdown hits zero
+        self.paused_remaining = duration
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def start(self):
+        if self.deadline is None:
+            self.deadline = self.clock() + self.paused_remaining
+
+    def pause(self):
+        if self.deadline is not None:
+            self.paused_remaining = self.remaining()
+            self.deadline = None
+
+    def reset(self, duration=None):
+        if duration is not None:
+            self.duration = duration
+        self.deadline = None
+        self.paused_remaining = self.duration
+
+    def remaining(self, now=None):
+        if self.deadline is None:
+            return self.paused_remaining
+        now = self.clock() if now is None else now
+        return max(0.0, self.deadline - now)
+
+    def display_seconds(self, now=None):
+        """Whole seconds shown to the user (rounded up, so 29:59.4 shows 30:00)."""
+        return math.ceil(self.remaining(now) - 1e-9)
+
+    def next_change(self, now=None):
+        """Clock time at which display_seconds() next changes, or None if paused."""
+        if self.deadline is None:
+            return None
+        now = self.clock() if now is None else now
+        remaining = self.deadline - now
+        if remaining <= 0:
+            return now
+        # display changes when remaining crosses the next whole second below it
+        return self.deadline - (math.ceil(remaining - 1e-9) - 1)
+
+
+class TimerHub:
+    """Drives many countdowns from one tick source.
+
+    Each running countdown sits in a heap keyed by when its display next
+    changes. tick() only touches countdowns whose display changed and
+    calls `on_change(seconds)` / `on_expire()` for them.
+    """
+
+    def __init__(self, clock=session_clock):
+        self.clock = clock
+        self.heap = []
+        self.entries = {}  # id(countdown) -> [countdown, on_change, on_expire, shown, seq]
+        self._seq = itertools.count()
+
+    def watch(self, countdown, on_change=None, on_expire=None):
+        """Start delivering updates for a (started) countdown."""
+        shown = countdown.display_seconds()
+        entry = [countdown, on_change, on_expire, shown, next(self._seq)]
+        self.entries[id(countdown)] = entry
+        self._push(entry)
+        return entry
+
+    def unwatch(self, countdown):
+        self.entries.pop(id(countdown), None)  # its heap entries go stale
+
+    def _push(self, entry, now=None):
+        when = entry[0].next_change(now)
+        if when is not None:
+            heapq.heappush(self.heap, (when, entry[4], entry))
+
+    def next_wakeup(self, now=None):
+        """Seconds until the next displayed value changes, or None if idle."""
+        while self.heap and self.entries.get(id(self.heap[0][2][0])) is not self.heap[0][2]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return None
+        now = self.clock() if now is None else now
+        return max(0.0, self.heap[0][0] - now)
+
+    def tick(self, now=None):
+        now = self.clock() if now is None else now
+        while self.heap and self.heap[0][0] <= now:
+            _when, _seq, entry = heapq.heappop(self.heap)
+            countdown, on_change, on_expire, shown, _ = entry
+            if self.entries.get(id(countdown)) is not entry or not countdown.running:
+                continue
+            seconds = countdown.display_seconds(now)
+            if seconds != shown:
+                entry[3] = seconds
+                if on_change is not None:
+                    on_change(seconds)
+            if seconds == 0:
+                self.unwatch(countdown)
+                countdown.pause()
+                if on_expire is not None:
+                    on_expire()
+            else:
+                self._push(entry, now)
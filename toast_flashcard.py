@@ -0,0 +1,83 @@
+# toast_flashcard.py
+from PyQt6.QtCore import QTimer, QPropertyAnimation
+from PyQt6.QtWidgets import QFrame, QLabel, QPushButton, QHBoxLayout, QGraphicsOpacityEffect
+
+TOAST_MS = 2500
+TOAST_ACTION_MS = 6000   # longer when there is a button to press
+FADE_MS = 250
+MARGIN = 30
+INFO = "info"
+WARNING = "warning"
+
+
+class Toast(QFrame):
+    """Non-modal notice that floats over the bottom of its parent and fades away.
+
+    One toast is reused per window: a new message replaces the current one.
+    An optional action adds a button (e.g. "Save anyway") to the notice.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setProperty("role", "toast")
+        self.label = QLabel()
+        self.label.setWordWrap(True)
+        self.action_btn = QPushButton()
+        self.action_btn.setProperty("role", "toast-action")
+        self.action_btn.clicked.connect(self._run_action)
+        self.action = None
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(16, 10, 16, 10)
+        layout.addWidget(self.label, 1)
+        layout.addWidget(self.action_btn)
+
+        self.effect = QGraphicsOpacityEffect(self)
+        self.setGraphicsEffect(self.effect)
+        self.anim = QPropertyAnimation(self.effect, b"opacity", self)
+        self.anim.setDuration(FADE_MS)
+        self.anim.finished.connect(self._faded)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.dismiss)
+        self.hide()
+
+    def show_message(self, text, kind=INFO, action_text=None, action=None):
+        self.label.setText(text)
+        self.action = action
+        self.action_btn.setText(action_text or "")
+        self.action_btn.setVisible(action is not None)
+        if self.property("kind") != kind:
+            self.setProperty("kind", kind)
+            self.style().unpolish(self)
+            self.style().polish(self)
+
+        self.anim.stop()
+        self.effect.setOpacity(1.0)
+        self._place()
+        self.show()
+        self.raise_()
+        self.timer.start(TOAST_ACTION_MS if action is not None else TOAST_MS)
+
+    def dismiss(self):
+        self.timer.stop()
+        self.anim.setStartValue(self.effect.opacity())
+        self.anim.setEndValue(0.0)
+        self.anim.start()
+
+    def _place(self):
+        parent = self.parentWidget()
+        width = min(520, parent.width() - 2 * MARGIN)
+        self.setFixedWidth(width)
+        self.adjustSize()
+        self.move((parent.width() - width) // 2, parent.height() - self.height() - MARGIN)
+
+    def _run_action(self):
+        action, self.action = self.action, None
+        self.dismiss()
+        if action is not None:
+            action()
+
+    def _faded(self):
+        if self.effect.opacity() == 0.0:
+            self.hide()
@@ -0,0 +1,72 @@
+# transitions_flashcard.py
+from PyQt6.QtCore import Qt, QObject, QPropertyAnimation, QEasingCurve
+from PyQt6.QtWidgets import QLabel, QGraphicsOpacityEffect
+
+FADE_MS = 300
+FADE = "fade"
+INSTANT = "instant"
+
+
+class TransitionEngine(QObject):
+    """Page transitions for a QStackedWidget.
+
+    A transition grabs a snapshot of the outgoing page, switches the stack
+    right away and fades the snapshot out on top of the new page. The
+    overlay, its opacity effect and the animation are created once and
+    reused; the effect only renders while the overlay is visible. A new
+    request during a transition retargets the page under the running fade
+    instead of queueing another one.
+    """
+
+    def __init__(self, stacked, duration=FADE_MS, mode=FADE):
+        super().__init__(stacked)
+        self.stacked = stacked
+        self.mode = mode
+
+        self.overlay = QLabel(stacked)
+        self.overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.overlay.hide()
+        self.effect = QGraphicsOpacityEffect(self.overlay)
+        self.overlay.setGraphicsEffect(self.effect)
+
+        self.anim = QPropertyAnimation(self.effect, b"opacity", self)
+        self.anim.setDuration(duration)
+        self.anim.setStartValue(1.0)
+        self.anim.setEndValue(0.0)
+        self.anim.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self.anim.finished.connect(self._finish)
+
+    @property
+    def running(self):
+        return self.anim.state() == QPropertyAnimation.State.Running
+
+    def go(self, page):
+        """Show `page`, cross-fading from the current one unless in instant mode."""
+        current = self.stacked.currentWidget()
+        if self.running:
+            self.stacked.setCurrentWidget(page)  # merge into the running fade
+            self.overlay.raise_()
+            return
+        if page is current:
+            return
+        if self.mode == INSTANT or current is None or not self.stacked.isVisible():
+            self.stacked.setCurrentWidget(page)
+            return
+
+        self.overlay.setPixmap(current.grab())
+        self.overlay.setGeometry(self.stacked.rect())
+        self.stacked.setCurrentWidget(page)
+        self.overlay.show()
+        self.overlay.raise_()
+        self.anim.start()
+
+    def jump(self, page):
+        """Switch immediately, cutting any running fade short."""
+        if self.running:
+            self.anim.stop()
+            self._finish()
+        self.stacked.setCurrentWidget(page)
+
+    def _finish(self):
+        self.overlay.hide()
+        self.overlay.clear()  # drop the snapshot pixmap
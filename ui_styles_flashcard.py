@@ -1,107 +1,227 @@
 # ui_styles_flashcard.py
 from PyQt6.QtGui import QFont
 
-APP_STYLE = """
-QWidget {
-    background-color: #FFF5E5;
+# Colors per theme. The theme engine (theme_flashcard) fills THEME_TEMPLATE
+# with these once per theme and scopes the rules under [theme="..."].
+THEME_COLORS = {
+    "light": {
+        "bg": "#FFF5E5",
+        "surface": "#FFF6E9",
+        "text": "#2d3436",
+        "muted": "#555555",
+        "faint": "#777777",
+        "title": "#434190",
+        "brand": "#FC483D",
+        "tagline": "#A0522D",
+        "button": "#FC483D",
+        "button_text": "white",
+        "button_hover": "#e6392d",
+        "hero_text": "#FFF5E5",
+        "accent_hover": "#434190",
+        "input_bg": "#fefefe",
+        "input_text": "#000000",
+        "input_border": "#888888",
+        "sidebar": "#2d3436",
+    },
+    "dark": {
+        "bg": "#1e1e1e",
+        "surface": "#252525",
+        "text": "#f5f5f5",
+        "muted": "#bbbbbb",
+        "faint": "#999999",
+        "title": "#A7A4FF",
+        "brand": "#FF6F66",
+        "tagline": "#E0A070",
+        "button": "#3a3a3a",
+        "button_text": "white",
+        "button_hover": "#505050",
+        "hero_text": "#FFF5E5",
+        "accent_hover": "#434190",
+        "input_bg": "#2d2d2d",
+        "input_text": "#f5f5f5",
+        "input_border": "#666666",
+        "sidebar": "#111111",
+    },
 }
-QPushButton {
-    background-color: #FC483D;
-    color: white;
-    font-size: 33px;
-    font-weight: 900;
-    border-radius: 30px;
-    padding: 14px 40px;
-}
-QPushButton:hover {
-    background-color: #434190;
-}
-QLineEdit {
+
+# Widgets opt into a rule with setProperty("role", ...). {scope} is the
+# theme selector of the top-level window, e.g. *[theme="dark"].
+THEME_TEMPLATE = """
+{scope}, {scope} QWidget {{
+    background-color: {bg};
+    color: {text};
+}}
+{scope} QPushButton {{
+    background-color: {button};
+    color: {button_text};
+    font-size: 16px;
+    border-radius: 10px;
+    padding: 8px 16px;
+}}
+{scope} QPushButton:hover {{
+    background-color: {button_hover};
+}}
+{scope} QLineEdit {{
     padding: 10px;
     font-size: 18px;
     border-radius: 8px;
     border: 2px solid #CBD5E0;
-    background-color: #fefefe;   
-    color: #000000;
-}
-"""
-
-SIDEBAR_BUTTON_STYLE = """
-QPushButton {
-    background:none;
-    color:white;
-    text-align:left;
-    padding:10px;
-    font-size:16px;
-    border:none;
-}
-QPushButton:hover {
-    background-color: #434190;
-}
-"""
-
-HAMBURGER_STYLE = """
-QPushButton {
-    font-size:24px;
-    background:none;
-    border:none;
-    color:#FC483D;
-    padding:10px;
-}
-QPushButton:hover {
-    color:#434190;
-}
-"""
-
-APP_STYLE_LIGHT = """
-QWidget {
-    background-color: #FFF5E5;
-    color: #2d3436;
-}
-QPushButton {
-    background-color: #FC483D;
+    background-color: {input_bg};
+    color: {input_text};
+}}
+{scope} FlipCard {{
+    background: transparent;
+}}
+{scope} QWidget[role="surface"], {scope} QWidget[role="surface"] QWidget {{
+    background-color: {surface};
+}}
+{scope} QLabel[role="title"] {{
+    color: {title};
+}}
+{scope} QLabel[role="title-bold"] {{
+    color: {title};
+    font-weight: bold;
+}}
+{scope} QLabel[role="brand"] {{
+    color: {brand};
+    letter-spacing: 2px;
+    font-weight: 900;
+}}
+{scope} QLabel[role="tagline"] {{
+    color: {tagline};
+    font-weight: bold;
+}}
+{scope} QLabel[role="tutorial-desc"] {{
+    color: {muted};
+    padding: 0 40px;
+}}
+{scope} QLabel[role="muted"] {{
+    color: {faint};
+}}
+{scope} QFrame[role="sidebar"] {{
+    background-color: {sidebar};
     color: white;
-    font-size: 16px;
-    border-radius: 10px;
-    padding: 8px 16px;
-}
-QPushButton:hover {
-    background-color: #e6392d;
-}
-"""
-
-APP_STYLE_DARK = """
-QWidget {
-    background-color: #1e1e1e;
-    color: #f5f5f5;
-}
-QPushButton {
-    background-color: #3a3a3a;
+}}
+{scope} QPushButton[role="sidebar"] {{
+    background: none;
     color: white;
+    text-align: left;
+    padding: 10px;
     font-size: 16px;
-    border-radius: 10px;
-    padding: 8px 16px;
-}
-QPushButton:hover {
-    background-color: #505050;
-}
-"""
-
-CREATE_FLASH = """
-QWidget {
-    background-color: #FC483D;
-}
-QPushButton {
-    background-color: #FC483D;
-    color: #FFF5E5;
+    border: none;
+}}
+{scope} QPushButton[role="sidebar"]:hover {{
+    background-color: {accent_hover};
+}}
+{scope} QPushButton[role="hamburger"] {{
+    font-size: 24px;
+    background: none;
+    border: none;
+    color: {brand};
+    padding: 10px;
+}}
+{scope} QPushButton[role="hamburger"]:hover {{
+    color: {accent_hover};
+}}
+{scope} QPushButton[role="hero"] {{
+    background-color: {brand};
+    color: {hero_text};
     font-size: 33px;
     font-weight: 900;
     border-radius: 30px;
     padding: 14px 40px;
+}}
+{scope} QPushButton[role="hero"]:hover {{
+    background-color: {accent_hover};
+}}
+{scope} QLineEdit[role="card-input"] {{
+    padding: 8px;
+    border-radius: 10px;
+    border: 2px solid {input_border};
+}}
+{scope} QPushButton[role="success"] {{
+    background-color: #4CAF50;
+    color: white;
+    padding: 8px 20px;
+    border-radius: 10px;
+}}
+{scope} QPushButton[role="secondary"] {{
+    background-color: #888;
+    color: white;
+    padding: 8px 20px;
+    border-radius: 10px;
+}}
+{scope} QFrame[role="toast"] {{
+    background-color: {sidebar};
+    border-radius: 12px;
+}}
+{scope} QFrame[role="toast"][kind="warning"] {{
+    background-color: {brand};
+}}
+{scope} QFrame[role="toast"] QLabel {{
+    background: transparent;
+    color: white;
+    font-size: 15px;
+}}
+{scope} QPushButton[role="toast-action"] {{
+    background-color: {title};
+    color: white;
+    padding: 4px 12px;
+    border-radius: 8px;
+}}
+{scope} QPlainTextEdit[role="card-input"] {{
+    padding: 8px;
+    border-radius: 10px;
+    border: 2px solid {input_border};
+    background-color: {input_bg};
+    color: {input_text};
+}}
+{scope} QLabel[role="error"] {{
+    color: {brand};
+}}
+{scope} QLabel[role="topics-header"] {{
+    background-color: #F08080;
+    color: white;
+    padding: 20px;
+    border-radius: 15px;
+    letter-spacing: 2px;
+}}
+"""
+
+# Topic colors are the same in both themes: (row bg, row text) on the
+# topics list and (page bg, page text) on each topic page.
+TOPIC_ROW_COLORS = {
+    "English": ("#ADD8FF", "#3A4CC0"),
+    "Math": ("#A5E6A0", "#2E4B2E"),
+    "Science": ("#FFE8A0", "#D98C00"),
+    "History": ("#FFB0A0", "#7B2D2D"),
 }
-QPushButton:hover {
-    background-color: #434190;
+TOPIC_PAGE_COLORS = {
+    "English": ("#D8E6FF", "#1A237E"),
+    "Math": ("#C9F7C5", "#1B5E20"),
+    "Science": ("#FFF6BF", "#BF360C"),
+    "History": ("#FFD5CC", "#4E342E"),
 }
+
+TOPIC_TEMPLATE = """
+QFrame[role="topic-row"][topic="{topic}"], QFrame[role="topic-row"][topic="{topic}"] QLabel {{
+    background-color: {row_bg};
+    border-radius: 35px;
+}}
+QFrame[role="topic-row"][topic="{topic}"] QLabel[role="topic-name"] {{
+    color: {row_text};
+}}
+QFrame[role="topic-row"][topic="{topic}"] QLabel[role="topic-icon"] {{
+    background-color: white;
+    border-radius: 30px;
+}}
+QWidget[role="topic-page"][topic="{topic}"],
+QWidget[role="topic-page"][topic="{topic}"] QLabel[role="topic-title"] {{
+    background-color: {page_bg};
+}}
+QWidget[role="topic-page"][topic="{topic}"] QLabel[role="topic-title"] {{
+    color: {page_text};
+}}
 """
 
 MESSAGE_WARNING = """
@@ -125,8 +245,21 @@ QPushButton:hover {
 """
 
 
-FONT_SUBTITLE = QFont("Rubik Mono", 16, QFont.Weight.Bold)
-FONT_LARGE_BOLD = QFont("Rubik Mono", 28, QFont.Weight.Bold)
-FONT_MEDIUM = QFont("Rubik Mono", 26, QFont.Weight.Medium)
-FONT_BUTTON = QFont("Rubik Mono", 18)
-FONT_LABEL = QFont("Rubik Mono", 24, QFont.Weight.Bold)
+# Fonts are built on first access (see __getattr__) so importing this
+# module stays cheap and only fonts a built page uses get resolved.
+FONT_SPECS = {
+    "FONT_SUBTITLE": ("Rubik Mono", 16, QFont.Weight.Bold),
+    "FONT_LARGE_BOLD": ("Rubik Mono", 28, QFont.Weight.Bold),
+    "FONT_MEDIUM": ("Rubik Mono", 26, QFont.Weight.Medium),
+    "FONT_BUTTON": ("Rubik Mono", 18, QFont.Weight.Normal),
+    "FONT_LABEL": ("Rubik Mono", 24, QFont.Weight.Bold),
+}
+
+
+def __getattr__(name):
+    spec = FONT_SPECS.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    font = QFont(*spec)
+    globals()[name] = font
+    return font